@@ -0,0 +1,63 @@
+import time
+import random
+import hashlib
+import argparse
+
+from bruteforce_engine import DigitSpace, search, target_digest
+
+# ==================================================================
+# ⏱️ 후보 엔진 벤치마크: 기존 루프(포맷 + encode + sha256 + hexdigest) vs 고속 엔진
+# mpi_bruteforce_r.py의 8자리 공간 일부를 단일 프로세스(= 코어 1개 몫)로 탐색, 초당 해시 수 비교
+# 가속이 어디서 나오는지 보려고 중간 단계(뒷자리 bytes 재사용 + digest 비교만, 앞자리 상태 복제 없음)도 같이 잼
+# 정답은 구간 맨 끝에 둬서 끝까지 다 돌게 함 (찾은 위치가 모두 같은지도 확인)
+# 상한: 코어당 약 2.3배 (실측 기존 46~56만 -> 엔진 105~137만 해시/초, 2.28~2.43x) - '몇 배' 목표에는 못 미침
+#   남은 시간은 거의 전부 sha256 압축 함수 자체 (후보 1개 = 64바이트 블록 1개)
+#   묶음(batch) 백엔드도 재봤지만 hashlib보다 빠르지 않아서 넣지 않음 (같은 8자리 공간, 코어 1개):
+#     map(sha256, map(prefix.__add__, 뒷자리)) 를 C 수준으로 돌리고 digest 집합과 isdisjoint -> 106만 해시/초
+#     numpy로 후보 10만 개를 열 단위로 한 번에 SHA-256 (제자리 연산) -> 75~100만 해시/초
+#   더 빠르게 하려면 해시를 C/SIMD/GPU로 (hashcat 등) 돌려야 함 -> 이 스크립트들의 가속은 MPI 코어 수로
+# ==================================================================
+def legacy_search(width, start, end, target_hash):
+    for i in range(start, end):
+        candidate = f"{i:0{width}d}"
+        if hashlib.sha256(candidate.encode()).hexdigest() == target_hash:
+            return i
+    return None
+
+def reuse_search(space, start, end, targets):
+    # 뒷자리 bytes 재사용 + digest 바이트 비교 (후보마다 sha256을 새로 만듦)
+    for p, lo, hi in space.blocks(start, end):
+        prefix = space.prefix(p)
+        for j in range(lo, hi):
+            if hashlib.sha256(prefix + space.suffixes[j]).digest() in targets:
+                return p * space.block + j
+    return None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SHA-256 후보 엔진 벤치마크")
+    parser.add_argument('--width', type=int, default=8)
+    parser.add_argument('--count', type=int, default=1_000_000, help="탐색할 후보 수")
+    args = parser.parse_args()
+
+    space = DigitSpace(args.width)
+    start = random.Random(0).randrange(0, space.total - args.count)
+    end = start + args.count
+    target_hash = hashlib.sha256(space.candidate(end - 1).encode()).hexdigest()
+    targets = {target_digest(target_hash)}
+
+    runs = [('기존 루프', lambda: legacy_search(args.width, start, end, target_hash)),
+            ('bytes 재사용', lambda: reuse_search(space, start, end, targets)),
+            ('엔진 (상태 복제)', lambda: search(space, start, end, targets))]
+
+    print("=" * 64)
+    print(f"{args.width}자리 공간, 후보 {args.count:,}개 ({space.candidate(start)} ~ {space.candidate(end - 1)})")
+    print(f"{'방식':<20}{'시간(초)':>10}{'해시/초':>16}{'가속비':>9}{'결과 일치':>10}")
+    print("-" * 64)
+    base_time, base_found = None, None
+    for name, fn in runs:
+        t0 = time.perf_counter()
+        found = fn()
+        elapsed = time.perf_counter() - t0
+        if base_time is None: base_time, base_found = elapsed, found
+        print(f"{name:<20}{elapsed:>10.3f}{args.count / elapsed:>16,.0f}{base_time / elapsed:>8.2f}x{str(found == base_found):>10}")
+    print("=" * 64)
@@ -0,0 +1,80 @@
+import time
+import argparse
+import pandas as pd
+
+from legal_text import get_hard_mode_vector
+from bench_text import legacy_hard_mode_vector
+from legal_knn import encode_sets, count_correct, encode_matrix, correct_per_prefix
+
+# ==================================================================
+# ⏱️ kNN 학습기 벤치마크: 학습 판례 매번 전처리(기존) vs 한 번만 인코딩(재사용) vs 희소 행렬 곱(행렬)
+# legal_hpc_trainer_m.py와 같은 learning_phases / 테스트 100개 기준, 단일 프로세스
+# ==================================================================
+learning_phases = [20, 70, 300, 700, 1100]
+
+def run_before(train_data, test_data, data_count):
+    # 기존 방식: 테스트 판례마다 학습 판례를 다시 정규식 처리 + 토큰화 (캐시 없는 예전 함수)
+    correct = 0
+    for test_case in test_data:
+        test_vec = legacy_hard_mode_vector(test_case['Facts'])
+        best_cat, max_sim = "", -1
+        for train_case in train_data[:data_count]:
+            train_vec = legacy_hard_mode_vector(train_case['Facts'])
+            if not (test_vec | train_vec): sim = 0
+            else: sim = len(test_vec & train_vec) / len(test_vec | train_vec)
+            if sim > max_sim: max_sim, best_cat = sim, train_case['Category']
+        if best_cat == test_case['Category']: correct += 1
+    return correct
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="kNN 학습기 전처리 재사용 벤치마크")
+    parser.add_argument('--csv', default='legal_data_total.csv')
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv)
+    train_data = df.iloc[:1100].to_dict('records')
+    test_data = df.iloc[1100:1200].to_dict('records')
+
+    # 재사용 방식: 인코딩 비용은 한 번만 (전체 단계에 대해 1회)
+    t0 = time.perf_counter()
+    train_vecs, vocab = encode_sets([c['Facts'] for c in train_data], get_hard_mode_vector)
+    test_vecs, _ = encode_sets([c['Facts'] for c in test_data], get_hard_mode_vector, vocab)
+    train_cats = [c['Category'] for c in train_data]
+    test_cats = [c['Category'] for c in test_data]
+    encode_time = time.perf_counter() - t0
+    train_m, test_m = encode_matrix(train_vecs, len(vocab)), encode_matrix(test_vecs, len(vocab))
+
+    print("=" * 82)
+    print(f"{'단계':<8}{'학습 데이터':>10}{'기존(초)':>12}{'재사용(초)':>12}{'행렬(초)':>12}{'가속비':>10}{'정확도 일치':>12}")
+    print("-" * 82)
+    total_before, total_after, total_matrix = 0.0, encode_time, encode_time
+    for i, data_count in enumerate(learning_phases):
+        t0 = time.perf_counter()
+        before = run_before(train_data, test_data, data_count)
+        t_before = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        after = count_correct(test_vecs, test_cats, train_vecs[:data_count], train_cats[:data_count])
+        t_after = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        matrix = correct_per_prefix(test_m, test_cats, train_m[:data_count], train_cats[:data_count])[0]
+        t_matrix = time.perf_counter() - t0
+
+        total_before += t_before
+        total_after += t_after
+        total_matrix += t_matrix
+        print(f"Step {i+1:<3}{data_count:>10}{t_before:>12.4f}{t_after:>12.4f}{t_matrix:>12.4f}"
+              f"{t_before / t_matrix:>9.1f}x{str(before == after == matrix):>12}")
+
+    # 행렬 엔진은 전체 1100개와 한 번만 곱하고 모든 단계를 앞쪽 열 argmax로 처리할 수 있음
+    t0 = time.perf_counter()
+    correct_per_prefix(test_m, test_cats, train_m, train_cats, learning_phases)
+    t_one_pass = time.perf_counter() - t0 + encode_time
+
+    print("-" * 82)
+    print(f"1회 인코딩 비용: {encode_time:.4f}초")
+    print(f"전체 학습 곡선: 기존 {total_before:.4f}초 -> 재사용 {total_after:.4f}초 ({total_before / total_after:.1f}x)"
+          f" -> 행렬 {total_matrix:.4f}초 ({total_before / total_matrix:.1f}x)")
+    print(f"행렬 1회 곱으로 전체 단계: {t_one_pass:.4f}초 ({total_before / t_one_pass:.1f}x)")
+    print("=" * 82)
@@ -0,0 +1,135 @@
+import time
+import random
+import argparse
+from unittest import mock
+import numpy as np
+import pandas as pd
+
+import legal_index
+from legal_text import get_hard_mode_vector, normalize_korean, expand_synonyms, has_context_penalty, blocked_categories
+from legal_knn import encode_sets, encode_matrix, count_matches, RunningNearest
+from legal_minhash import ApproxNearest, LshScorer, bands_for_threshold, TRAIN_THRESHOLD, SEARCH_THRESHOLD
+from legal_sparse import SparseScorer
+from legal_topk import pick_diverse
+from generate_all_data import generate_full_case, categories
+
+# ==================================================================
+# 🎲 MinHash/LSH 근사 모드 벤치마크: 전체 탐색 대비 재현율(recall)과 가속비
+# 1) kNN 학습기: legal_hpc_trainer_m처럼 단계마다 새 학습 판례만 접어 넣음 (RunningNearest vs ApproxNearest)
+#    최근접 재현율 (근사 최근접의 유사도가 정확한 최근접과 같으면 정답) + 정확도 차이를 허용 오차와 비교
+# 2) 코퍼스 규모: 같은 템플릿으로 만든 학습 판례 수를 늘려가며 후보 비율 / 자카드 계산 비율
+#    후보 비율 = 문턱 이상으로 비슷한 판례의 몫 (템플릿 코퍼스에서는 규모와 무관하게 일정)
+#    자카드 계산 비율 = 후보 + 문턱 이상 이웃을 못 찾은 행의 전체 비교 -> 코퍼스가 커질수록 대체 경로가 줄어서 떨어짐
+# 3) 유사 판례 검색: 상위 3건 판례 번호 재현율 + 후보 비율
+# ==================================================================
+learning_phases = [20, 70, 300, 700, 1100]
+
+def encode_split(train_facts, test_facts):
+    train_vecs, vocab = encode_sets(train_facts, get_hard_mode_vector)
+    test_vecs, _ = encode_sets(test_facts, get_hard_mode_vector, vocab)
+    return encode_matrix(train_vecs, len(vocab)), encode_matrix(test_vecs, len(vocab)), list(vocab)
+
+def fold_timed(tracker, block):
+    t0 = time.perf_counter()
+    tracker.fold(block)
+    return time.perf_counter() - t0
+
+def bench_trainer(df, num_perm, bands, tolerance):
+    train_m, test_m, tokens = encode_split(df['Facts'][:1100], df['Facts'][1100:1600])
+    train_cats, test_cats = list(df['Category'][:1100]), list(df['Category'][1100:1600])
+    exact, approx = RunningNearest(test_m), ApproxNearest(test_m, tokens, num_perm, bands)
+
+    print(f"[kNN 학습기] 테스트 {test_m.shape[0]}개, MinHash {num_perm} / 띠 {bands} (문턱 {approx.threshold:.2f})")
+    print(f"{'학습 데이터':>10}{'후보 비율':>10}{'자카드 계산':>10}{'재현율':>9}{'정확도(전체)':>13}{'정확도(근사)':>13}"
+          f"{'차이':>8}{'전체(초)':>10}{'근사(초)':>10}{'가속비':>8}")
+    prev, worst, t_exact, t_approx = 0, 0.0, 0.0, 0.0
+    for count in learning_phases:
+        # 단계별 시간 = 새 블록 [prev, count) 를 접어 넣는 시간 (학습기와 같은 증분 방식)
+        t_exact += fold_timed(exact, train_m[prev:count])
+        t_approx += fold_timed(approx, train_m[prev:count])
+        prev = count
+
+        recall = np.mean(np.isclose(approx.max_sim, exact.max_sim))
+        acc_exact = count_matches(exact.best, test_cats, train_cats[:count]) / len(test_cats) * 100
+        acc_approx = count_matches(approx.best, test_cats, train_cats[:count]) / len(test_cats) * 100
+        if count >= 300: worst = max(worst, abs(acc_approx - acc_exact))
+        print(f"{count:>10}{approx.n_cand.mean() / count * 100:>9.1f}%{approx.n_pairs.mean() / count * 100:>9.1f}%"
+              f"{recall * 100:>8.1f}%{acc_exact:>12.2f}%{acc_approx:>12.2f}%{acc_approx - acc_exact:>+7.1f}p"
+              f"{t_exact:>10.4f}{t_approx:>10.4f}{t_exact / t_approx:>7.2f}x")
+    ok = worst <= tolerance
+    print(f"{'✅' if ok else '❌'} 학습 데이터 300개 이상 정확도 차이 최대 {worst:.1f}%p (허용 {tolerance:.1f}%p)")
+    return ok
+
+def bench_growth(sizes, num_perm, bands, n_test=500, seed=7):
+    # generate_all_data 템플릿으로 학습 판례 수만 늘린 코퍼스 (테스트 판례는 같은 n_test개)
+    rng = random.Random(seed)
+    cats = [categories[i % 10] for i in range(n_test + max(sizes))]
+    facts = [generate_full_case(cat, f"CASE-{i}", rng) for i, cat in enumerate(cats)]
+    train_m, test_m, tokens = encode_split(facts[n_test:], facts[:n_test])
+    train_cats, test_cats = cats[n_test:], cats[:n_test]
+
+    print(f"\n[코퍼스 규모] 테스트 {n_test}개, MinHash {num_perm} / 띠 {bands}")
+    print(f"{'학습 데이터':>10}{'후보 비율':>10}{'자카드 계산':>10}{'대체 경로 행':>10}{'정확도(전체)':>13}{'정확도(근사)':>13}"
+          f"{'전체(초)':>10}{'근사(초)':>10}{'가속비':>8}")
+    for n in sizes:
+        exact, approx = RunningNearest(test_m), ApproxNearest(test_m, tokens, num_perm, bands)
+        t_exact, t_approx = fold_timed(exact, train_m[:n]), fold_timed(approx, train_m[:n])
+        fallback = int((approx.max_sim < approx.threshold).sum()) # 문턱 이상 이웃을 못 찾아 전체와 비교한 행
+        acc_exact = count_matches(exact.best, test_cats, train_cats[:n]) / n_test * 100
+        acc_approx = count_matches(approx.best, test_cats, train_cats[:n]) / n_test * 100
+        print(f"{n:>10}{approx.n_cand.mean() / n * 100:>9.2f}%{approx.n_pairs.mean() / n * 100:>9.2f}%{fallback:>11}"
+              f"{acc_exact:>12.2f}%{acc_approx:>12.2f}%{t_exact:>10.4f}{t_approx:>10.4f}{t_exact / t_approx:>7.2f}x")
+
+def bench_search(df, n_queries, num_perm, bands):
+    index = legal_index.load_index()
+    # 질의 = 임의 판례 하나의 사실관계에서 단어 일부를 뽑은 것 (비슷한 사건을 설명하는 사용자)
+    rng = random.Random(42)
+    analyzed = []
+    for _ in range(n_queries):
+        words = rng.choice(list(df['Facts'])).split()
+        raw = normalize_korean(' '.join(rng.sample(words, min(len(words), rng.randint(5, 25)))))
+        user_vec = expand_synonyms(raw)
+        analyzed.append((user_vec, blocked_categories(user_vec), has_context_penalty(raw)))
+
+    exact_scorer, lsh_scorer = SparseScorer(index), LshScorer(index, num_perm=num_perm, bands=bands)
+    rows, _ = lsh_scorer.lsh.candidate_pairs(*lsh_scorer.query_matrix(analyzed))
+    # 0.99 초과 점수의 랜덤 지터를 끄고 비교 (동점은 판례 번호 순) -> 재현율이 지터에 흔들리지 않게
+    with mock.patch('numpy.random.random', lambda n: np.zeros(n)):
+        t0 = time.perf_counter()
+        exact = [pick_diverse(s) for s in exact_scorer.topk_batch(analyzed)]
+        t_exact = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        approx = [pick_diverse(s) for s in lsh_scorer.topk_batch(analyzed)]
+        t_approx = time.perf_counter() - t0
+
+    hits = sum(len({c for _, c, _ in a} & {c for _, c, _ in e}) for a, e in zip(approx, exact))
+    total = sum(len(e) for e in exact)
+    print(f"\n[유사 판례 검색] 질의 {n_queries}개, MinHash {num_perm} / 띠 {bands} (문턱 {lsh_scorer.lsh.threshold:.2f})")
+    print(f"후보 비율: {len(rows) / n_queries / lsh_scorer.matrix.shape[0] * 100:.1f}% | "
+          f"상위 3건 재현율: {hits / max(total, 1) * 100:.1f}% | 전체 {t_exact:.4f}초 / 근사 {t_approx:.4f}초 ({t_exact / t_approx:.2f}x)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MinHash/LSH 근사 모드 재현율/가속비 측정")
+    parser.add_argument('--csv', default='legal_data_total.csv')
+    parser.add_argument('--num-perm', type=int, default=128)
+    parser.add_argument('--threshold', type=float, default=TRAIN_THRESHOLD, help="학습기용 목표 자카드 문턱")
+    parser.add_argument('--bands', type=int, help="학습기용 띠 수 (기본: --threshold에서 계산)")
+    parser.add_argument('--search-threshold', type=float, default=SEARCH_THRESHOLD, help="검색용 목표 자카드 문턱")
+    parser.add_argument('--search-bands', type=int, help="검색용 띠 수 (기본: --search-threshold에서 계산)")
+    parser.add_argument('--tolerance', type=float, default=1.0, help="학습기 정확도 차이 허용 오차 (%%p, 학습 데이터 300개 이상)")
+    parser.add_argument('--growth', default='1100,4400,17600', help="코퍼스 규모 측정용 학습 판례 수 (쉼표 구분, 빈 값이면 생략)")
+    parser.add_argument('--queries', type=int, default=300)
+    args = parser.parse_args()
+    bands = args.bands or bands_for_threshold(args.num_perm, args.threshold)
+    search_bands = args.search_bands or bands_for_threshold(args.num_perm, args.search_threshold)
+
+    if not legal_index.is_fresh(args.csv):
+        legal_index.build_index(args.csv)
+    df = pd.read_csv(args.csv)
+    print("=" * 104)
+    ok = bench_trainer(df, args.num_perm, bands, args.tolerance)
+    if args.growth:
+        bench_growth([int(x) for x in args.growth.split(',')], args.num_perm, bands)
+    bench_search(df, args.queries, args.num_perm, search_bands)
+    print("=" * 104)
+    if not ok: raise SystemExit(1)
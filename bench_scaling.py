@@ -0,0 +1,321 @@
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+
+import numpy as np
+
+# ==================================================================
+# 📏 데이터 규모 확장 벤치마크 (Data Scaling Suite)
+# 판례 수(기본 1.6k / 16k / 160k / 1.6M)와 프로세스 수를 바꿔가며
+#  - service : legal_ai_service 채점 경로 (load_shard + consult_batch, 질의 묶음 Bcast)
+#  - trainer : legal_hpc_trainer_m 분류 경로 (하드 모드 토큰, 증분 최근접 + reduce)
+# 를 돌리고 지연시간 백분위/처리량/최대 RSS/통신 시간을 결과 파일(JSON)에 기록
+# service 경로는 실행 백엔드별로도 측정 (--execs mpi,pool: mpirun vs 프로세스 풀, 같은 질의/같은 지표)
+# 코퍼스는 generate_all_data.py 템플릿으로 만든 열 기반 폴더 (한 번 만들면 재사용)
+# draw_graph.py / visualize_learning.py는 이 결과 파일을 그대로 읽어서 그림
+# ==================================================================
+RESULTS_PATH = 'bench_results.json'
+DATA_DIR = 'bench_data'
+learning_phases = [20, 70, 300, 700, 1100] # legal_hpc_trainer_m과 같은 단계 (1.6k 기준, 큰 코퍼스는 비율대로 늘림)
+
+def percentile_ms(values, q):
+    return float(np.percentile(np.asarray(values) * 1000, q)) if len(values) else 0.0
+
+def peak_rss_mb():
+    # 이 프로세스의 최대 상주 메모리 (리눅스 ru_maxrss 단위 = KB)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+# ==================================================================
+# ⏱️ 측정 프로세스 (mpirun으로 실행되는 쪽)
+# 통신 시간 = 측정 구간 전체 - 계산 시간 (집합 통신에서 다른 코어를 기다린 시간 포함)
+# ==================================================================
+class TimedEngine:
+    # 검색 엔진의 채점/본문 조회 시간만 따로 재는 래퍼 (나머지는 consult_batch의 통신)
+    def __init__(self, engine, clock):
+        self.engine, self.clock = engine, clock
+        self.lo, self.hi = engine.lo, engine.hi
+        self.compute_time = 0.0
+
+    def topk_batch(self, analyzed, k=3):
+        t0 = self.clock()
+        out = self.engine.topk_batch(analyzed, k)
+        self.compute_time += self.clock() - t0
+        return out
+
+    def details(self, case_id, user_vec):
+        t0 = self.clock()
+        out = self.engine.details(case_id, user_vec)
+        self.compute_time += self.clock() - t0
+        return out
+
+def gather_resources(comm, comm_time):
+    rss = comm.gather(peak_rss_mb(), root=0)
+    comm_times = comm.gather(comm_time, root=0)
+    if comm.Get_rank() != 0:
+        return {}
+    return {'peak_rss_mb': max(rss), 'total_rss_mb': sum(rss),
+            'comm_time': max(comm_times), 'comm_time_mean': float(np.mean(comm_times))}
+
+def run_service(args):
+    from mpi4py import MPI
+    import legal_ai_service as service
+    from legal_corpus import open_corpus
+    service.init_mpi()
+    comm, rank = service.comm, service.rank
+
+    t0 = MPI.Wtime()
+    engine = TimedEngine(service.load_shard(args), MPI.Wtime)
+    comm.Barrier()
+    startup_time = MPI.Wtime() - t0
+
+    # 질의 = 코퍼스에서 무작위로 뽑은 판례 본문 (Rank 0만 읽고 전처리, 묶음 단위로 Bcast)
+    queries = None
+    if rank == 0:
+        corpus = open_corpus(args.csv, MPI.COMM_SELF)
+        rows = np.random.default_rng(args.seed).choice(len(corpus), min(args.queries, len(corpus)), replace=False)
+        queries = [corpus.facts(int(r), int(r) + 1)[0] for r in rows]
+    n_queries = comm.bcast(len(queries) if rank == 0 else None, root=0)
+
+    latencies, analyze_time = [], 0.0
+    comm.Barrier()
+    start = MPI.Wtime()
+    for a in range(0, n_queries, args.batch):
+        t0 = MPI.Wtime()
+        analyzed = None
+        if rank == 0:
+            analyzed = [service.analyze_query(q) for q in queries[a:a + args.batch]]
+            analyze_time += MPI.Wtime() - t0
+        analyzed = comm.bcast(analyzed, root=0)
+        service.consult_batch(engine, analyzed)
+        if rank == 0:
+            latencies.extend([MPI.Wtime() - t0] * len(analyzed))
+    elapsed = MPI.Wtime() - start
+    comm_time = elapsed - engine.compute_time - analyze_time
+
+    elapsed = comm.reduce(elapsed, op=MPI.MAX, root=0)
+    result = gather_resources(comm, comm_time)
+    if rank == 0:
+        result.update({'engine': args.engine, 'batch': args.batch, 'queries': n_queries,
+                       'startup_time': startup_time, 'time': elapsed,
+                       'latency_p50_ms': percentile_ms(latencies, 50), 'latency_p95_ms': percentile_ms(latencies, 95),
+                       'latency_p99_ms': percentile_ms(latencies, 99), 'latency_mean_ms': float(np.mean(latencies) * 1000) if latencies else 0.0,
+                       'throughput_qps': n_queries / elapsed if elapsed > 0 else 0.0})
+    return result
+
+def run_service_pool(args):
+    # run_service와 같은 측정을 프로세스 풀(legal_pool)로: 작업자 k = Rank k, 부모 = Rank 0
+    import legal_index
+    from legal_pool import PoolService
+    from legal_search import analyze_query
+
+    t0 = time.perf_counter()
+    service = PoolService(args, args.np)
+    startup_time = time.perf_counter() - t0
+
+    # 질의 = run_service와 같은 무작위 판례 본문 (색인의 본문 열 = 코퍼스 행 순서)
+    shared = service.backend.shared.arrays
+    n_cases = len(shared['case_len'])
+    rows = np.random.default_rng(args.seed).choice(n_cases, min(args.queries, n_cases), replace=False)
+    queries = [legal_index.case_facts(shared, int(r), int(r) + 1)[0] for r in rows]
+    del shared # 공유 메모리 뷰는 close() 전에 놓아야 함
+
+    latencies, analyze_time = [], 0.0
+    start = time.perf_counter()
+    for a in range(0, len(queries), args.batch):
+        t0 = time.perf_counter()
+        analyzed = [analyze_query(q) for q in queries[a:a + args.batch]]
+        analyze_time += time.perf_counter() - t0
+        service.consult_batch(analyzed)
+        latencies.extend([time.perf_counter() - t0] * len(analyzed))
+    elapsed = time.perf_counter() - start
+    comm_times = [elapsed - c - analyze_time for c in service.compute_time]
+
+    rss = service.backend.gather(peak_rss_mb) + [peak_rss_mb()]
+    service.close()
+    return {'peak_rss_mb': max(rss), 'total_rss_mb': sum(rss),
+            'comm_time': max(comm_times), 'comm_time_mean': float(np.mean(comm_times)),
+            'engine': args.engine, 'batch': args.batch, 'queries': len(queries),
+            'startup_time': startup_time, 'time': elapsed,
+            'latency_p50_ms': percentile_ms(latencies, 50), 'latency_p95_ms': percentile_ms(latencies, 95),
+            'latency_p99_ms': percentile_ms(latencies, 99), 'latency_mean_ms': float(np.mean(latencies) * 1000) if latencies else 0.0,
+            'throughput_qps': len(queries) / elapsed if elapsed > 0 else 0.0}
+
+def run_trainer(args):
+    from mpi4py import MPI
+    from legal_corpus import open_corpus, encode_rows
+    from legal_knn import count_matches, RunningNearest
+    comm = MPI.COMM_WORLD
+    rank = comm.Get_rank()
+
+    corpus = open_corpus(args.csv, comm)
+    # 1.6k 코퍼스의 학습 1100 / 테스트 100 분할을 판례 수에 비례해서 늘림 (테스트는 --test-rows 까지만)
+    train_size = len(corpus) * 1100 // 1600
+    test_range = (train_size, min(train_size + max(len(corpus) // 16, 1), train_size + args.test_rows, len(corpus)))
+    phases = sorted({max(1, round(train_size * p / learning_phases[-1])) for p in learning_phases})
+
+    comm.Barrier()
+    start = MPI.Wtime()
+    my_test = corpus.my_block(*test_range)
+    test_m, vocab = encode_rows(corpus, *my_test, 'hard')
+    test_cats = corpus.categories(*my_test)
+    nearest = RunningNearest(test_m)
+    train_cats = []
+
+    curve, step_times, comm_time, prev = [], [], 0.0, 0
+    for count in phases:
+        t0 = MPI.Wtime()
+        # 새로 추가된 학습 판례를 --chunk 건씩 인코딩해서 접어 넣음 (메모리는 청크 크기만큼)
+        for a in range(prev, count, args.chunk):
+            b = min(a + args.chunk, count)
+            new_m, vocab = encode_rows(corpus, a, b, 'hard', vocab)
+            train_cats.extend(corpus.categories(a, b))
+            nearest.fold(new_m)
+        prev = count
+        correct = count_matches(nearest.best, test_cats, train_cats)
+        tc = MPI.Wtime()
+        total = comm.reduce(correct, op=MPI.SUM, root=0)
+        comm_time += MPI.Wtime() - tc
+        step_times.append(MPI.Wtime() - t0)
+        if rank == 0: curve.append(100 * total / (test_range[1] - test_range[0]))
+    elapsed = comm.reduce(MPI.Wtime() - start, op=MPI.MAX, root=0)
+
+    result = gather_resources(comm, comm_time)
+    if rank == 0:
+        n_test = test_range[1] - test_range[0]
+        result.update({'train_rows': train_size, 'test_rows': n_test, 'time': elapsed,
+                       'phases': phases, 'accuracy': curve, 'final_accuracy': curve[-1],
+                       'step_p50_ms': percentile_ms(step_times, 50), 'step_p95_ms': percentile_ms(step_times, 95),
+                       'step_p99_ms': percentile_ms(step_times, 99),
+                       'throughput_pairs_per_sec': train_size * n_test / elapsed if elapsed > 0 else 0.0})
+    return result
+
+def worker_main(args):
+    if args.exec == 'pool':
+        result = run_service_pool(args)
+    else:
+        result = run_service(args) if args.worker == 'service' else run_trainer(args)
+    if result:
+        with open(args.worker_out, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+
+# ==================================================================
+# 🧭 실행기: 코퍼스 준비 -> (규모 x 경로 x 백엔드 x 프로세스 수)마다 mpirun(또는 프로세스 풀) -> 결과 파일 갱신
+# ==================================================================
+def prepare_corpus(rows, args):
+    # bench_data/corpus-<판례 수>/ (없을 때만 생성, 채점/학습에 쓰는 토큰 열까지 미리 만들어 둠)
+    from generate_all_data import generate_columnar
+    from legal_columnar import is_columnar, read_manifest, add_tokens
+    path = os.path.join(args.data_dir, f"corpus-{rows}")
+    if not is_columnar(path) or read_manifest(path)['rows'] != rows:
+        print(f"🏭 코퍼스 생성: {rows:,}건 -> {path}/", flush=True)
+        generate_columnar(path, rows, args.shard_rows, 10_000, args.workers, args.seed)
+    have = read_manifest(path).get('tokens', [])
+    for name in ('korean', 'hard'):
+        if name not in have:
+            print(f"   🔤 tokens-{name} 생성 중...", flush=True)
+            add_tokens(path, name)
+    return path
+
+def load_results(path):
+    if not os.path.exists(path):
+        return {'runs': []}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_results(path, results):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+def run_one(path_name, exec_name, corpus, rows, ranks, args):
+    out = os.path.join(args.data_dir, f"result-{path_name}-{exec_name}-{rows}-{ranks}.json")
+    if os.path.exists(out): os.remove(out)
+    launch = args.mpirun.split() + ['-np', str(ranks)] if exec_name == 'mpi' else []
+    cmd = launch + [sys.executable, os.path.abspath(__file__), '--exec', exec_name, '--np', str(ranks),
+           '--worker', path_name, '--worker-out', out, '--corpus', corpus,
+           '--index', os.path.join(args.data_dir, f"index-{rows}.npz"), '--engine', args.engine,
+           '--queries', str(args.queries), '--batch', str(args.batch), '--test-rows', str(args.test_rows),
+           '--chunk', str(args.chunk), '--seed', str(args.seed)]
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0 or not os.path.exists(out):
+        print(f"❌ {path_name}({exec_name}) {rows:,}건 / {ranks}프로세스 실패\n{proc.stdout[-2000:]}{proc.stderr[-2000:]}", flush=True)
+        return None
+    with open(out, encoding='utf-8') as f:
+        result = json.load(f)
+    os.remove(out)
+    result.update({'path': path_name, 'exec': exec_name, 'rows': rows, 'ranks': ranks,
+                   'wall_time': time.perf_counter() - t0}) # wall_time: 실행기 기준 (mpirun/인터프리터 기동 포함)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="판례 수 x 프로세스 수 확장 벤치마크 (결과: JSON)")
+    parser.add_argument('--sizes', default='1600,16000,160000,1600000', help="쉼표로 구분한 판례 수")
+    parser.add_argument('--ranks', default='1,2,4', help="쉼표로 구분한 MPI 프로세스 수")
+    parser.add_argument('--paths', default='service,trainer', help="측정할 경로 (service, trainer)")
+    parser.add_argument('--out', default=RESULTS_PATH, help="결과 파일 (같은 규모/경로/프로세스 수 기록은 덮어씀)")
+    parser.add_argument('--data-dir', default=DATA_DIR, help="생성한 코퍼스/색인을 두는 폴더 (다음 실행에 재사용)")
+    parser.add_argument('--mpirun', default='mpirun --oversubscribe', help="MPI 실행 명령")
+    parser.add_argument('--execs', default='mpi,pool',
+                        help="service 경로 실행 백엔드 (mpi: mpirun / pool: 프로세스 풀, trainer는 mpi만)")
+    parser.add_argument('--engine', choices=['sparse', 'index', 'scan'], default='sparse', help="service 경로의 검색 엔진")
+    parser.add_argument('--queries', type=int, default=200, help="service 경로 질의 수")
+    parser.add_argument('--batch', type=int, default=1, help="한 번에 Bcast할 질의 수 (1이면 질의 1건씩 지연시간 측정)")
+    parser.add_argument('--test-rows', type=int, default=1000, help="trainer 경로 테스트 판례 최대 수")
+    parser.add_argument('--chunk', type=int, default=100_000, help="trainer 경로에서 한 번에 접어 넣는 학습 판례 수")
+    parser.add_argument('--shard-rows', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="코퍼스 생성 프로세스 수")
+    parser.add_argument('--seed', type=int, default=42)
+    # 내부용: mpirun으로 띄운 측정 프로세스
+    parser.add_argument('--worker', choices=['service', 'trainer'], help=argparse.SUPPRESS)
+    parser.add_argument('--worker-out', help=argparse.SUPPRESS)
+    parser.add_argument('--exec', choices=['mpi', 'pool'], default='mpi', help=argparse.SUPPRESS)
+    parser.add_argument('--np', type=int, default=1, help=argparse.SUPPRESS) # pool 작업자 수
+    parser.add_argument('--corpus', dest='csv', help=argparse.SUPPRESS)
+    parser.add_argument('--index', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker_main(args)
+        return
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    sizes = [int(x) for x in args.sizes.split(',')]
+    ranks = [int(x) for x in args.ranks.split(',')]
+    paths = args.paths.split(',')
+    execs = args.execs.split(',')
+    results = load_results(args.out)
+    results['meta'] = {'engine': args.engine, 'queries': args.queries, 'batch': args.batch,
+                       'test_rows': args.test_rows, 'seed': args.seed, 'cpu_count': os.cpu_count()}
+
+    print("=" * 106)
+    print(f"{'경로':<9}{'실행':<6}{'판례 수':>11}{'NP':>4}{'시간(초)':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}"
+          f"{'처리량':>12}{'RSS(MB)':>10}{'통신(초)':>10}")
+    print("-" * 106)
+    for rows in sizes:
+        corpus = prepare_corpus(rows, args)
+        # 학습기(trainer)는 MPI 전용, service는 백엔드별로
+        for path_name, exec_name in [(p, e) for p in paths for e in execs if p == 'service' or e == 'mpi']:
+            for np_count in ranks:
+                r = run_one(path_name, exec_name, corpus, rows, np_count, args)
+                if r is None: continue
+                results['runs'] = [x for x in results['runs']
+                                   if (x['path'], x.get('exec', 'mpi'), x['rows'], x['ranks'])
+                                   != (path_name, exec_name, rows, np_count)] + [r]
+                save_results(args.out, results) # 규모 하나 끝날 때마다 저장 (중간에 끊겨도 앞 결과는 남음)
+                if path_name == 'service':
+                    p50, p95, p99, tput = r['latency_p50_ms'], r['latency_p95_ms'], r['latency_p99_ms'], f"{r['throughput_qps']:.1f} q/s"
+                else:
+                    p50, p95, p99, tput = r['step_p50_ms'], r['step_p95_ms'], r['step_p99_ms'], f"{r['throughput_pairs_per_sec'] / 1e6:.1f}M쌍/s"
+                print(f"{path_name:<9}{exec_name:<6}{rows:>11,}{np_count:>4}{r['time']:>10.3f}{p50:>10.2f}{p95:>10.2f}{p99:>10.2f}"
+                      f"{tput:>12}{r['peak_rss_mb']:>10.1f}{r['comm_time']:>10.3f}", flush=True)
+    print("=" * 106)
+    print(f"✅ 결과 저장: {args.out} (draw_graph.py / visualize_learning.py 입력)")
+
+if __name__ == "__main__":
+    main()
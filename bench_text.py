@@ -0,0 +1,73 @@
+import re
+import time
+import argparse
+import pandas as pd
+
+from legal_text import (STOPWORDS, CHEAT_WORDS, HARD_MODE_CHEAT_WORDS,
+                        KOREAN_PIPELINE, HARD_MODE_PIPELINE, TextPipeline)
+
+# ==================================================================
+# ⏱️ 전처리 벤치마크: 기존 함수(리스트 in 검사 + 접미사 선형 탐색) vs 컴파일된 파이프라인
+# 전체 판례에 대해 결과가 완전히 같은지 확인하고 문서 1건당 비용(µs)을 비교
+# 캐시 적중: 같은 판례를 다시 토큰화할 때 (학습 단계/레벨 반복, 재질의)
+# ==================================================================
+
+# 기존 구현 그대로 (비교 기준)
+def legacy_normalize_korean(text):
+    text = re.sub(r'[^\w\s]', '', text)
+    words = text.split()
+    clean_words = []
+    for w in words:
+        if w in CHEAT_WORDS: continue
+        if w in STOPWORDS: continue
+        for p in STOPWORDS:
+            if w.endswith(p) and len(w) > len(p):
+                w = w[:-len(p)]
+                break
+        if len(w) >= 2: clean_words.append(w)
+    return set(clean_words)
+
+def legacy_clean_set(text, stops):
+    text = re.sub(r'[^\w\s]', '', text)
+    return set([w for w in text.split() if w not in stops and len(w) > 1])
+
+def legacy_hard_mode_vector(text):
+    text = re.sub(r'[^\w\s]', '', text)
+    return set([w for w in text.split() if w not in HARD_MODE_CHEAT_WORDS and len(w) > 1])
+
+def per_doc_us(fn, texts, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for t in texts: fn(t)
+    return (time.perf_counter() - t0) / (repeat * len(texts)) * 1e6
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="전처리 파이프라인 벤치마크")
+    parser.add_argument('--csv', default='legal_data_total.csv')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    texts = list(pd.read_csv(args.csv)['Facts'])
+    level3 = ['은', '는', '이', '가', '을', '를', '의', '에', '에서', '피고인', '사건']
+    clean_pipeline = TextPipeline(level3)
+    cases = [
+        ("normalize_korean", legacy_normalize_korean, KOREAN_PIPELINE),
+        ("get_clean_set(L3)", lambda t: legacy_clean_set(t, level3), clean_pipeline),
+        ("get_hard_mode_vector", legacy_hard_mode_vector, HARD_MODE_PIPELINE),
+    ]
+
+    print("=" * 84)
+    print(f"판례 {len(texts)}건, 반복 {args.repeat}회 (문서 1건당 µs)")
+    print(f"{'함수':<22}{'기존':>10}{'컴파일':>10}{'캐시 적중':>12}{'가속비(컴파일)':>16}{'결과 일치':>10}")
+    print("-" * 84)
+    for name, legacy, pipeline in cases:
+        same = all(legacy(t) == pipeline.compute(t) for t in texts)
+        t_legacy = per_doc_us(legacy, texts, args.repeat)
+        t_compiled = per_doc_us(pipeline.compute, texts, args.repeat)
+        pipeline.tokens.cache_clear()
+        for t in texts: pipeline(t) # 캐시 채우기
+        t_cached = per_doc_us(pipeline, texts, args.repeat)
+        print(f"{name:<22}{t_legacy:>10.2f}{t_compiled:>10.2f}{t_cached:>12.2f}{t_legacy / t_compiled:>15.2f}x{str(same):>10}")
+    print("-" * 84)
+    print(f"캐시 상태(normalize_korean): {KOREAN_PIPELINE.cache_info()}")
+    print("=" * 84)
@@ -0,0 +1,141 @@
+import os
+import json
+import glob
+import time
+from bisect import bisect_right
+
+# ==================================================================
+# 💾 체크포인트 / 재개 (Checkpoint & Resume)
+# 기존: 진행 상황이 각 코어의 루프 변수뿐 -> 코어 하나나 작업이 죽으면 처음부터 다시
+# 1) 코어마다 자기 로그 파일(rank-K.log)에 '끝낸 구간'과 '찾은 암호'를 한 줄씩 덧붙임 (append)
+#    done <시작> <끝>     : 전역 번호 [시작, 끝) 탐색 완료 (청크가 끝까지 돌았을 때만 기록)
+#    hit <번호> <해시>    : 찾은 후보
+#    줄 단위 쓰기 + flush, fsync는 sync_every초마다 (청크당 한 줄이라 오버헤드 거의 없음)
+# 2) --resume: Rank 0이 모든 로그를 합쳐 끝낸 구간을 병합 -> 남은 구간(gap)만 다시 나눠줌
+#    남은 구간들을 이어 붙인 가상 번호 공간(Remaining) 위에서 정적/동적 분배를 그대로 사용
+#    -> 이전과 코어 수가 달라도 됨 (로그는 구간 단위라 누가 했는지 상관없음)
+# 3) 재개할 때 합친 결과를 base.log 하나로 압축하고 코어별 로그는 지움 (rename이라 중간에 죽어도 안전)
+# meta.json: 탐색 공간(마스크/문자 집합/길이)과 목표 해시 -> 다른 공간으로 재개하는 실수 방지,
+#            랜덤 정답(mpi_bruteforce_r.py)도 목표 해시가 남아 있어서 이어서 찾을 수 있음
+# ==================================================================
+META = 'meta.json'
+BASE = 'base.log'
+
+def merge_ranges(ranges):
+    # 겹치거나 맞닿은 구간 병합 -> 정렬된 [(a, b), ...]
+    out = []
+    for a, b in sorted(ranges):
+        if out and a <= out[-1][1]:
+            out[-1] = (out[-1][0], max(out[-1][1], b))
+        else:
+            out.append((a, b))
+    return out
+
+def gaps(done, total):
+    # [0, total) 에서 끝낸 구간(병합된 것)을 뺀 나머지
+    out, i = [], 0
+    for a, b in done:
+        if i < a: out.append((i, a))
+        i = max(i, b)
+    if i < total: out.append((i, total))
+    return out
+
+class Remaining:
+    # 남은 구간들을 이어 붙인 가상 번호 공간: 가상 [a, b) -> 실제 전역 번호 구간들
+    def __init__(self, ranges):
+        self.ranges = ranges
+        self.offsets = [0]
+        for a, b in ranges: self.offsets.append(self.offsets[-1] + b - a)
+        self.total = self.offsets[-1]
+
+    def real(self, a, b):
+        k = bisect_right(self.offsets, a) - 1
+        while a < b and k < len(self.ranges):
+            lo, hi = self.ranges[k]
+            x = lo + a - self.offsets[k]
+            y = min(hi, lo + b - self.offsets[k])
+            if x < y: yield x, y
+            a, k = self.offsets[k + 1], k + 1
+
+def read_log(path):
+    # 로그 파일 -> (끝낸 구간 목록, {번호: 해시 digest}) - 죽을 때 잘린 마지막 줄 등은 무시
+    done, hits = [], {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            try:
+                if len(parts) == 3 and parts[0] == 'done':
+                    done.append((int(parts[1]), int(parts[2])))
+                elif len(parts) == 3 and parts[0] == 'hit' and len(parts[2]) == 64:
+                    hits[int(parts[1])] = bytes.fromhex(parts[2])
+            except ValueError:
+                continue
+    return done, hits
+
+class Checkpoint:
+    def __init__(self, path, sync_every=30.0):
+        self.path = path
+        self.sync_every = sync_every
+        self.f = None
+
+    # ---------- Rank 0 전용 ----------
+    def start(self, meta):
+        # 새로 시작: 이전 로그를 지우고 meta 기록
+        os.makedirs(self.path, exist_ok=True)
+        for p in glob.glob(os.path.join(self.path, '*.log')): os.remove(p)
+        with open(os.path.join(self.path, META), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    def resume(self, meta):
+        # 재개: meta 확인 -> (저장된 meta, 병합된 끝낸 구간, {번호: digest}), base.log로 압축
+        meta_path = os.path.join(self.path, META)
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"체크포인트가 없습니다: {meta_path}")
+        with open(meta_path, encoding='utf-8') as f:
+            saved = json.load(f)
+        for key in meta:
+            if key != 'targets' and saved.get(key) != meta[key]:
+                raise ValueError(f"체크포인트와 탐색 공간이 다릅니다 ({key}: {saved.get(key)} != {meta[key]})")
+
+        logs = glob.glob(os.path.join(self.path, '*.log'))
+        done, hits = [], {}
+        for p in logs:
+            d, h = read_log(p)
+            done += d
+            hits.update(h)
+        done = merge_ranges(done)
+
+        tmp = os.path.join(self.path, BASE + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for a, b in done: f.write(f"done {a} {b}\n")
+            for i, digest in sorted(hits.items()): f.write(f"hit {i} {digest.hex()}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(self.path, BASE))
+        for p in logs:
+            if os.path.basename(p) != BASE: os.remove(p)
+        return saved, done, hits
+
+    # ---------- 모든 코어 ----------
+    def open(self, rank):
+        self.f = open(os.path.join(self.path, f"rank-{rank}.log"), 'a', encoding='utf-8')
+        self.last_sync = time.monotonic()
+
+    def _write(self, line, sync=False):
+        self.f.write(line)
+        self.f.flush()
+        if sync or time.monotonic() - self.last_sync >= self.sync_every:
+            os.fsync(self.f.fileno())
+            self.last_sync = time.monotonic()
+
+    def done(self, a, b):
+        self._write(f"done {a} {b}\n")
+
+    def hit(self, i, digest):
+        self._write(f"hit {i} {digest.hex()}\n", sync=True) # 찾은 건 바로 디스크로
+
+    def close(self):
+        if self.f:
+            self._write('', sync=True)
+            self.f.close()
+            self.f = None
@@ -0,0 +1,141 @@
+import time
+import random
+import hashlib
+import argparse
+
+from bruteforce_engine import target_digest, load_targets
+from bruteforce_checkpoint import gaps
+from bruteforce_table import PinTable
+from hpc_backend import EXECS
+
+# ==================================================================
+# 🧾 무차별 대입 작업 정의 (mpi4py 없이 import 됨)
+# 명령행 옵션 / 목표 설정(정답, 목표 파일, 체크포인트 재개, 조회 테이블) / 최종 결과 출력은 백엔드 공용
+# 실제 탐색은 --exec로 고른 쪽이 담당
+#   mpi  : mpi_crack.py  (mpirun, Bcast / RMA 공유 카운터 / Iallreduce 조기 종료 / Gather)
+#   pool : pool_crack.py (한 서버 프로세스 풀, 공유 메모리 목표 집합 / 청크 큐 / Event 조기 종료)
+# ==================================================================
+
+def custom_charsets(args):
+    return {str(k): v for k, v in enumerate([args.charset1, args.charset2, args.charset3, args.charset4], 1) if v}
+
+def space_meta(args, space):
+    return {'mask': args.mask, 'charsets': custom_charsets(args),
+            'length': list(args.length) if args.length else None, 'total': space.total}
+
+def prepare(args, space, ckpt, tag="[Rank 0]"):
+    # Rank 0(또는 pool의 부모)만 호출: (목표 digest 목록, 남은 구간 목록, 이미 찾은 것, 전체 목표 수)
+    # --targets 파일이 있으면 해시 여러 개를 한 번의 탐색으로 (포렌식 일괄 해독)
+    # --resume이면 목표 해시와 끝낸 구간을 체크포인트에서 복원 -> 남은 구간(todo)만 탐색
+    # 시작할 수 없으면 todo 자리에 오류 문구(str)
+    digests, todo, prev, n_all = None, None, [], 0
+    print(f"\n{tag} 🎭 탐색 공간: {args.mask}"
+          f"{f' (길이 {args.length[0]}-{args.length[1]})' if args.length else ''} -> 후보 {space.total:,}개", flush=True)
+    meta = space_meta(args, space)
+    if args.resume:
+        try:
+            saved, done, hits = ckpt.resume(meta)
+        except (OSError, ValueError) as e:
+            return None, str(e), [], 0
+        digests = [target_digest(h) for h in saved['targets']]
+        n_all = len(digests)
+        prev = [(space.candidate(i), d, None) for i, d in sorted(hits.items())] # 이전 실행에서 찾은 것
+        digests = [d for d in digests if d not in hits.values()]
+        todo = gaps(done, space.total)
+        left = sum(b - a for a, b in todo)
+        print(f"{tag} 💾 체크포인트에서 재개: 완료 {space.total - left:,}개 / 남은 {left:,}개"
+              f" ({len(todo)}개 구간), 찾은 해시 {len(prev)}/{n_all}개", flush=True)
+    else:
+        if args.targets:
+            digests = load_targets(args.targets)
+            print(f"{tag} 📂 목표 해시 {len(digests)}개 로드 완료: {args.targets}", flush=True)
+        else:
+            if args.secret:
+                secret_pin = args.secret # [시연용] 정해진 정답
+            else:
+                # 공간 안에서 랜덤으로 하나 뽑음 (전역 번호 -> 후보)
+                secret_pin = space.candidate(random.randrange(space.total))
+                print(f"{tag} 🎲 랜덤 암호 생성 완료! (정답은 비밀 쉿!)", flush=True)
+            target_hash = hashlib.sha256(secret_pin.encode()).hexdigest()
+            print(f"{tag} 목표 해시값: {target_hash[:10]}...", flush=True)
+            digests = [target_digest(target_hash)] # 비교는 16진수 문자열 대신 원본 32바이트로
+        n_all = len(digests)
+        todo = [(0, space.total)]
+        if ckpt: ckpt.start({**meta, 'targets': [d.hex() for d in digests]})
+
+    # --table: 미리 만든 조회 테이블(mpi_pin_table.py)에서 먼저 찾고, 없는 목표만 무차별 대입
+    if args.table:
+        t0 = time.perf_counter()
+        table = PinTable(args.table)
+        if not table.matches(args.mask, meta['charsets'], args.length):
+            return None, f"테이블 {args.table}의 공간({table.manifest['mask']}, {table.algo})이 탐색 공간과 다릅니다", [], 0
+        hits = table.lookup_many(digests)
+        prev += [(pw, d, time.perf_counter() - t0) for d, pw in hits.items()]
+        digests = [d for d in digests if d not in hits]
+        print(f"{tag} 📚 테이블 조회: {len(hits)}개 찾음 ({(time.perf_counter() - t0) * 1e3:.2f}ms),"
+              f" 남은 목표 {len(digests)}개", flush=True)
+    return digests, todo, prev, n_all
+
+def auto_chunk(args, space, total, size):
+    # 동적 분배 청크 크기 (--chunk 0이면 작업자당 32개 정도, 블록 크기 이상 100만 이하)
+    return args.chunk or max(space.block, min(total // (size * 32), 1_000_000))
+
+def split_ranges(start, end, chunk):
+    return [(a, min(a + chunk, end)) for a in range(start, end, chunk)]
+
+def print_summary(args, all_found, new_found, n_all, size, chunk_counts, duration, who="참여 프로세스"):
+    print("\n" + "="*50, flush=True)
+    if n_all > 1 or args.targets:
+        print(f" ✅ 해결한 해시: {len(all_found)}/{n_all}개", flush=True)
+        for pw, digest, t in all_found:
+            print(f"   {digest.hex()[:16]}... -> {pw} ({'이전 실행' if t is None else f'{t:.4f}초'})", flush=True)
+    elif all_found:
+        print(f" ✅ 성공! 찾은 암호: {all_found[0][0]}", flush=True)
+    else:
+        print(f" ❌ 실패. 범위 내에 암호가 없습니다.", flush=True)
+
+    print(f" 💻 {who} 수: {size}개", flush=True)
+    print(f" 📦 코어별 청크 수({args.schedule}): {chunk_counts}", flush=True)
+    print(f" ⏱️ 총 소요 시간: {duration:.4f}초", flush=True)
+    if new_found:
+        print(f" 🎯 {'마지막 ' if n_all > 1 else ''}정답 발견 시각: {new_found[-1][2]:.4f}초"
+              f" (조기 종료 {'켬' if args.check_every > 0 else '끔'})", flush=True)
+    print("="*50 + "\n", flush=True)
+
+def length_range(text):
+    # "6" -> (6, 6), "6-8" -> (6, 8)
+    lo, _, hi = text.partition('-')
+    return int(lo), int(hi or lo)
+
+def build_parser(description="MPI SHA-256 마스크 무차별 대입", mask=None, secret=None, chunk=0):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--mask', default=mask, required=mask is None,
+                        help="자리별 문자 집합: ?d 숫자 ?l 소문자 ?u 대문자 ?s 특수문자 ?a 전부 ?h/?H 16진수 ?1~?4 사용자 집합")
+    for k in range(1, 5):
+        parser.add_argument(f'-{k}', f'--charset{k}', help=f"마스크의 ?{k} 자리에 쓸 문자들")
+    parser.add_argument('--length', type=length_range, help="길이 범위 (예: 6-8 -> 마스크 앞 6/7/8자리 공간을 이어서 탐색)")
+    parser.add_argument('--secret', default=secret, help="시연용 정답 (없으면 공간 안에서 랜덤)")
+    parser.add_argument('--targets', help="목표 해시 파일 (한 줄에 SHA-256 하나, 한 번의 탐색으로 전부 해독)")
+    parser.add_argument('--exec', choices=EXECS, default='mpi',
+                        help="mpi: mpirun 프로세스 / pool: 한 서버 안 프로세스 풀 (MPI 없이, mpirun 없이 실행)")
+    parser.add_argument('--workers', type=int, help="pool 작업자 수 (기본: CPU 코어 수)")
+    parser.add_argument('--check-every', type=int, default=10000,
+                        help="다른 코어가 찾았는지 확인하는 후보 간격 (0이면 조기 종료 끔)")
+    parser.add_argument('--schedule', choices=['dynamic', 'static'], default='dynamic',
+                        help="dynamic: 공유 카운터에서 청크를 받아감 / static: 몫+나머지 고정 블록")
+    parser.add_argument('--chunk', type=int, default=chunk, help="동적 분배 청크 크기 (후보 수, 0이면 자동)")
+    parser.add_argument('--checkpoint', help="끝낸 구간/찾은 암호를 기록할 디렉터리 (없으면 체크포인트 끔)")
+    parser.add_argument('--resume', action='store_true', help="--checkpoint 디렉터리에서 남은 구간만 이어서 탐색")
+    parser.add_argument('--table', help="미리 만든 해시 조회 테이블 디렉터리 (mpi_pin_table.py build)")
+    parser.add_argument('--sync-every', type=float, default=30.0, help="체크포인트 fsync 간격 (초)")
+    return parser
+
+def run(args):
+    # 고른 백엔드만 import (mpi는 mpi4py가 필요, pool은 필요 없음)
+    if args.resume and not args.checkpoint:
+        raise SystemExit("--resume에는 --checkpoint 경로가 필요합니다")
+    if args.exec == 'pool':
+        from pool_crack import solve
+    else:
+        from mpi_crack import solve
+    solve(args)
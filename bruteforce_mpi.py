@@ -0,0 +1,112 @@
+import numpy as np
+from mpi4py import MPI
+
+# ==================================================================
+# 🛑 전역 조기 종료 신호 (Cooperative Early Termination)
+# 기존: 암호를 찾은 코어만 break -> 나머지는 자기 구역을 끝까지 돌고 나서야 gather에 도착
+# 1) 모든 코어가 [찾은 개수, 구역 끝남] 두 칸짜리 플래그를 비동기 Iallreduce(SUM)로 계속 합산
+# 2) 탐색 중에는 N개 후보마다 poll()로 Test만 해봄 (기다리지 않음, 통신은 백그라운드)
+#    지난 합산이 끝났으면 결과 확인 후 다음 합산을 바로 시작
+# 3) 합산 결과 '찾은 개수 >= need'(목표 해시 수) 이면 모든 코어가 같은 회차에서 동시에 멈춤
+#    구역을 먼저 끝낸 코어는 finish()에서 '모두 찾음' 또는 '모두 끝남'이 나올 때까지 합산에만 참여
+#    (목표 해시마다 정답 후보는 하나뿐이라 코어별 찾은 개수의 합 = 해결된 목표 수)
+# 모든 코어가 같은 합산 결과를 보고 판단하므로 Iallreduce 호출 횟수가 항상 같음 (데드락 없음)
+# ==================================================================
+class GlobalStop:
+    def __init__(self, comm=MPI.COMM_WORLD, need=1):
+        self.comm = comm
+        self.size = comm.Get_size()
+        self.need = need
+        self.flags = np.zeros(2, dtype=np.int64)  # [찾은 개수, 구역 끝남] (내 상태)
+        self.sent = np.zeros(2, dtype=np.int64)   # 진행 중인 합산에 넘긴 값 (끝날 때까지 건드리면 안 됨)
+        self.total = np.zeros(2, dtype=np.int64)
+        self.req = None
+        self.rounds = 0
+        self.stopped = False # 목표를 모두 찾음
+        self.ended = False   # 더 이상 합산 안 함 (찾음 또는 모두 끝남)
+
+    def _start(self):
+        self.sent[:] = self.flags
+        self.req = self.comm.Iallreduce(self.sent, self.total, op=MPI.SUM)
+        self.rounds += 1
+
+    def _check(self):
+        # 끝난 합산 결과로 판단 (모든 코어가 같은 값을 봄)
+        self.req = None
+        if self.total[0] >= self.need:
+            self.stopped = self.ended = True
+        elif self.total[1] == self.size:
+            self.ended = True
+        else:
+            self._start()
+
+    def poll(self, found=0):
+        # 탐색 루프에서 호출 (found: 지금까지 내가 찾은 개수): 멈춰야 하면 True
+        if found: self.flags[0] = int(found)
+        if self.ended: return self.stopped
+        if self.req is None:
+            self._start()
+        elif self.req.Test():
+            self._check()
+        return self.stopped
+
+    def finish(self, found=0):
+        # 내 구역이 끝났거나 다 찾았을 때: 모든 코어가 같은 결론에 도달할 때까지 합산에 참여
+        if found: self.flags[0] = int(found)
+        self.flags[1] = 1
+        while not self.ended:
+            if self.req is None:
+                self._start()
+            self.req.Wait()
+            self._check()
+        return self.stopped
+
+# ==================================================================
+# 🎯 목표 해시 전파: digest(32바이트)들을 정렬된 uint8 배열 하나로 이어 붙여 Bcast (pickle 없음)
+# 받은 쪽은 digest 집합(set)으로 -> 후보마다 목표 수와 상관없이 O(1) 검사
+# ==================================================================
+DIGEST_SIZE = 32
+
+def bcast_targets(digests, comm=MPI.COMM_WORLD):
+    n = comm.bcast(len(digests) if comm.Get_rank() == 0 else None, root=0)
+    buf = np.frombuffer(b''.join(sorted(digests)), dtype=np.uint8).copy() if comm.Get_rank() == 0 \
+        else np.empty(n * DIGEST_SIZE, dtype=np.uint8)
+    comm.Bcast(buf, root=0)
+    raw = buf.tobytes()
+    return {raw[k:k + DIGEST_SIZE] for k in range(0, len(raw), DIGEST_SIZE)}
+
+# ==================================================================
+# 🔁 동적 작업 분배 (Work Stealing): 공유 원자 카운터
+# 기존: count/remainder 정적 블록 -> 바쁜 코어 하나가 전체를 기다리게 만듦
+# Rank 0 메모리에 '다음 청크 번호'(int64) 하나를 MPI 창(Window)으로 열어두고
+# 각 코어는 자기 청크가 끝날 때마다 Fetch_and_op(SUM, +1)로 번호를 하나씩 가져감 (원자적 -> 중복 없음)
+# Rank 0도 탐색에 참여 (수동 타깃 RMA라 Rank 0이 따로 응답할 필요 없음)
+# -> 빠른 코어는 청크를 더 많이, 느린 코어는 적게 가져가서 부하 불균형이 사라짐
+# ==================================================================
+class ChunkCounter:
+    def __init__(self, total, chunk, comm=MPI.COMM_WORLD):
+        self.total, self.chunk = total, chunk
+        itemsize = MPI.INT64_T.Get_size()
+        self.win = MPI.Win.Allocate(itemsize if comm.Get_rank() == 0 else 0, itemsize, comm=comm)
+        if comm.Get_rank() == 0:
+            self.win.Lock(0)
+            self.win.Put(np.zeros(1, dtype=np.int64), 0)
+            self.win.Unlock(0)
+        comm.Barrier()
+        self.one = np.ones(1, dtype=np.int64)
+        self.got = np.zeros(1, dtype=np.int64)
+        self.taken = 0 # 내가 가져간 청크 수
+
+    def next(self):
+        # 다음 청크 [a, b) (더 없으면 None)
+        self.win.Lock(0, MPI.LOCK_SHARED)
+        self.win.Fetch_and_op(self.one, self.got, 0, op=MPI.SUM)
+        self.win.Unlock(0)
+        a = int(self.got[0]) * self.chunk
+        if a >= self.total:
+            return None
+        self.taken += 1
+        return a, min(a + self.chunk, self.total)
+
+    def free(self):
+        self.win.Free()
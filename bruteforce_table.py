@@ -0,0 +1,91 @@
+import os
+import json
+import hashlib
+import numpy as np
+
+from bruteforce_engine import mask_keyspace
+
+# ==================================================================
+# 📚 미리 계산한 해시 -> 후보 조회 테이블 (숫자 PIN 공간 등 자주 푸는 공간용)
+# 같은 6/8자리 공간을 매번 수 분씩 다시 해시하는 대신, 한 번만 MPI로 병렬 생성해 두고 (mpi_pin_table.py build)
+# 목표 해시는 메모리 맵 파일 위 이진 탐색으로 마이크로초 안에 찾음
+# 테이블 = 폴더 하나
+#   manifest.json : 포맷, 마스크/문자 집합/길이, 해시 알고리즘, 후보 수, 번호 dtype
+#   keys.u64      : digest 앞 8바이트 (big-endian -> uint64), 오름차순 정렬
+#   index.u32     : 같은 위치 후보의 전역 번호 (후보 수가 2^32 이상이면 index.u64)
+# 앞 8바이트만 저장(12바이트/후보, 8자리 공간 = 1.2GB)하므로 조회할 때 후보를 다시 해시해서 전체 digest로 확인
+# ==================================================================
+FORMAT = 'pin-table-v1'
+MANIFEST = 'manifest.json'
+KEY_BYTES = 8
+
+# 해시 알고리즘 (모두 표준 hashlib)
+ALGORITHMS = {'sha256': hashlib.sha256, 'sha1': hashlib.sha1, 'md5': hashlib.md5, 'sha512': hashlib.sha512}
+
+def index_dtype(total):
+    return np.uint32 if total <= 2**32 else np.uint64
+
+def digest_keys(digests):
+    # 이어 붙인 digest 바이트 -> 앞 8바이트를 big-endian uint64로 (정렬 순서 = 바이트 순서)
+    raw = np.frombuffer(b''.join(digests), dtype=np.uint8).reshape(len(digests), -1)
+    return raw[:, :KEY_BYTES].copy().view('>u8').ravel().astype(np.uint64)
+
+def hash_range(space, start, end, algo='sha256'):
+    # [start, end) 후보의 (키, 전역 번호) - 엔진과 같이 앞자리 상태 copy() + 뒷자리 update
+    new = ALGORITHMS[algo]
+    keys = np.empty(end - start, dtype=np.uint64)
+    index = np.arange(start, end, dtype=index_dtype(space.total))
+    pos = 0
+    for sub, a, b, off in space.pieces(start, end):
+        for p, lo, hi in sub.blocks(a, b):
+            copy = new(sub.prefix(p)).copy
+            digests = []
+            for s in sub.suffixes[lo:hi]:
+                h = copy()
+                h.update(s)
+                digests.append(h.digest())
+            keys[pos:pos + hi - lo] = digest_keys(digests)
+            pos += hi - lo
+    return keys, index
+
+# ==================================================================
+# 🔎 조회: 키 열을 memmap으로 열고 searchsorted(이진 탐색) -> 같은 키 후보만 다시 해시해서 확인
+# ==================================================================
+class PinTable:
+    def __init__(self, path):
+        with open(os.path.join(path, MANIFEST), encoding='utf-8') as f:
+            self.manifest = m = json.load(f)
+        if m.get('format') != FORMAT:
+            raise ValueError(f"{path}: 지원하지 않는 테이블 포맷 {m.get('format')}")
+        self.algo = m['algorithm']
+        self.space = mask_keyspace(m['mask'], m['charsets'], m['length'])
+        self.keys = np.memmap(os.path.join(path, 'keys.u64'), dtype=np.uint64, mode='r')
+        ext = 'u32' if m['index'] == 'uint32' else 'u64'
+        self.index = np.memmap(os.path.join(path, f"index.{ext}"), dtype=np.dtype(m['index']), mode='r')
+        if len(self.keys) != m['total'] or len(self.index) != m['total']:
+            raise ValueError(f"{path}: 테이블 크기가 manifest와 다릅니다 (생성이 중간에 끊겼나요?)")
+
+    def matches(self, mask, custom=None, lengths=None, algo='sha256'):
+        # 이 테이블이 해당 탐색 공간/알고리즘용인지
+        m = self.manifest
+        return (m['mask'], m['charsets'], m['length'], m['algorithm']) == \
+            (mask, custom or {}, list(lengths) if lengths else None, algo)
+
+    def lookup_many(self, digests):
+        # digest 목록 -> {digest: 후보 문자열} (테이블에 없는 것은 빠짐)
+        if not digests: return {}
+        keys = digest_keys(digests)
+        lo = np.searchsorted(self.keys, keys, side='left')
+        hi = np.searchsorted(self.keys, keys, side='right')
+        new = ALGORITHMS[self.algo]
+        out = {}
+        for d, a, b in zip(digests, lo.tolist(), hi.tolist()):
+            for i in self.index[a:b].tolist(): # 앞 8바이트가 같은 후보 (거의 항상 0~1개)
+                pw = self.space.candidate_bytes(i)
+                if new(pw).digest() == d:
+                    out[d] = pw.decode('utf-8')
+                    break
+        return out
+
+    def lookup(self, digest):
+        return self.lookup_many([digest]).get(digest)
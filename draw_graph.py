@@ -1,14 +1,38 @@
+import sys
+import json
+import argparse
 import matplotlib.pyplot as plt
 import numpy as np
 
+# 측정값은 bench_scaling.py가 만든 결과 파일(bench_results.json)에서 읽음
+parser = argparse.ArgumentParser(description="실행 시간 / 가속비 / 데이터 규모 그래프")
+parser.add_argument('--results', default='bench_results.json')
+parser.add_argument('--path', choices=['service', 'trainer'], default='service', help="그릴 측정 경로")
+parser.add_argument('--exec', choices=['mpi', 'pool'], default='mpi', help="그릴 실행 백엔드 (bench_scaling.py --execs)")
+parser.add_argument('--rows', type=int, help="프로세스 수 그래프에 쓸 판례 수 (기본: 결과에 있는 가장 큰 규모)")
+args = parser.parse_args()
+
+try:
+    with open(args.results, encoding='utf-8') as f:
+        runs = [r for r in json.load(f)['runs'] if r['path'] == args.path and r.get('exec', 'mpi') == args.exec]
+except FileNotFoundError:
+    print(f"❌ {args.results}가 없습니다. bench_scaling.py를 먼저 실행하세요!")
+    sys.exit(1)
+if not runs:
+    print(f"❌ {args.results}에 {args.path}({args.exec}) 측정 결과가 없습니다.")
+    sys.exit(1)
+
+rows = args.rows or max(r['rows'] for r in runs)
+by_np = sorted((r for r in runs if r['rows'] == rows), key=lambda r: r['ranks'])
+
 # 프로세스 개수 (X축)
-np_counts = [1, 3, 5, 7, 10, 12]
+np_counts = [r['ranks'] for r in by_np]
 
 # 각 프로세스별 실행 시간 (초)
-exec_times = [1.82, 0.65, 0.42, 0.31, 0.24, 0.19] 
+exec_times = [r['time'] for r in by_np]
 
 # 가속비(Speedup) 자동 계산 (T_1 / T_n)
-t_serial = exec_times[0] # 첫 번째 값이 시리얼 시간이라고 가정
+t_serial = exec_times[0] # 첫 번째 값(가장 적은 프로세스 수)을 기준 시간으로
 speedups = [t_serial / t for t in exec_times]
 
 # 그래프 그리기
@@ -17,20 +41,20 @@ plt.figure(figsize=(10, 10))
 # 1. 첫 번째 그래프: 실행 시간 (Execution Time)
 plt.subplot(2, 1, 1) # 2행 1열 중 첫 번째
 plt.plot(np_counts, exec_times, marker='o', linestyle='-', color='b', label='Execution Time')
-plt.title(f'Execution Time vs Processes (NP)', fontsize=14, fontweight='bold')
+plt.title(f'Execution Time vs Processes (NP) - {args.path}, {rows:,} cases', fontsize=14, fontweight='bold')
 plt.ylabel('Time (seconds)', fontsize=12)
 plt.grid(True, linestyle='--', alpha=0.6)
-plt.xticks(np_counts) 
+plt.xticks(np_counts)
 
 # 값 표시하기
 for x, y in zip(np_counts, exec_times):
-    plt.text(x, y + 0.05, f"{y:.2f}s", ha='center', fontsize=10, fontweight='bold')
+    plt.text(x, y + max(exec_times) * 0.03, f"{y:.2f}s", ha='center', fontsize=10, fontweight='bold')
 
-# 2. 두 번째 그래프: 가속비 (Speedup) 
+# 2. 두 번째 그래프: 가속비 (Speedup)
 plt.subplot(2, 1, 2) # 2행 1열 중 두 번째
 plt.plot(np_counts, speedups, marker='s', linestyle='--', color='r', label='Speedup')
 
-plt.plot(np_counts, np_counts, 'k:', alpha=0.3, label='Ideal Speedup') 
+plt.plot(np_counts, [n / np_counts[0] for n in np_counts], 'k:', alpha=0.3, label='Ideal Speedup')
 plt.title('Speedup Analysis', fontsize=14, fontweight='bold')
 plt.xlabel('Number of Processes (NP)', fontsize=12)
 plt.ylabel('Speedup (x times)', fontsize=12)
@@ -46,3 +70,29 @@ for x, y in zip(np_counts, speedups):
 plt.tight_layout()
 plt.savefig('result_graph_curve.png', dpi=300)
 print("완성! 'result_graph_curve.png' 파일이 생성되었습니다.")
+
+# ==================================================================
+# 📏 데이터 규모 그래프: 판례 수(X축, 로그)에 따른 지연시간/시간, 최대 RSS, 통신 시간 (프로세스 수별 선)
+# ==================================================================
+if args.path == 'service':
+    metrics = [('latency_p50_ms', 'Latency p50 (ms)'), ('latency_p95_ms', 'Latency p95 (ms)')]
+else:
+    metrics = [('time', 'Classification Time (s)'), ('step_p95_ms', 'Step p95 (ms)')]
+metrics += [('peak_rss_mb', 'Peak RSS per Rank (MB)'), ('comm_time', 'Communication Time (s)')]
+
+plt.figure(figsize=(12, 9))
+for i, (key, label) in enumerate(metrics):
+    plt.subplot(2, 2, i + 1)
+    for n in sorted({r['ranks'] for r in runs}):
+        line = sorted((r for r in runs if r['ranks'] == n), key=lambda r: r['rows'])
+        plt.plot([r['rows'] for r in line], [r[key] for r in line], marker='o', label=f'NP={n}')
+    plt.xscale('log')
+    plt.title(label, fontsize=12, fontweight='bold')
+    plt.xlabel('Number of Cases', fontsize=10)
+    plt.grid(True, linestyle='--', alpha=0.6)
+    plt.legend(fontsize=9)
+
+plt.suptitle(f'Data Scaling - {args.path}', fontsize=14, fontweight='bold')
+plt.tight_layout()
+plt.savefig('result_graph_scaling.png', dpi=300)
+print("완성! 'result_graph_scaling.png' 파일이 생성되었습니다.")
@@ -1,5 +1,13 @@
-import pandas as pd
+import os
+import time
 import random
+import argparse
+import numpy as np
+import pandas as pd
+from multiprocessing import Pool
+
+import legal_index
+from legal_columnar import ShardWriter, shard_name, write_manifest
 
 random.seed(42) # 재현성을 위해 고정
 
@@ -21,26 +29,92 @@ scenarios = {
     '강제추행': ["혼잡한 출근길 지하철에서 피해자의 신체를 밀착함", "회식 자리에서 부하 직원의 의사에 반하여 신체를 만짐", "엘리베이터 내에서 기습적으로 피해자를 추행함"]
 }
 
-def generate_full_case(category, case_id):
-    loc, scenario = random.choice(locations), random.choice(scenarios[category])
-    evid = random.sample(evidences, 2)
-    factor = random.choice(mitigations + aggravations)
-    date, amt = f"2025년 {random.randint(1,12)}월 {random.randint(1,28)}일", f"{random.randint(100, 5000)}만 원"
+def generate_full_case(category, case_id, rng=random):
+    loc, scenario = rng.choice(locations), rng.choice(scenarios[category])
+    evid = rng.sample(evidences, 2)
+    factor = rng.choice(mitigations + aggravations)
+    date, amt = f"2025년 {rng.randint(1,12)}월 {rng.randint(1,28)}일", f"{rng.randint(100, 5000)}만 원"
     
     part1 = f"[{category} 사건 - {case_id}] 피고인은 {date}경 {loc} 일대에서 {scenario}의 혐의로 기소되었습니다. "
     part2 = f"상세 경위에 따르면 피고인은 {amt} 상당의 피해를 발생시켰으며, 범행 전후의 정황이 매우 불량합니다. "
     part3 = f"수사 기관은 {evid[0]} 및 {evid[1]}를 확보하여 유죄를 입증하였습니다. "
     part4 = f"본 법원은 피고인의 {factor} 등을 종합적으로 고려하여 판결을 내립니다. "
-    outcome = "무죄" if "증거가 불충분" in factor else f"징역 {random.randint(1,3)}년"
+    outcome = "무죄" if "증거가 불충분" in factor else f"징역 {rng.randint(1,3)}년"
     
     return part1 + part2 + part3 + part4 + f" [최종 판결: {outcome}]"
 
-# 1,200개(Train/Test) + 400개(Challenge) = 총 1,600개 생성
 categories = list(scenarios.keys())
-all_cases = []
-for i in range(1600):
-    cat = categories[i % 10]
-    all_cases.append({'Category': cat, 'Facts': generate_full_case(cat, f"CASE-{i}")})
 
-pd.DataFrame(all_cases).to_csv('legal_data_total.csv', index=False, encoding='utf-8-sig')
-print("✅ 1,600개 대용량 판례 데이터 생성 완료!")
+# ==================================================================
+# 🏭 대용량 스트리밍 생성 (--rows N --out 폴더)
+# 행 구간을 샤드(기본 100만 건)로 나눠 프로세스들이 나눠 만들고, 샤드 안에서는 청크 단위로 바로 디스크에 씀
+# -> 메모리는 청크 크기만큼만 사용 (행 수와 무관)
+# 난수 시드는 (기본 시드, 샤드 번호)로 샤드마다 독립 -> 프로세스 수를 바꿔도 같은 결과
+# 출력은 legal_columnar 포맷 (샤드 폴더 + manifest.json)
+# ==================================================================
+def shard_seed(seed, shard):
+    return int(np.random.SeedSequence([seed, shard]).generate_state(1)[0])
+
+def generate_shard(job):
+    out_dir, shard, start, end, chunk, seed = job
+    rng = random.Random(shard_seed(seed, shard))
+    writer = ShardWriter(os.path.join(out_dir, shard_name(shard)), categories)
+    for a in range(start, end, chunk):
+        cats = [categories[i % 10] for i in range(a, min(a + chunk, end))]
+        writer.write_chunk(cats, [generate_full_case(cat, f"CASE-{i}", rng) for i, cat in enumerate(cats, a)])
+    return shard, writer.close()
+
+def generate_columnar(out_dir, rows, shard_rows, chunk, workers, seed):
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(out_dir, s, a, min(a + shard_rows, rows), chunk, seed)
+            for s, a in enumerate(range(0, rows, shard_rows))]
+    counts = [0] * len(jobs)
+    with Pool(workers) as pool:
+        for shard, n in pool.imap_unordered(generate_shard, jobs):
+            counts[shard] = n
+            print(f"   📦 {shard_name(shard)}: {n:,}건", flush=True)
+    return write_manifest(out_dir, categories, counts, seed=seed)
+
+def main():
+    parser = argparse.ArgumentParser(description="판례 데이터 생성")
+    parser.add_argument('--append', type=int, metavar='N', help="기존 CSV를 다시 쓰지 않고 새 판례 N건만 만들어 증분 추가")
+    parser.add_argument('--rows', type=int, help="대용량 모드: 만들 판례 수 (--out 폴더에 열 기반 샤드로 저장)")
+    parser.add_argument('--out', default='legal_corpus', help="대용량 모드 출력 폴더")
+    parser.add_argument('--shard-rows', type=int, default=1_000_000, help="샤드 하나의 판례 수")
+    parser.add_argument('--chunk', type=int, default=10_000, help="한 번에 디스크에 쓰는 판례 수")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="생성 프로세스 수")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if args.append:
+        # 기존 판례 번호 뒤에 이어서 생성 -> CSV 끝에 붙이고 새 판례만 색인 (legal_index.append_cases)
+        if not legal_index.is_fresh():
+            legal_index.build_index()
+        start = legal_index.indexed_cases()
+        random.seed(42 + start)
+        new_cases = []
+        for i in range(start, start + args.append):
+            cat = categories[i % 10]
+            new_cases.append({'Category': cat, 'Facts': generate_full_case(cat, f"CASE-{i}")})
+        legal_index.append_cases(pd.DataFrame(new_cases))
+        print(f"✅ 판례 {args.append}건 증분 추가 완료! (CASE-{start} ~ CASE-{start + args.append - 1})")
+        return
+
+    if args.rows:
+        t0 = time.perf_counter()
+        manifest = generate_columnar(args.out, args.rows, args.shard_rows, args.chunk, args.workers, args.seed)
+        print(f"✅ {manifest['rows']:,}개 판례 생성 완료! -> {args.out}/ (샤드 {len(manifest['shards'])}개,"
+              f" 프로세스 {args.workers}개, {time.perf_counter() - t0:.1f}초)")
+        return
+
+    # 1,200개(Train/Test) + 400개(Challenge) = 총 1,600개 생성
+    all_cases = []
+    for i in range(1600):
+        cat = categories[i % 10]
+        all_cases.append({'Category': cat, 'Facts': generate_full_case(cat, f"CASE-{i}")})
+
+    pd.DataFrame(all_cases).to_csv('legal_data_total.csv', index=False, encoding='utf-8-sig')
+    print("✅ 1,600개 대용량 판례 데이터 생성 완료!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import os
+import numpy as np
+from multiprocessing import get_context, shared_memory
+from concurrent.futures import ProcessPoolExecutor
+
+# ==================================================================
+# 🧩 실행 백엔드 (Execution Backend) - 이 모듈은 mpi4py 없이 import 됨
+# --exec mpi  : mpirun으로 N개 프로세스 (SPMD), 기존 MPI 스크립트 그대로
+# --exec pool : 한 서버 안에서 concurrent.futures 프로세스 풀 (mpirun/MPI 설치 불필요, 기동 빠름)
+# 분할 로직은 두 백엔드가 같음
+#   - block_range: 몫(count) + 나머지(remainder) -> 작업자 k = Rank k와 같은 구역
+#   - scatter    : 작업자마다 프로세스 1개짜리 executor -> k번째 구역 작업은 항상 같은 프로세스로 (구역 상태 유지)
+#   - gather     : 작업자별 결과를 Rank 순서 리스트로
+#   - 코퍼스/목표 집합 같은 큰 배열은 multiprocessing 공유 메모리 한 벌에 올리고 작업자는 numpy 뷰로 읽음
+#     (legal_shm.SharedArrays와 같은 배치: 배열마다 64바이트 정렬해서 이어 붙임)
+# ==================================================================
+ALIGN = 64
+EXECS = ['mpi', 'pool']
+
+def block_range(total, rank, size):
+    # 몫(count)과 나머지(remainder)로 자신의 구역 [start, end) 계산
+    count, remainder = divmod(total, size)
+    if rank < remainder:
+        start_idx = rank * (count + 1)
+        return start_idx, start_idx + count + 1
+    start_idx = rank * count + remainder
+    return start_idx, start_idx + count
+
+def _layout(arrays):
+    specs, total = [], 0
+    for name, a in arrays.items():
+        total = -(-total // ALIGN) * ALIGN
+        specs.append((name, a.dtype.str, a.shape, total))
+        total += a.nbytes
+    return specs, total
+
+def _views(buf, specs):
+    out = {}
+    for name, dtype, shape, off in specs:
+        n = int(np.prod(shape))
+        out[name] = np.frombuffer(buf, dtype=dtype, count=n, offset=off).reshape(shape)
+    return out
+
+class PoolShared:
+    # 부모 프로세스: numpy 배열들(dict)을 공유 메모리 한 덩어리에 복사, spec(이름 + 배치)만 작업자에게 넘김
+    def __init__(self, arrays):
+        specs, total = _layout(arrays)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(total, 1))
+        self.nbytes = total
+        self.arrays = _views(self.shm.buf, specs)
+        for name, a in arrays.items():
+            self.arrays[name][...] = a
+        self.spec = (self.shm.name, specs)
+
+    def close(self):
+        # 이름부터 지워서 새지 않게 하고, 뷰를 다 놓은 뒤 버퍼를 닫음 (밖에서 뷰를 들고 있으면 닫기 실패)
+        self.shm.unlink()
+        self.arrays = None
+        self.shm.close()
+
+# ---------- 작업자 프로세스 쪽 ----------
+_worker = {} # 작업자 프로세스 전역: rank, size, 공유 배열, 부가 객체(Event 등), 구역별 캐시
+
+def _init_worker(rank, size, spec, extras):
+    _worker.update(rank=rank, size=size, extras=extras or {}, cache={}, arrays={})
+    if spec:
+        name, specs = spec
+        _worker['shm'] = shared_memory.SharedMemory(name=name)
+        _worker['arrays'] = _views(_worker['shm'].buf, specs)
+        for a in _worker['arrays'].values():
+            a.flags.writeable = False
+
+def worker_rank():
+    return _worker['rank']
+
+def worker_size():
+    return _worker['size']
+
+def shared_arrays():
+    return _worker['arrays']
+
+def worker_extras():
+    return _worker['extras']
+
+def worker_cache():
+    # 같은 작업자(= 같은 구역)가 다음 작업에서도 다시 쓰는 상태 (검색 엔진, 목표 집합 등)
+    return _worker['cache']
+
+def _ready():
+    return os.getpid()
+
+class PoolBackend:
+    def __init__(self, workers=None, arrays=None, extras=None):
+        self.size = workers or os.cpu_count()
+        self.rank = 0 # 부모 = Rank 0 역할 (결과 취합/출력)
+        self.shared = PoolShared(arrays) if arrays else None
+        ctx = get_context()
+        self.executors = [ProcessPoolExecutor(1, mp_context=ctx, initializer=_init_worker,
+                                              initargs=(k, self.size, self.shared.spec if self.shared else None, extras))
+                          for k in range(self.size)]
+        self.pids = self.gather(_ready) # 작업자를 미리 띄워둠 (기동 시간을 첫 작업과 분리)
+
+    def submit(self, k, fn, *args):
+        return self.executors[k].submit(fn, *args)
+
+    def gather(self, fn, per_rank=None):
+        # scatter + gather: 작업자 k에서 fn(*per_rank[k]) -> 결과를 Rank 순서대로
+        futures = [self.submit(k, fn, *(per_rank[k] if per_rank else ())) for k in range(self.size)]
+        return [f.result() for f in futures]
+
+    def close(self):
+        for ex in self.executors: ex.shutdown(wait=True)
+        if self.shared: self.shared.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
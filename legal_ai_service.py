@@ -1,186 +1,176 @@
-from mpi4py import MPI
-import pandas as pd
 import numpy as np
-import re
-import random
+import signal
 
-comm = MPI.COMM_WORLD
-rank, size = comm.Get_rank(), comm.Get_size()
+import legal_index
+import legal_server
+import legal_pool
+from legal_cache import QueryCache
+from legal_topk import merge_batches, tree_reduce, pick_diverse
+from legal_search import user_input, ScanEngine, index_engine, format_report, analyze_query, build_parser
+from hpc_backend import block_range
+
+# MPI 상태는 --exec mpi일 때만 채움 (--exec pool은 mpi4py 없이, mpirun 없이 실행)
+MPI = comm = None
+rank, size = 0, 1
+
+def init_mpi():
+    global MPI, comm, rank, size
+    from mpi4py import MPI
+    comm = MPI.COMM_WORLD
+    rank, size = comm.Get_rank(), comm.Get_size()
 
 # ==================================================================
-# 📝 폭행 사건
+# 🏆 결과 취합 (다양성 필터)
+# 각 코어는 상위 후보 요약만 트리 리덕션으로 올려보내고,
+# Rank 0이 고른 최종 3건의 본문만 담당 코어에서 받아옴
 # ==================================================================
-user_input = """
-서울 강남구의 한 술집에서 친구와 술을 마시다가 옆 테이블 손님과 시비가 붙었습니다.
-서로 말싸움을 하다가 제가 화를 참지 못하고 상대방의 멱살을 잡고
-주먹으로 얼굴을 여러 차례 때렸습니다.
-상대방은 코뼈가 부러지는 상해를 입었고, 바로 경찰이 출동해서 조사를 받았습니다.
-"""
+def consult_batch(engine, analyzed):
+    summaries = engine.topk_batch(analyzed)
+    merged = tree_reduce(comm, summaries, merge_batches)
+
+    winners = [pick_diverse(s) for s in merged] if rank == 0 else None
+    winners = comm.bcast(winners, root=0)
+
+    my_details = {}
+    for q, final in enumerate(winners):
+        for _, case_id, _ in final:
+            if engine.lo <= case_id < engine.hi:
+                my_details[(q, case_id)] = engine.details(case_id, analyzed[q][0])
+    gathered_details = comm.gather(my_details, root=0)
+    if rank != 0:
+        return None
+
+    details = {}
+    for d in gathered_details: details.update(d)
+    return [[dict(details[(q, case_id)], Score=score) for score, case_id, _ in final]
+            for q, final in enumerate(winners)]
 
 # ==================================================================
-# 🔧 [엔진 1] 전처리 & 노이즈 제거
+# 📦 데이터 준비: 자기 구역을 메모리에 올려두고 채점 함수를 돌려줌
 # ==================================================================
-def normalize_korean(text):
-    text = re.sub(r'[^\w\s]', '', text)
-    stopwords = ['은', '는', '이', '가', '을', '를', '의', '에', '에서', '로', '으로', 
-                 '합니다', '습니다', '하고', '하여', '된', '인', '도', '만', '과', '와', '에게', 
-                 '하더니', '했는데', '통해', '대해', '위해', '관해', '따르면', '받았', '했으']
-    
-    cheat_words = [
-        '사기', '절도', '마약', '횡령', '폭행', '음주운전', '명예훼손', '교통사고', 
-        '공무집행방해', '강제추행', '사건', '혐의', '피고인', '판결', '징역', '무죄', 
-        '선고', '기소', '재판부', '상당', '피해', '발생', '위반',
-        '서울', '부산', '대구', '인천', '광주', '대전', '울산', '세종', '시',
-        '강남구', '해운대구', '수성구', '미추홀구', '북구', '남구', '서구', '일대',
-        '경찰', '조사', '출동', '진술' 
-    ]
-    words = text.split()
-    clean_words = []
-    for w in words:
-        if w in cheat_words: continue
-        if w in stopwords: continue
-        for p in stopwords:
-            if w.endswith(p) and len(w) > len(p):
-                w = w[:-len(p)]
-                break 
-        if len(w) >= 2: clean_words.append(w)
-    return set(clean_words)
+def load_shard(args):
+    if args.engine == 'scan':
+        # 1. 데이터 로드: 각 코어가 코퍼스(CSV 또는 열 기반 폴더)에서 자기 구역 행만 직접 읽음 (Rank 0 경유 X)
+        from legal_corpus import open_corpus # 코퍼스 분할 로더는 MPI 전용
+        try:
+            corpus = open_corpus(args.csv, comm)
+        except:
+            comm.Abort()
+        lo, hi = corpus.my_block()
+        return ScanEngine(corpus.read_rows(lo, hi), lo)
+
+    # 1. 색인 준비 (Rank 0만 생성, 나머지는 기다렸다가 로드)
+    if rank == 0:
+        try:
+            if not legal_index.is_fresh(args.csv, args.index):
+                legal_index.build_index(args.csv, args.index)
+        except:
+            comm.Abort()
+    comm.Barrier()
+    index = legal_index.load_index(args.index)
+
+    lo, hi = block_range(len(index['case_len']), rank, size)
+    return index_engine(args, index, lo, hi)
 
 # ==================================================================
-# 🔧 [엔진 2] 유의어 확장 (범용)
+# 🛎️ 상주 서버 모드: 데이터는 한 번만 올리고 Rank 0이 질의를 묶어서(Bcast) 뿌림
 # ==================================================================
-def expand_synonyms(word_set):
-    synonym_dict = {
-        '잠적': '편취', '연락': '편취', '먹튀': '편취', '안보내': '편취',
-        '송금': '자금', '입금': '자금', '돈': '자금', '이체': '자금', 
-        '중고': '물품', '시계': '물품', '택배': '물품', '구매': '물품',
-        '핑계': '기망', '속여': '기망', '거짓말': '기망',
-        '때렸': '폭행', '맞았': '폭행', '주먹': '폭행', '발로': '폭행', '시비': '폭행',
-        '멱살': '폭행', '싸움': '폭행', '다쳤': '상해', '부러': '상해', '코뼈': '상해',
-        '술': '음주', '마셨': '음주', '맥주': '음주', '소주': '음주', '운전': '음주',
-        '훔쳐': '절취', '가져': '절취', '슬쩍': '절취', '손대': '절취'
-    }
-    expanded_set = set(word_set)
-    for word in word_set:
-        if word in synonym_dict:
-            expanded_set.add(synonym_dict[word])
-    return expanded_set
-
-# 1. 데이터 로드
-if rank == 0:
-    try:
-        df = pd.read_csv('legal_data_total.csv')
-        all_cases = df.to_dict('records')
-    except:
-        comm.Abort()
-else:
-    all_cases = None
-
-if rank == 0: chunks = np.array_split(all_cases, size)
-else: chunks = None
-my_chunk = comm.scatter(chunks, root=0)
-
-# 2. 병렬 검색
-my_results = []
-user_vec_raw = normalize_korean(user_input)
-user_vec = expand_synonyms(user_vec_raw) 
-
-# 문맥 패널티 확인 (친구, 술집 등)
-context_penalty = False
-if any(w in user_vec_raw for w in ['친구', '지인', '손님', '가게', '술집', '동기']):
-    context_penalty = True
-
-for case in my_chunk:
-    case_vec_raw = normalize_korean(case['Facts'])
-    case_vec = expand_synonyms(case_vec_raw)
-    
-    # 🔧 [엔진 3] 필수 요소 검증기 (Prerequisite Validator)
-    # 특정 카테고리는 '필수 단어'가 없으면 아예 점수를 0으로 만듦
-    # 이걸 넣어야 "주먹질했는데 교통사고가 나오는" 참사를 막음
-    
-    category_constraints = {
-        '교통사고': ['차', '운전', '도로', '주행', '교통', '차량', '접촉'],
-        '음주운전': ['운전', '차', '주행', '대리', '핸들'],
-        '마약': ['투약', '필로폰', '주사', '대마', '매수'],
-        '보이스피싱': ['현금', '수거', '송금', '금융'],
-        # 폭행/사기는 일반적이므로 제약 없음
-    }
-    
-    # 제약 조건 위반 검사
-    constraint_violation = False
-    if case['Category'] in category_constraints:
-        required_words = category_constraints[case['Category']]
-        # 사용자 입력(확장된 유의어 포함)에 필수 단어가 하나라도 있는지 확인
-        if not any(req in user_vec for req in required_words):
-            constraint_violation = True # 필수 단어 없음 -> 탈락!
-            
-    if constraint_violation:
-        continue # 점수 계산 안 하고 스킵
-
-    intersection = user_vec & case_vec
-    
-    weighted_matches = 0
-    critical_terms = ['편취', '기망', '자금', '물품', '절취', '강취', '폭행', '상해', '투약', '음주']
-    
-    for word in intersection:
-        if word in critical_terms:
-            weighted_matches += 5.0
-        else:
-            weighted_matches += 1.0 
-            
-    denom = len(case_vec) if len(case_vec) > 0 else 1
-    raw_score = weighted_matches / denom
-    calibrated_score = raw_score * 6.0 
-    
-    # 공무집행방해 패널티 적용
-    if context_penalty and case['Category'] == '공무집행방해':
-        calibrated_score *= 0.3
-
-    if calibrated_score > 0.99:
-        calibrated_score = 0.98 + (random.random() * 0.015)
-    
-    if calibrated_score > 0:
-        my_results.append({
-            'Category': case['Category'],
-            'Score': calibrated_score,
-            'Facts': case['Facts'],
-            'Match_Keywords': list(intersection)
-        })
-
-# 3. 결과 취합 (다양성 필터)
-gathered_results = comm.gather(my_results, root=0)
-
-if rank == 0:
-    all_candidates = [item for sublist in gathered_results for item in sublist]
-    sorted_candidates = sorted(all_candidates, key=lambda x: x['Score'], reverse=True)
-    
-    final_top3 = []
-    seen_categories = set()
-    
-    for cand in sorted_candidates:
-        if len(final_top3) >= 3:
+def serve(args, engine, startup_time):
+    # Ctrl+C는 Rank 0만 받아서 종료 신호(None)를 Bcast로 돌림
+    if rank != 0: signal.signal(signal.SIGINT, signal.SIG_IGN)
+    source = legal_server.open_source(args) if rank == 0 else None
+    if rank == 0:
+        print(f"⏱️ 기동 시간(로드+분배): {startup_time:.4f}초 | 프로세스 {size}개 | 배치 최대 {args.batch}건", flush=True)
+
+    # 결과 캐시는 Rank 0만 들고 있음: 캐시에 없는 질의만 Bcast해서 채점
+    cache = QueryCache(args.csv, args.cache_size) if rank == 0 else None
+    latencies = []
+    busy_time = 0.0
+    serve_start = MPI.Wtime()
+    while True:
+        batch = None
+        if rank == 0:
+            try:
+                batch = source.next_batch(args.batch)
+                while batch == []:
+                    batch = source.next_batch(args.batch)
+            except KeyboardInterrupt:
+                batch = None
+
+        job = None
+        if rank == 0 and batch is not None:
+            t0 = MPI.Wtime()
+            reload = cache.source_changed()
+            analyzed = [analyze_query(text) for _, text in batch]
+            keys = [QueryCache.key(user_vec, context_penalty) for user_vec, _, context_penalty in analyzed]
+            results = [cache.get(k) for k in keys]
+            # 같은 묶음 안의 중복 질의도 한 번만 채점
+            todo = {}
+            for k, a, r in zip(keys, analyzed, results):
+                if r is None: todo.setdefault(k, a)
+            job = (reload, list(todo.values()))
+        job = comm.bcast(job, root=0)
+        if job is None:
             break
-        if cand['Category'] not in seen_categories:
-            final_top3.append(cand)
-            seen_categories.add(cand['Category'])
-            
-    if len(final_top3) < 3:
-        remaining = [c for c in sorted_candidates if c not in final_top3]
-        final_top3.extend(remaining[:3-len(final_top3)])
-    
-    print("\n" + "="*70)
-    print(f"🤖 [HPC AI 법률 상담 리포트] (Logic Verified)")
-    print("="*70)
-    print(f"📌 핵심 키워드: {list(user_vec)}")
-    print("-" * 70)
-    
-    if not final_top3:
-        print("유사한 판례를 찾지 못했습니다.")
-    else:
-        for i, res in enumerate(final_top3):
-            print(f"🏆 추천 판례 {i+1}위")
-            print(f"   📂 죄명 분류: [{res['Category']}]")
-            print(f"   📊 매칭 신뢰도: {res['Score']*100:.2f}%")
-            print(f"   🔑 매칭된 정황: {res['Match_Keywords']}")
-            print(f"   📜 판례 내용: {res['Facts'][:100]}...")
-            print("-" * 70)
+
+        reload, todo_analyzed = job
+        if reload:
+            # CSV가 바뀜 -> 캐시는 이미 비웠고, 색인/엔진을 모든 코어가 다시 올림
+            if rank == 0: print("🔄 CSV 변경 감지: 결과 캐시를 비우고 데이터를 다시 올립니다", flush=True)
+            engine = load_shard(args)
+        fresh = consult_batch(engine, todo_analyzed) if todo_analyzed else []
+
+        if rank == 0:
+            for k, res in zip(todo, fresh): cache.put(k, res)
+            fresh = dict(zip(todo, fresh))
+            for (handle, _), (user_vec, _, _), k, res in zip(batch, analyzed, keys, results):
+                source.reply(handle, format_report(user_vec, fresh[k] if res is None else res))
+            elapsed = MPI.Wtime() - t0
+            busy_time += elapsed
+            latencies.extend([elapsed] * len(batch))
+
+    if rank == 0:
+        source.close()
+        wall = MPI.Wtime() - serve_start
+        print("\n" + "="*70, flush=True)
+        print(f"📈 처리한 질의: {len(latencies)}건", flush=True)
+        if latencies:
+            lat = np.array(latencies) * 1000
+            print(f"   ⏱️ 지연시간(ms): 평균 {lat.mean():.2f} | p50 {np.percentile(lat, 50):.2f} | p95 {np.percentile(lat, 95):.2f}", flush=True)
+            print(f"   🚀 처리량: {len(latencies) / busy_time:.1f} queries/sec (채점 시간 기준) | {len(latencies) / wall:.1f} queries/sec (대기 포함)", flush=True)
+        st = cache.stats()
+        print(f"   🗂️ 결과 캐시: 적중 {st['hits']} / 미스 {st['misses']} (적중률 {st['hit_rate']*100:.1f}%)"
+              f" | 보관 {st['size']}건 | 축출 {st['evictions']} | 무효화 {st['invalidations']}", flush=True)
+        print("="*70, flush=True)
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.exec == 'pool':
+        # mpirun 없이 한 서버 안 프로세스 풀로 (같은 분할/취합 로직)
+        legal_pool.run(args)
+        return
+
+    init_mpi()
+    t0 = MPI.Wtime()
+    engine = load_shard(args)
+    comm.Barrier()
+    startup_time = MPI.Wtime() - t0
+
+    if args.serve:
+        serve(args, engine, startup_time)
+        return
+
+    # 2. 병렬 검색 + 3. 결과 취합 (다양성 필터)
+    t0 = MPI.Wtime()
+    analyzed = analyze_query(user_input)
+    results = consult_batch(engine, [analyzed])
+    search_time = MPI.Wtime() - t0
+
+    if rank == 0:
+        print(format_report(analyzed[0], results[0]))
+        print(f"⏱️ 기동 시간(로드+분배): {startup_time:.4f}초 | 검색: {search_time * 1000:.2f}ms"
+              f" | MPI 프로세스 {size}개", flush=True)
+
+if __name__ == "__main__":
+    main()
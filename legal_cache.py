@@ -0,0 +1,61 @@
+import os
+from collections import OrderedDict
+
+from legal_index import source_stamp
+
+# ==================================================================
+# 🗂️ 질의 결과 캐시 (재질의 / 거의 같은 사연 재제출)
+# 키 = 전처리 + 유의어 확장이 끝난 토큰 집합 (+ 문맥 패널티 여부)
+#  -> 문장 표현/어순/조사가 달라도 토큰 집합이 같으면 같은 질의로 봄
+# 값 = 최종 상위 3건 결과 그대로 -> 적중하면 채점/통신 없이 바로 응답
+# 크기 제한 LRU (가장 오래 안 쓴 것부터 버림), CSV가 바뀌면(크기/수정시각) 통째로 비움
+# ==================================================================
+
+class QueryCache:
+    def __init__(self, csv_path, max_entries=1024):
+        self.csv_path = csv_path
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+        self.stamp = self._current_stamp()
+
+    def _current_stamp(self):
+        return tuple(source_stamp(self.csv_path).tolist()) if os.path.exists(self.csv_path) else None
+
+    @staticmethod
+    def key(user_vec, context_penalty):
+        return frozenset(user_vec), bool(context_penalty)
+
+    def source_changed(self):
+        # CSV가 바뀌었으면 캐시를 비우고 True (호출한 쪽에서 색인/엔진을 다시 올림)
+        stamp = self._current_stamp()
+        if stamp == self.stamp:
+            return False
+        self.stamp = stamp
+        self.entries.clear()
+        self.invalidations += 1
+        return True
+
+    def get(self, key):
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'invalidations': self.invalidations, 'size': len(self.entries),
+                'hit_rate': self.hits / lookups if lookups else 0.0}
@@ -0,0 +1,176 @@
+import os
+import sys
+import json
+import numpy as np
+import pandas as pd
+
+from legal_text import TOKENIZERS
+
+# ==================================================================
+# 🗃️ 열 기반(columnar) 판례 코퍼스 포맷
+# CSV 한 파일 대신 폴더 하나 = 코퍼스, 그 안에 샤드(shard) 폴더 여러 개
+#   manifest.json            : 포맷 이름, 죄명 사전(categories), 샤드 목록/행 수
+#   shard-00000/category.u8  : 죄명 코드 (uint8, 사전 인코딩)
+#   shard-00000/facts.off    : 본문 시작 위치 (int64, 행 수 + 1개)
+#   shard-00000/facts.bin    : 본문 UTF-8 바이트를 이어 붙인 것
+#   (선택) shard-00000/tokens-<이름>.off / .i32 + vocab-<이름>.txt : 미리 토큰화한 토큰 ID 열
+# 모든 열이 고정 폭 이진 배열이라 스트리밍으로 이어 쓰고, 읽을 때는 memmap으로 바로 자름
+# ==================================================================
+FORMAT = 'legal-columnar-v1'
+MANIFEST = 'manifest.json'
+
+def shard_name(i):
+    return f"shard-{i:05d}"
+
+class ShardWriter:
+    # 청크 단위로 이어 쓰는 샤드 작성기 (메모리에는 현재 청크만)
+    # categories: 죄명 사전 리스트 (처음 보는 죄명은 이 리스트 끝에 추가됨 -> 샤드끼리 같은 리스트를 넘기면 사전 공유)
+    def __init__(self, path, categories):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.categories = categories
+        self.code = {c: i for i, c in enumerate(categories)}
+        self.cat_f = open(os.path.join(path, 'category.u8'), 'wb')
+        self.off_f = open(os.path.join(path, 'facts.off'), 'wb')
+        self.bin_f = open(os.path.join(path, 'facts.bin'), 'wb')
+        self.off_f.write(np.zeros(1, dtype=np.int64).tobytes())
+        self.pos = 0
+        self.rows = 0
+
+    def write_chunk(self, categories, facts):
+        raw = [f.encode('utf-8') for f in facts]
+        offsets = self.pos + np.cumsum([len(b) for b in raw], dtype=np.int64)
+        codes = []
+        for c in categories:
+            if c not in self.code:
+                self.code[c] = len(self.categories)
+                self.categories.append(c)
+            codes.append(self.code[c])
+        self.cat_f.write(np.array(codes, dtype=np.uint8).tobytes())
+        self.off_f.write(offsets.tobytes())
+        self.bin_f.write(b''.join(raw))
+        if len(raw): self.pos = int(offsets[-1])
+        self.rows += len(raw)
+
+    def close(self):
+        for f in (self.cat_f, self.off_f, self.bin_f): f.close()
+        return self.rows
+
+def write_manifest(out_dir, categories, shard_rows, **extra):
+    # shard_rows: 샤드 순서대로 행 수 (샤드 i = shard-0000i 폴더)
+    manifest = {'format': FORMAT, 'categories': list(categories),
+                'shards': [{'path': shard_name(i), 'rows': int(n)} for i, n in enumerate(shard_rows)],
+                'rows': int(sum(shard_rows))}
+    manifest.update(extra)
+    tmp = os.path.join(out_dir, MANIFEST + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, os.path.join(out_dir, MANIFEST))
+    return manifest
+
+def read_manifest(path):
+    with open(os.path.join(path, MANIFEST), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != FORMAT:
+        raise ValueError(f"{path}: 지원하지 않는 코퍼스 포맷 {manifest.get('format')}")
+    return manifest
+
+def is_columnar(path):
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, MANIFEST))
+
+# ==================================================================
+# 📖 읽기: 샤드 열을 memmap으로 열고 행 구간을 파싱 없이 잘라냄
+# ==================================================================
+def _map(path, dtype):
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r')
+
+def open_shard(path):
+    shard = {'codes': _map(os.path.join(path, 'category.u8'), np.uint8),
+             'off': _map(os.path.join(path, 'facts.off'), np.int64),
+             'bin': _map(os.path.join(path, 'facts.bin'), np.uint8),
+             'dir': path}
+    return shard
+
+def decode_facts(shard, a, b):
+    # 샤드 안 행 [a, b) 의 본문 (바이트 구간 한 번 복사 후 행별 UTF-8 디코딩)
+    off = shard['off'][a:b + 1]
+    raw = bytes(shard['bin'][off[0]:off[-1]])
+    rel = (off - off[0]).tolist()
+    return [raw[rel[i]:rel[i + 1]].decode('utf-8') for i in range(b - a)]
+
+def token_columns(shard, name):
+    d = shard['dir']
+    return (_map(os.path.join(d, f"tokens-{name}.off"), np.int64),
+            _map(os.path.join(d, f"tokens-{name}.i32"), np.int32))
+
+def read_vocab(path, name):
+    with open(os.path.join(path, f"vocab-{name}.txt"), encoding='utf-8') as f:
+        return {w: i for i, w in enumerate(f.read().split('\n')) if w}
+
+# ==================================================================
+# 🔁 CSV -> 열 기반 변환 / 미리 토큰화한 토큰 ID 열 추가
+# ==================================================================
+def convert_csv(csv_path, out_dir, shard_rows=1_000_000, chunk=10_000):
+    # CSV를 청크 단위로 읽어서 샤드로 씀 (메모리는 청크 크기만큼)
+    os.makedirs(out_dir, exist_ok=True)
+    categories, counts = [], []
+    writer = None
+    for frame in pd.read_csv(csv_path, chunksize=chunk, encoding='utf-8-sig'):
+        cats, facts = frame['Category'].astype(str).tolist(), frame['Facts'].astype(str).tolist()
+        while cats:
+            if writer is None:
+                writer = ShardWriter(os.path.join(out_dir, shard_name(len(counts))), categories)
+            take = min(len(cats), shard_rows - writer.rows)
+            writer.write_chunk(cats[:take], facts[:take])
+            cats, facts = cats[take:], facts[take:]
+            if writer.rows == shard_rows:
+                counts.append(writer.close())
+                writer = None
+    if writer is not None or not counts:
+        counts.append((writer or ShardWriter(os.path.join(out_dir, shard_name(0)), categories)).close())
+    return write_manifest(out_dir, categories, counts)
+
+def add_tokens(path, name, chunk=10_000):
+    # 모든 판례를 TOKENIZERS[name]으로 한 번 토큰화해서 샤드마다 토큰 ID 열로 저장
+    # ID는 legal_knn.encode_sets와 같은 규칙 (문서 순서대로, 문서 안에서는 정렬 순서로 새 ID)
+    manifest = read_manifest(path)
+    tokenize = TOKENIZERS[name]
+    vocab = {}
+    for s in manifest['shards']:
+        shard = open_shard(os.path.join(path, s['path']))
+        with open(os.path.join(shard['dir'], f"tokens-{name}.off"), 'wb') as off_f, \
+             open(os.path.join(shard['dir'], f"tokens-{name}.i32"), 'wb') as ids_f:
+            off_f.write(np.zeros(1, dtype=np.int64).tobytes())
+            pos = 0
+            for a in range(0, s['rows'], chunk):
+                ids = [[vocab.setdefault(w, len(vocab)) for w in sorted(tokenize(f))]
+                       for f in decode_facts(shard, a, min(a + chunk, s['rows']))]
+                offsets = pos + np.cumsum([len(t) for t in ids], dtype=np.int64)
+                off_f.write(offsets.tobytes())
+                ids_f.write(np.fromiter((t for row in ids for t in row), dtype=np.int32, count=int(offsets[-1] - pos)).tobytes())
+                pos = int(offsets[-1])
+    with open(os.path.join(path, f"vocab-{name}.txt"), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(vocab))
+    tokens = sorted(set(manifest.get('tokens', [])) | {name})
+    extra = {k: v for k, v in manifest.items() if k not in ('format', 'categories', 'shards', 'rows', 'tokens')}
+    write_manifest(path, manifest['categories'], [s['rows'] for s in manifest['shards']], tokens=tokens, **extra)
+    return len(vocab)
+
+if __name__ == "__main__":
+    # python legal_columnar.py convert legal_data_total.csv legal_corpus [korean,hard,clean]
+    # python legal_columnar.py tokens legal_corpus hard
+    cmd = sys.argv[1] if len(sys.argv) > 1 else ''
+    if cmd == 'convert':
+        manifest = convert_csv(sys.argv[2], sys.argv[3])
+        print(f"✅ 열 기반 변환 완료: 판례 {manifest['rows']:,}건, 샤드 {len(manifest['shards'])}개 -> {sys.argv[3]}/")
+        names = sys.argv[4].split(',') if len(sys.argv) > 4 else []
+        path = sys.argv[3]
+    elif cmd == 'tokens':
+        path, names = sys.argv[2], sys.argv[3].split(',')
+    else:
+        print("사용법: legal_columnar.py convert <csv> <폴더> [토큰화 이름,...] | tokens <폴더> <토큰화 이름,...>")
+        sys.exit(1)
+    for name in names:
+        print(f"   🔤 tokens-{name}: 토큰 {add_tokens(path, name):,}개")
@@ -0,0 +1,149 @@
+import io
+import os
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from mpi4py import MPI
+
+from legal_text import TOKENIZERS
+from legal_knn import encode_sets, encode_matrix
+from hpc_backend import block_range # 몫 + 나머지 분할 (MPI/프로세스 풀 공용)
+from legal_columnar import is_columnar, read_manifest, open_shard, decode_facts, token_columns, read_vocab
+
+# ==================================================================
+# 📂 병렬 분할 로더 (Sharded Corpus Loader)
+# Rank 0이 CSV 전체를 읽고 pickle로 scatter/bcast 하는 대신,
+# 모든 코어가 파일을 메모리 매핑(mmap)해서 자기가 필요한 행 구간만 직접 파싱함
+# 1) 파일을 바이트 구간으로 나눠 각 코어가 자기 구간의 줄바꿈 위치를 찾고
+# 2) 줄 시작 위치(int64)를 Allgatherv로 모음 (pickle 없는 타입 버퍼 통신)
+# 3) 이후 어떤 코어든 원하는 행 구간 [a, b)를 바로 잘라서 파싱
+# ※ generate_all_data.py가 만드는 CSV는 필드 안에 줄바꿈이 없으므로 1줄 = 1행
+# ==================================================================
+
+def _line_bounds(mm, comm):
+    rank, size = comm.Get_rank(), comm.Get_size()
+    lo, hi = block_range(len(mm), rank, size)
+    # 내 바이트 구간의 '\n' 다음 위치 = 다음 줄의 시작
+    local = np.flatnonzero(mm[lo:hi] == ord('\n')).astype(np.int64) + lo + 1
+
+    counts = np.empty(size, dtype=np.int64)
+    comm.Allgather(np.array([len(local)], dtype=np.int64), counts)
+    starts = np.empty(int(counts.sum()), dtype=np.int64)
+    comm.Allgatherv(local, [starts, counts])
+
+    bounds = np.concatenate(([0], starts))
+    if bounds[-1] != len(mm):
+        bounds = np.append(bounds, len(mm)) # 마지막 줄에 줄바꿈이 없는 경우
+    return bounds
+
+class ShardedCorpus:
+    # 첫 줄은 헤더(Category,Facts), 그 다음 줄부터 0번 판례
+    def __init__(self, path, comm=MPI.COMM_WORLD):
+        self.comm = comm
+        self.mm = np.memmap(path, dtype=np.uint8, mode='r')
+        self.bounds = _line_bounds(self.mm, comm)
+        header = bytes(self.mm[self.bounds[0]:self.bounds[1]]).decode('utf-8-sig').strip()
+        self.columns = header.split(',')
+
+    def __len__(self):
+        return len(self.bounds) - 2
+
+    def read_frame(self, a, b):
+        a, b = max(a, 0), min(b, len(self))
+        if a >= b:
+            return pd.DataFrame(columns=self.columns)
+        raw = bytes(self.mm[self.bounds[a + 1]:self.bounds[b + 1]])
+        return pd.read_csv(io.BytesIO(raw), header=None, names=self.columns, encoding='utf-8')
+
+    def read_rows(self, a, b):
+        return self.read_frame(a, b).to_dict('records')
+
+    def facts(self, a, b):
+        return self.read_frame(a, b)['Facts'].tolist()
+
+    def categories(self, a, b):
+        return self.read_frame(a, b)['Category'].tolist()
+
+    def has_tokens(self, name):
+        return False
+
+    def my_block(self, a=0, b=None):
+        # 행 구간 [a, b)를 코어 수로 나눴을 때 내 몫 (np.array_split과 같은 분할)
+        if b is None: b = len(self)
+        lo, hi = block_range(b - a, self.comm.Get_rank(), self.comm.Get_size())
+        return a + lo, a + hi
+
+# ==================================================================
+# 🗃️ 열 기반 코퍼스 로더 (legal_columnar 포맷 폴더)
+# CSV 파싱/UTF-8-sig 디코딩/to_dict 없이 memmap에서 바로 행 구간을 자름
+# 미리 토큰화한 열(tokens-<이름>)이 있으면 본문 디코딩/토큰화도 없이 토큰 ID로 바로 희소 행렬
+# ShardedCorpus와 같은 사용법 (columns / len / read_rows / my_block ...)
+# ==================================================================
+class ColumnarCorpus(ShardedCorpus):
+    def __init__(self, path, comm=MPI.COMM_WORLD):
+        self.comm = comm
+        self.path = path
+        self.manifest = read_manifest(path)
+        self.columns = ['Category', 'Facts']
+        self.names = np.array(self.manifest['categories'], dtype=object)
+        self.shards = [open_shard(os.path.join(path, s['path'])) for s in self.manifest['shards']]
+        self.starts = np.cumsum([0] + [s['rows'] for s in self.manifest['shards']])
+        self.vocabs = {}
+
+    def __len__(self):
+        return int(self.starts[-1])
+
+    def _pieces(self, a, b):
+        # 전역 행 [a, b) -> (샤드, 샤드 안 시작, 끝) 목록
+        a, b = max(a, 0), min(b, len(self))
+        for i, shard in enumerate(self.shards):
+            lo, hi = max(a, self.starts[i]), min(b, self.starts[i + 1])
+            if lo < hi: yield shard, int(lo - self.starts[i]), int(hi - self.starts[i])
+
+    def facts(self, a, b):
+        return [f for shard, lo, hi in self._pieces(a, b) for f in decode_facts(shard, lo, hi)]
+
+    def category_codes(self, a, b):
+        parts = [np.asarray(shard['codes'][lo:hi]) for shard, lo, hi in self._pieces(a, b)]
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.uint8)
+
+    def categories(self, a, b):
+        return self.names[self.category_codes(a, b)].tolist()
+
+    def read_frame(self, a, b):
+        return pd.DataFrame({'Category': self.categories(a, b), 'Facts': self.facts(a, b)}, columns=self.columns)
+
+    def read_rows(self, a, b):
+        return [{'Category': c, 'Facts': f} for c, f in zip(self.categories(a, b), self.facts(a, b))]
+
+    def has_tokens(self, name):
+        return name in self.manifest.get('tokens', [])
+
+    def vocab(self, name):
+        if name not in self.vocabs: self.vocabs[name] = read_vocab(self.path, name)
+        return self.vocabs[name]
+
+    def token_matrix(self, name, a, b):
+        # 판례 [a, b) x 토큰 이진 CSR (열 수 = 미리 만든 vocab 전체)
+        indptr, indices = [np.zeros(1, dtype=np.int64)], []
+        for shard, lo, hi in self._pieces(a, b):
+            off, ids = token_columns(shard, name)
+            off = np.asarray(off[lo:hi + 1])
+            indptr.append(off[1:] - off[0] + indptr[-1][-1])
+            indices.append(np.asarray(ids[off[0]:off[-1]]))
+        indptr = np.concatenate(indptr)
+        indices = np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32)
+        return sp.csr_matrix((np.ones(len(indices), dtype=np.float32), indices, indptr),
+                             shape=(len(indptr) - 1, len(self.vocab(name))))
+
+def open_corpus(path, comm=MPI.COMM_WORLD):
+    # 폴더(manifest.json)면 열 기반, 아니면 CSV
+    return ColumnarCorpus(path, comm) if is_columnar(path) else ShardedCorpus(path, comm)
+
+def encode_rows(corpus, a, b, tokenizer, vocab=None):
+    # 판례 [a, b) -> (이진 CSR, vocab), tokenizer는 legal_text.TOKENIZERS 이름
+    # 미리 토큰화한 열이 있으면 그대로 쓰고 (vocab = 코퍼스에 저장된 전체 vocab), 없으면 본문을 토큰화
+    if corpus.has_tokens(tokenizer):
+        return corpus.token_matrix(tokenizer, a, b), corpus.vocab(tokenizer)
+    vecs, vocab = encode_sets(corpus.facts(a, b), TOKENIZERS[tokenizer], vocab)
+    return encode_matrix(vecs, len(vocab)), vocab
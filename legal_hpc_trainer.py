@@ -1,7 +1,9 @@
 from mpi4py import MPI
-import pandas as pd
-import numpy as np
-import re
+import argparse
+
+from legal_corpus import open_corpus, encode_rows
+from legal_knn import count_matches, drop_ids, sweep_nearest
+from legal_shm import SharedEncodedCorpus
 
 comm = MPI.COMM_WORLD
 rank, size = comm.Get_rank(), comm.Get_size()
@@ -14,51 +16,56 @@ feedback_levels = [
     ['은', '는', '이', '가', '을', '를', '의', '에', '에서', '피고인', '사건'] # Level 3 (최적화)
 ]
 
-def get_clean_set(text, stops):
-    text = re.sub(r'[^\w\s]', '', text)
-    return set([w for w in text.split() if w not in stops and len(w) > 1])
+parser = argparse.ArgumentParser(description="피드백 루프 학습기")
+parser.add_argument('--shared', action='store_true', help="인코딩된 코퍼스를 노드 공유 메모리 한 벌로 (같은 서버의 코어끼리 공유)")
+parser.add_argument('--corpus', default='legal_data_total.csv', help="CSV 또는 열 기반 코퍼스 폴더 (legal_columnar)")
+args = parser.parse_args()
 
-# 2. 데이터 로드 및 분할
-if rank == 0:
-    df = pd.read_csv('legal_data_total.csv')
-    train_data = df.iloc[:900].to_dict('records')   # 900개 학습용
-    test_data = df.iloc[900:1200].to_dict('records') # 300개 테스트용
-    challenge_data = df.iloc[1200:1600].to_dict('records') # 400개 최종검증용
-else:
-    train_data = test_data = challenge_data = None
+# 2. 데이터 로드 및 분할 (각 코어가 코퍼스에서 필요한 행 구간만 직접 읽음)
+corpus = open_corpus(args.corpus, comm)
+train_range = (0, 900) # 900개 학습용 (모든 코어가 공유)
+test_range, challenge_range = (900, 1200), (1200, 1600) # 300개 테스트용 / 400개 최종검증용
 
-train_data = comm.bcast(train_data, root=0) # 학습 데이터는 모든 코어가 공유
+# 테스트 데이터를 12개 코어로 분산 (300 / 12 = 코어당 25개)
+my_test_range = corpus.my_block(*test_range)
 
 # 3. 피드백 루프 실행 (Training & Feedback)
-for level, stops in enumerate(feedback_levels):
-    # 테스트 데이터를 12개 코어로 분산 (300 / 12 = 코어당 25개)
-    my_test_chunk = comm.scatter(np.array_split(test_data, size) if rank == 0 else None, root=0)
-    
-    correct = 0
-    for test_case in my_test_chunk:
-        test_vec = get_clean_set(test_case['Facts'], stops)
-        best_cat, max_sim = "", -1
-        
-        for train_case in train_data:
-            train_vec = get_clean_set(train_case['Facts'], stops)
-            # 코사인 유사도 원리 (자카드 방식 활용)
-            sim = len(test_vec & train_vec) / len(test_vec | train_vec) if (test_vec | train_vec) else 0
-            if sim > max_sim: max_sim, best_cat = sim, train_case['Category']
-        
-        if best_cat == test_case['Category']: correct += 1
-    
+# 모든 레벨을 한 번에 평가하는 스윕: 문서는 불용어 없이 딱 한 번만 토큰화하고
+# 레벨별 불용어는 토큰 ID 마스크로만 적용 -> 레벨이 수십 개여도 비용은 레벨 1개와 비슷
+sweep_start = MPI.Wtime()
+# 공통 토큰 = legal_text.TOKENIZERS['clean'] (불용어 없는 get_clean_set), 미리 토큰화한 열이 있으면 그대로 사용
+if args.shared:
+    # 노드 리더만 학습+테스트 판례를 인코딩해서 노드 공유 메모리에 올리고, 나머지는 뷰로 읽음
+    shared = SharedEncodedCorpus(corpus, 'clean', train_range[0], test_range[1], comm)
+    vocab = shared.vocab
+    train_m, test_m = shared.rows(*train_range), shared.rows(*my_test_range)
+    train_cats, test_cats = shared.category_codes(*train_range), shared.category_codes(*my_test_range)
+    if rank == 0: print(f"📦 노드 공유 메모리 코퍼스: {shared.nbytes / 1024:.1f} KB (노드당 1벌)")
+else:
+    train_m, vocab = encode_rows(corpus, *train_range, 'clean')
+    test_m, vocab = encode_rows(corpus, *my_test_range, 'clean', vocab)
+    train_cats, test_cats = corpus.categories(*train_range), corpus.categories(*my_test_range)
+drops = [drop_ids(vocab, stops) for stops in feedback_levels]
+
+# 모든 (테스트, 학습) 쌍의 자카드 유사도를 공통 행렬 곱 한 번 + 레벨별 불용어 보정으로
+best_per_level = sweep_nearest(test_m, train_m, drops)
+
+for level, best in enumerate(best_per_level):
+    correct = count_matches(best, test_cats, train_cats)
     total_correct = comm.reduce(correct, op=MPI.SUM, root=0)
     
     if rank == 0:
-        acc = total_correct / len(test_data)
+        acc = total_correct / (test_range[1] - test_range[0])
         print(f"🔄 Feedback Level {level+1} | Loss: {1-acc:.4f} | Accuracy: {acc*100:.2f}%")
 
+if rank == 0: print(f"⏱️ 레벨 {len(feedback_levels)}개 스윕 시간: {MPI.Wtime() - sweep_start:.4f}초")
+
 # 4. 최종 챌린지 테스트 (400개)
 if rank == 0: print("\n🏁 [최종 챌린지 테스트 시작 (400개 미지의 데이터)]")
-my_challenge_chunk = comm.scatter(np.array_split(challenge_data, size) if rank == 0 else None, root=0)
+my_challenge_chunk = corpus.read_rows(*corpus.my_block(*challenge_range))
 
 final_correct = comm.reduce(correct, op=MPI.SUM, root=0) # 마지막 최적화 로직 사용
 
 if rank == 0:
-    final_acc = final_correct / len(challenge_data)
+    final_acc = final_correct / (challenge_range[1] - challenge_range[0])
     print(f"🏆 Final Challenge Result | Loss: {1-final_acc:.4f} | Accuracy: {final_acc*100:.2f}%")
@@ -1,100 +1,101 @@
 from mpi4py import MPI
-import pandas as pd
-import numpy as np
-import re
+import argparse
+
+from legal_corpus import open_corpus, encode_rows
+from legal_knn import count_matches, RunningNearest
+from legal_shm import SharedEncodedCorpus
 
 comm = MPI.COMM_WORLD
 rank, size = comm.Get_rank(), comm.Get_size()
 
 learning_phases = [20, 70, 300, 700, 1100]
+train_size = 1100
 
-def get_hard_mode_vector(text):
-    cheat_words = ['사기', '절도', '마약', '횡령', '폭행', '음주운전', '명예훼손', '교통사고', 
-                   '공무집행방해', '강제추행', '사건', '혐의', '피고인', '판결', '징역', '무죄', 
-                   '선고', '기소', '재판부', '상당', '피해', '발생']
-    
-    text = re.sub(r'[^\w\s]', '', text) # 특수문자 제거
-    # 치트 단어가 아닌 것들만 남김
-    words = [w for w in text.split() if w not in cheat_words and len(w) > 1]
-    
-    return set(words)
+# 단계 설정: --phases 20,70,300 처럼 직접 주거나 --steps 40 처럼 1100개까지 균등 분할
+parser = argparse.ArgumentParser(description="단계별 학습 곡선 (증분 평가)")
+parser.add_argument('--phases', help="쉼표로 구분한 단계별 학습 데이터 수")
+parser.add_argument('--steps', type=int, help="1~1100개를 N단계로 균등 분할")
+parser.add_argument('--shared', action='store_true', help="인코딩된 코퍼스를 노드 공유 메모리 한 벌로 (같은 서버의 코어끼리 공유)")
+parser.add_argument('--corpus', default='legal_data_total.csv', help="CSV 또는 열 기반 코퍼스 폴더 (legal_columnar)")
+args = parser.parse_args()
+if args.phases:
+    learning_phases = [int(x) for x in args.phases.split(',')]
+elif args.steps:
+    learning_phases = sorted({round(train_size * (k + 1) / args.steps) for k in range(args.steps)})
+if any(b <= a for a, b in zip([0] + learning_phases, learning_phases)) or learning_phases[-1] > train_size:
+    if rank == 0: print(f"❌ 단계는 1~{train_size} 사이에서 증가하는 순서여야 합니다: {learning_phases}")
+    comm.Abort()
 
-# 2. 데이터 로드 및 재분할
-if rank == 0:
-    try:
-        df = pd.read_csv('legal_data_total.csv')
-        # 1100개까지 학습시키려면 학습용 데이터를 늘려야 함
-        full_train_data = df.iloc[:1100].to_dict('records')   # 0~1100번 (학습용)
-        test_data = df.iloc[1100:1200].to_dict('records')     # 1100~1200번 (테스트용 100개)
-        challenge_data = df.iloc[1200:1600].to_dict('records')# 1200~1600번 (챌린지용 400개)
-    except:
-        print("❌ CSV 파일이 없습니다. generate_all_data.py를 먼저 실행하세요!")
-        comm.Abort()
+# 2. 데이터 로드 및 재분할 (각 코어가 코퍼스에서 필요한 행 구간만 직접 읽음)
+try:
+    corpus = open_corpus(args.corpus, comm)
+except:
+    if rank == 0: print(f"❌ 코퍼스({args.corpus})가 없습니다. generate_all_data.py를 먼저 실행하세요!")
+    comm.Abort()
+
+# 0~1100번 (학습용) 은 단계마다 새로 추가되는 구간만 읽음
+test_range = (1100, 1200)      # 1100~1200번 (테스트용 100개)
+challenge_range = (1200, 1600) # 1200~1600번 (챌린지용 400개)
+
+# 테스트/챌린지 데이터 분산: 자기 몫의 행만 읽어서 미리 인코딩
+my_test_range, my_chal_range = corpus.my_block(*test_range), corpus.my_block(*challenge_range)
+if args.shared:
+    # 노드 리더만 0~1600번 전체를 인코딩해서 노드 공유 메모리에 올리고, 나머지 코어는 뷰로 읽음
+    shared = SharedEncodedCorpus(corpus, 'hard', 0, challenge_range[1], comm)
+    my_test_m, my_chal_m = shared.rows(*my_test_range), shared.rows(*my_chal_range)
+    my_test_cats, my_chal_cats = shared.category_codes(*my_test_range), shared.category_codes(*my_chal_range)
+    if rank == 0: print(f"📦 노드 공유 메모리 코퍼스: {shared.nbytes / 1024:.1f} KB (노드당 1벌)")
 else:
-    full_train_data = test_data = challenge_data = None
+    # 하드 모드 토큰 = legal_text.TOKENIZERS['hard'], 미리 토큰화한 열이 있으면 그대로 사용
+    my_test_m, vocab = encode_rows(corpus, *my_test_range, 'hard')
+    my_chal_m, vocab = encode_rows(corpus, *my_chal_range, 'hard', vocab)
+    my_test_cats, my_chal_cats = corpus.categories(*my_test_range), corpus.categories(*my_chal_range)
 
-# 테스트 데이터 분산 (Scatter)
-if rank == 0: test_chunks = np.array_split(test_data, size)
-else: test_chunks = None
-my_test_chunk = comm.scatter(test_chunks, root=0)
+# 테스트 판례마다 지금까지의 최근접 학습 판례를 기억 (챌린지도 같은 학습 판례를 같이 접어 넣음)
+test_nearest = RunningNearest(my_test_m)
+chal_nearest = RunningNearest(my_chal_m)
+train_cats = []
+
+def fold_train_rows(a, b, trackers):
+    # 이번 단계에 새로 추가된 학습 판례 [a, b) 만 읽고 인코딩해서 접어 넣음
+    if args.shared:
+        new_m = shared.rows(a, b) # 공유 메모리에 이미 인코딩되어 있음 (복사 없음)
+        train_cats.extend(shared.category_codes(a, b))
+    else:
+        new_m, _ = encode_rows(corpus, a, b, 'hard', vocab)
+        train_cats.extend(corpus.categories(a, b))
+    for tracker in trackers: tracker.fold(new_m)
 
-# 3. 5단계 반복 학습 시작
-if rank == 0: print(f"🚀 AI 학습 시작: 5단계 난이도 상승 모드 (Cheat Words Removed)")
+# 3. 단계별 반복 학습 시작
+if rank == 0: print(f"🚀 AI 학습 시작: {len(learning_phases)}단계 난이도 상승 모드 (Cheat Words Removed)")
+comm.Barrier()
+start_time = MPI.Wtime()
 
+prev_count = 0
 for i, data_count in enumerate(learning_phases):
-    # Rank 0이 학습 데이터 양을 조절해서 잘라냄
-    if rank == 0:
-        current_train_data = full_train_data[:data_count]
-    else:
-        current_train_data = None
-    
-    # 모든 코어가 현재 단계의 학습 데이터를 공유
-    current_train_data = comm.bcast(current_train_data, root=0)
-    
-    correct = 0
-    for test_case in my_test_chunk:
-        # 테스트 데이터도 똑같이 만듦
-        test_vec = get_hard_mode_vector(test_case['Facts'])
-        best_cat, max_sim = "", -1
-        
-        # 학습 데이터와 비교
-        for train_case in current_train_data:
-            train_vec = get_hard_mode_vector(train_case['Facts'])
-            
-            # 유사도 계산
-            if not (test_vec | train_vec): sim = 0
-            else: sim = len(test_vec & train_vec) / len(test_vec | train_vec)
-            
-            if sim > max_sim: max_sim, best_cat = sim, train_case['Category']
-        
-        if best_cat == test_case['Category']: correct += 1
+    fold_train_rows(prev_count, data_count, [test_nearest, chal_nearest])
+    prev_count = data_count
+    correct = count_matches(test_nearest.best, my_test_cats, train_cats)
     
     # 결과 집계
     total_correct = comm.reduce(correct, op=MPI.SUM, root=0)
     
+
     if rank == 0:
         acc = total_correct / 100 
         print(f"🔄 Step {i+1} (Data: {data_count}ea) | Loss: {1-acc:.4f} | Accuracy: {acc*100:.2f}%")
 
+curve_time = comm.reduce(MPI.Wtime() - start_time, op=MPI.MAX, root=0)
+if rank == 0: print(f"⏱️ 학습 곡선 소요 시간: {curve_time:.4f}초")
+
 # 4. 최종 챌린지 테스트
 if rank == 0: 
     print("\n🏁 [최종 챌린지 테스트 (400개)]")
-    chal_chunks = np.array_split(challenge_data, size)
-else: chal_chunks = None
-
-my_chal_chunk = comm.scatter(chal_chunks, root=0)
-current_train_data = comm.bcast(full_train_data, root=0) # 1100개 전체 지식 사용
-
-final_correct = 0
-for test_case in my_chal_chunk:
-    test_vec = get_hard_mode_vector(test_case['Facts'])
-    best_cat, max_sim = "", -1
-    for train_case in current_train_data:
-        train_vec = get_hard_mode_vector(train_case['Facts'])
-        if not (test_vec | train_vec): sim = 0
-        else: sim = len(test_vec & train_vec) / len(test_vec | train_vec)
-        if sim > max_sim: max_sim, best_cat = sim, train_case['Category']
-    if best_cat == test_case['Category']: final_correct += 1
+
+# 1100개 전체 지식 사용 (마지막 단계가 1100개보다 작으면 나머지도 마저 접어 넣음)
+if prev_count < train_size:
+    fold_train_rows(prev_count, train_size, [chal_nearest])
+final_correct = count_matches(chal_nearest.best, my_chal_cats, train_cats)
 
 total_final = comm.reduce(final_correct, op=MPI.SUM, root=0)
 
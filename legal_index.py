@@ -0,0 +1,284 @@
+import os
+import sys
+import glob
+import numpy as np
+import pandas as pd
+
+from legal_text import normalize_korean, expand_synonyms, term_weight, calibrate_score
+from legal_columnar import MANIFEST, is_columnar, read_manifest, open_shard, decode_facts, token_columns, read_vocab
+
+# ==================================================================
+# 📚 역색인 (Inverted Index)
+# 토큰 -> 판례 번호 목록(postings) + 판례별 토큰 수(len(case_vec))를 디스크에 저장
+# 한 번 만들어두면 상담할 때마다 1,600개 판례를 다시 전처리할 필요가 없음
+# 본문/죄명은 legal_columnar와 같은 배치 (고정 폭 '<U' 배열은 모든 행이 가장 긴 본문 x 4바이트를 차지함)
+#   facts_off / facts_bin : 본문 시작 위치(int64, 판례 수 + 1개) + UTF-8 바이트를 이어 붙인 것
+#   categories / category_code : 죄명 사전 + 판례별 죄명 코드(uint16)
+# ==================================================================
+CSV_PATH = 'legal_data_total.csv'
+INDEX_PATH = 'legal_index.npz'
+INDEX_FORMAT = 2 # 1: 본문/죄명 '<U' 배열, 2: 위치 + UTF-8 바이트 (포맷이 다르면 is_fresh가 False -> 다시 생성)
+
+def source_stamp(csv_path):
+    # 열 기반 코퍼스 폴더면 manifest.json의 크기/수정시각 (변환/토큰 추가 때마다 다시 씀)
+    st = os.stat(os.path.join(csv_path, MANIFEST) if is_columnar(csv_path) else csv_path)
+    return np.array([st.st_size, st.st_mtime_ns], dtype=np.int64)
+
+def encode_facts(facts):
+    # 본문 목록 -> (시작 위치, UTF-8 바이트)
+    raw = [f.encode('utf-8') for f in facts]
+    off = np.zeros(len(raw) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in raw], out=off[1:])
+    return off, np.frombuffer(b''.join(raw), dtype=np.uint8)
+
+def encode_categories(categories):
+    # 죄명 목록 -> (죄명 사전, 판례별 코드)
+    names, codes = np.unique(np.asarray(categories, dtype=str), return_inverse=True)
+    return names, codes.astype(np.uint16)
+
+def text_columns(categories, facts):
+    names, codes = encode_categories(categories)
+    off, raw = encode_facts(facts)
+    return {'categories': names, 'category_code': codes, 'facts_off': off, 'facts_bin': raw}
+
+def case_facts(index, lo, hi):
+    # 판례 [lo, hi) 본문 (legal_columnar.decode_facts와 같은 디코딩)
+    return decode_facts({'off': index['facts_off'], 'bin': index['facts_bin']}, lo, hi)
+
+def case_categories(index, lo, hi):
+    return index['categories'][index['category_code'][lo:hi]]
+
+def tokenize_cases(facts, vocab):
+    # 판례마다 토큰 ID 목록 (vocab에 없던 토큰은 뒤에 새 ID)
+    return [[vocab.setdefault(w, len(vocab)) for w in expand_synonyms(normalize_korean(f))] for f in facts]
+
+def build_postings(case_tokens, n_tokens, first_case=0):
+    # 판례 번호는 first_case부터 (증분 세그먼트는 기존 판례 뒤에 이어지는 전역 번호)
+    case_len = np.array([len(t) for t in case_tokens], dtype=np.int32)
+    token_ids = np.fromiter((t for ids in case_tokens for t in ids), dtype=np.int32, count=int(case_len.sum()))
+    return postings_from_ids(token_ids, case_len, n_tokens, first_case)
+
+def postings_from_ids(token_ids, case_len, n_tokens, first_case=0):
+    # token_ids: 판례 순서로 이어 붙인 토큰 ID, case_len: 판례별 토큰 수
+    case_ids = np.repeat(np.arange(first_case, first_case + len(case_len), dtype=np.int32), case_len)
+
+    # (토큰, 판례) 순으로 정렬 -> 토큰별 postings가 판례 번호 오름차순으로 붙어 있음
+    order = np.lexsort((case_ids, token_ids))
+    post_ids = case_ids[order]
+    post_ptr = np.zeros(n_tokens + 1, dtype=np.int64)
+    np.cumsum(np.bincount(token_ids, minlength=n_tokens), out=post_ptr[1:])
+    return post_ptr, post_ids, case_len
+
+def save_part(path, **arrays):
+    # 임시 파일에 쓰고 교체 -> 쓰는 도중에 읽는 코어가 깨진 파일을 보지 않음
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, path)
+
+def read_source(csv_path):
+    # (본문/죄명 열 dict, 본문 목록 또는 None, 미리 토큰화한 (토큰 ID, 판례 길이, vocab) 또는 None)
+    if not is_columnar(csv_path):
+        df = pd.read_csv(csv_path)
+        facts = df['Facts'].astype(str).tolist()
+        return text_columns(df['Category'].astype(str).tolist(), facts), facts, None
+    # 열 기반 코퍼스는 죄명 코드/본문 바이트를 디코딩 없이 그대로 이어 붙임
+    manifest = read_manifest(csv_path)
+    shards = [(open_shard(os.path.join(csv_path, s['path'])), s['rows']) for s in manifest['shards']]
+    offs, base = [np.zeros(1, dtype=np.int64)], 0
+    for sh, n in shards:
+        off = np.asarray(sh['off'][:n + 1], dtype=np.int64)
+        offs.append(off[1:] - off[0] + base)
+        base += int(off[-1] - off[0])
+    columns = {'categories': np.array(manifest['categories'], dtype=str),
+               'category_code': np.concatenate([np.asarray(sh['codes'][:n]) for sh, n in shards]).astype(np.uint16),
+               'facts_off': np.concatenate(offs),
+               'facts_bin': np.concatenate([np.asarray(sh['bin'][sh['off'][0]:sh['off'][n]]) for sh, n in shards])}
+    if 'korean' not in manifest.get('tokens', []):
+        return columns, case_facts(columns, 0, len(columns['facts_off']) - 1), None
+    cols = [token_columns(sh, 'korean') for sh, _ in shards]
+    token_ids = np.concatenate([np.asarray(ids) for _, ids in cols])
+    case_len = np.concatenate([np.diff(off) for off, _ in cols]).astype(np.int32)
+    return columns, None, (token_ids, case_len, read_vocab(csv_path, 'korean'))
+
+def build_index(csv_path=CSV_PATH, index_path=INDEX_PATH):
+    # csv_path: CSV 파일 또는 열 기반 코퍼스 폴더 (tokens-korean 열이 있으면 전처리 생략)
+    columns, facts, pretokenized = read_source(csv_path)
+
+    if pretokenized is None:
+        vocab = {}
+        case_tokens = tokenize_cases(facts, vocab)
+        post_ptr, post_ids, case_len = build_postings(case_tokens, len(vocab))
+    else:
+        token_ids, case_len, vocab = pretokenized
+        post_ptr, post_ids, case_len = postings_from_ids(token_ids, case_len, len(vocab))
+
+    save_part(index_path,
+              vocab=np.array(list(vocab), dtype=str),
+              post_ptr=post_ptr, post_ids=post_ids, case_len=case_len,
+              **columns, source=source_stamp(csv_path), format=INDEX_FORMAT)
+    for seg in segment_paths(index_path): os.remove(seg) # 전체 재생성이면 증분 세그먼트는 필요 없음
+    return len(case_len), len(vocab)
+
+# ==================================================================
+# ➕ 증분 추가 (Incremental Ingestion)
+# 새 판례는 CSV 끝에 이어 쓰고, 그 판례들만의 작은 색인 조각(세그먼트)을 따로 저장
+# legal_index.npz (기본) + legal_index.seg0001.npz, seg0002.npz ... (추가분)
+# 세그먼트 = 자기 vocab + 전역 판례 번호로 된 postings + 판례 길이/죄명/본문 + 추가 직후 CSV 도장
+# -> 1,000건 추가 비용은 1,000건 전처리 비용뿐 (기존 판례는 다시 읽지 않음)
+# 읽을 때는 기본 + 세그먼트를 메모리에서 합치고, 세그먼트가 쌓이면 압축(compact)해서 기본 하나로
+# ==================================================================
+MAX_SEGMENTS = 8
+
+def segment_paths(index_path=INDEX_PATH):
+    stem = index_path[:-4] if index_path.endswith('.npz') else index_path
+    return sorted(glob.glob(glob.escape(stem) + '.seg[0-9][0-9][0-9][0-9].npz'))
+
+def _load_part(path):
+    with np.load(path) as z:
+        return {k: z[k] for k in z.files}
+
+def indexed_cases(index_path=INDEX_PATH):
+    # 기본 + 세그먼트에 들어있는 판례 수 (판례 길이 배열만 읽음)
+    total = 0
+    for path in [index_path] + segment_paths(index_path):
+        with np.load(path) as z:
+            total += len(z['case_len'])
+    return total
+
+def merge_parts(parts):
+    # 세그먼트별 토큰 ID -> 합친 vocab의 ID로 바꾼 뒤 (토큰, 판례) 쌍을 한 번에 다시 정렬
+    # 전처리는 다시 하지 않음 (정수 배열 작업만)
+    if len(parts) == 1:
+        return parts[0]
+    vocab = {}
+    tok, cid = [], []
+    for part in parts:
+        remap = np.array([vocab.setdefault(w, len(vocab)) for w in part['vocab'].tolist()], dtype=np.int32)
+        tok.append(np.repeat(remap, np.diff(part['post_ptr'])))
+        cid.append(part['post_ids'])
+    tok, cid = np.concatenate(tok), np.concatenate(cid)
+    order = np.lexsort((cid, tok))
+    post_ptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(tok, minlength=len(vocab)), out=post_ptr[1:])
+    return {'vocab': np.array(list(vocab), dtype=str),
+            'post_ptr': post_ptr, 'post_ids': cid[order],
+            'case_len': np.concatenate([p['case_len'] for p in parts]),
+            **merge_text_columns(parts),
+            'source': parts[-1]['source'], 'format': parts[-1]['format']}
+
+def merge_text_columns(parts):
+    # 죄명 사전은 합쳐서 코드를 다시 매기고, 본문 위치는 앞 조각들 바이트 수만큼 밀어서 이어 붙임
+    names, codes = {}, []
+    offs, base = [np.zeros(1, dtype=np.int64)], 0
+    for p in parts:
+        remap = np.array([names.setdefault(c, len(names)) for c in p['categories'].tolist()], dtype=np.uint16)
+        codes.append(remap[p['category_code']])
+        offs.append(p['facts_off'][1:] + base)
+        base += int(p['facts_off'][-1])
+    return {'categories': np.array(list(names), dtype=str), 'category_code': np.concatenate(codes),
+            'facts_off': np.concatenate(offs), 'facts_bin': np.concatenate([p['facts_bin'] for p in parts])}
+
+def append_cases(new_df, csv_path=CSV_PATH, index_path=INDEX_PATH):
+    # 새 판례(Category, Facts)를 CSV 끝에 붙이고 그 판례들만 색인해서 세그먼트로 저장
+    # 색인이 CSV와 맞지 않으면 먼저 전체 재생성 (판례 번호가 어긋나면 안 되므로)
+    if is_columnar(csv_path):
+        raise ValueError("증분 추가는 CSV 코퍼스만 지원합니다 (열 기반은 generate_all_data.py / legal_columnar.py로 다시 생성)")
+    if not is_fresh(csv_path, index_path):
+        build_index(csv_path, index_path)
+    segments = segment_paths(index_path)
+    first_case = indexed_cases(index_path)
+
+    # CSV 한 줄 = 판례 한 건 (legal_corpus.ShardedCorpus는 줄바꿈 위치로 행을 나눔)
+    # -> 필드 안 줄바꿈(\r, \n)은 따옴표로 감싼 여러 줄 필드가 되지 않도록 공백 하나로 바꿔서 저장/색인
+    new_df = new_df[['Category', 'Facts']].astype(str).replace(r'[\r\n]+', ' ', regex=True)
+    new_df.to_csv(csv_path, mode='a', header=False, index=False, encoding='utf-8')
+
+    vocab = {}
+    case_tokens = tokenize_cases(new_df['Facts'], vocab)
+    post_ptr, post_ids, case_len = build_postings(case_tokens, len(vocab), first_case)
+    seq = int(segments[-1][-8:-4]) + 1 if segments else 1
+    stem = index_path[:-4] if index_path.endswith('.npz') else index_path
+    save_part(f"{stem}.seg{seq:04d}.npz",
+              vocab=np.array(list(vocab), dtype=str),
+              post_ptr=post_ptr, post_ids=post_ids, case_len=case_len,
+              **text_columns(new_df['Category'].astype(str).tolist(), new_df['Facts'].astype(str).tolist()),
+              source=source_stamp(csv_path), format=INDEX_FORMAT)
+
+    if len(segments) + 1 > MAX_SEGMENTS:
+        compact_index(index_path)
+    return first_case, first_case + len(new_df)
+
+def compact_index(index_path=INDEX_PATH):
+    # 기본 색인 + 세그먼트를 하나로 합쳐서 기본 색인으로 저장 (전처리 없이 배열 병합만)
+    segments = segment_paths(index_path)
+    if not segments:
+        return 0
+    save_part(index_path, **merge_parts([_load_part(p) for p in [index_path] + segments]))
+    for seg in segments: os.remove(seg)
+    return len(segments)
+
+def is_fresh(csv_path=CSV_PATH, index_path=INDEX_PATH):
+    # CSV가 바뀌었으면(크기/수정시각) 색인을 다시 만들어야 함
+    # 증분 세그먼트가 있으면 마지막 세그먼트의 도장과 비교
+    if not os.path.exists(index_path):
+        return False
+    # 예전 포맷(본문 '<U' 배열) 색인도 다시 생성
+    last = (segment_paths(index_path) or [index_path])[-1]
+    with np.load(last) as z:
+        return ('format' in z.files and int(z['format']) == INDEX_FORMAT
+                and np.array_equal(z['source'], source_stamp(csv_path)))
+
+def load_index(index_path=INDEX_PATH):
+    index = merge_parts([_load_part(p) for p in [index_path] + segment_paths(index_path)])
+    index['token_id'] = {w: i for i, w in enumerate(index['vocab'].tolist())}
+    return index
+
+def search_index(index, user_vec, blocked, context_penalty, lo=0, hi=None):
+    # 질의와 토큰을 하나라도 공유하는 판례만 건드림 (lo <= case_id < hi 구역만)
+    # 결과는 (점수, 판례 번호, 죄명) 튜플 목록 (판례 번호 오름차순)
+    if hi is None: hi = len(index['case_len'])
+    post_ptr, post_ids = index['post_ptr'], index['post_ids']
+
+    weighted = {}
+    for w in user_vec:
+        tid = index['token_id'].get(w)
+        if tid is None: continue
+        plist = post_ids[post_ptr[tid]:post_ptr[tid + 1]]
+        a, b = np.searchsorted(plist, [lo, hi])
+        weight = term_weight(w)
+        for cid in plist[a:b].tolist():
+            weighted[cid] = weighted.get(cid, 0.0) + weight
+
+    names, codes = index['categories'].tolist(), index['category_code']
+    results = []
+    for cid in sorted(weighted):
+        category = names[codes[cid]]
+        if category in blocked: continue
+        score = calibrate_score(weighted[cid], int(index['case_len'][cid]), category, context_penalty)
+        if score > 0:
+            results.append((score, cid, category))
+    return results
+
+def match_keywords(index, case_id, user_vec):
+    post_ptr, post_ids = index['post_ptr'], index['post_ids']
+    keywords = []
+    for w in user_vec:
+        tid = index['token_id'].get(w)
+        if tid is None: continue
+        plist = post_ids[post_ptr[tid]:post_ptr[tid + 1]]
+        pos = np.searchsorted(plist, case_id)
+        if pos < len(plist) and plist[pos] == case_id:
+            keywords.append(w)
+    return keywords
+
+def case_details(index, case_id, user_vec):
+    return {'Category': str(case_categories(index, case_id, case_id + 1)[0]),
+            'Facts': case_facts(index, case_id, case_id + 1)[0],
+            'Match_Keywords': match_keywords(index, case_id, user_vec)}
+
+if __name__ == "__main__":
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else CSV_PATH
+    index_path = sys.argv[2] if len(sys.argv) > 2 else INDEX_PATH
+    n_cases, n_tokens = build_index(csv_path, index_path)
+    print(f"✅ 역색인 생성 완료: 판례 {n_cases}개, 토큰 {n_tokens}개 -> {index_path}")
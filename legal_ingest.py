@@ -0,0 +1,31 @@
+import time
+import argparse
+import pandas as pd
+
+import legal_index
+
+# ==================================================================
+# ➕ 새 판례 증분 추가 도구
+# python legal_ingest.py new_cases.csv   : 새 판례 CSV(Category,Facts)를 말뭉치 끝에 붙이고 세그먼트 색인 추가
+# python legal_ingest.py --compact       : 쌓인 세그먼트를 기본 색인 하나로 압축
+# (세그먼트가 legal_index.MAX_SEGMENTS개를 넘으면 추가할 때 자동으로 압축)
+# (본문/죄명 안 줄바꿈은 공백으로 바꿔서 추가 -> 말뭉치 CSV는 계속 1줄 = 1행)
+# ==================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="판례 증분 추가 / 색인 압축")
+    parser.add_argument('new_csv', nargs='?', help="추가할 판례 CSV (Category,Facts)")
+    parser.add_argument('--csv', default=legal_index.CSV_PATH)
+    parser.add_argument('--index', default=legal_index.INDEX_PATH)
+    parser.add_argument('--compact', action='store_true', help="세그먼트를 기본 색인으로 합침")
+    args = parser.parse_args()
+
+    if args.new_csv:
+        t0 = time.perf_counter()
+        a, b = legal_index.append_cases(pd.read_csv(args.new_csv), args.csv, args.index)
+        print(f"✅ 판례 {b - a}건 추가 (번호 {a}~{b - 1}) | {time.perf_counter() - t0:.4f}초"
+              f" | 세그먼트 {len(legal_index.segment_paths(args.index))}개")
+    if args.compact:
+        t0 = time.perf_counter()
+        merged = legal_index.compact_index(args.index)
+        print(f"🗜️ 세그먼트 {merged}개 압축 완료 | {time.perf_counter() - t0:.4f}초")
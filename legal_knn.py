@@ -0,0 +1,136 @@
+import numpy as np
+import scipy.sparse as sp
+
+# ==================================================================
+# 🧠 자카드 kNN 분류기 공통 엔진
+# 학습 판례는 전처리 설정마다 딱 한 번만 토큰 ID 집합(frozenset)으로 만들어두고
+# 모든 테스트 판례 / 학습 단계에서 재사용함
+# ==================================================================
+
+def encode_sets(texts, tokenize, vocab=None):
+    # 토큰 문자열 -> 정수 ID (vocab은 학습/테스트가 같이 써야 ID가 맞음)
+    # 문서 안에서는 정렬 순서로 ID를 매겨서 실행할 때마다 같은 ID가 나오게 함
+    if vocab is None: vocab = {}
+    return [frozenset(vocab.setdefault(w, len(vocab)) for w in sorted(tokenize(t))) for t in texts], vocab
+
+def nearest_category(test_vec, train_vecs, train_cats):
+    # 자카드 유사도 = |A ∩ B| / |A ∪ B|, 동점이면 먼저 나온 학습 판례
+    best_cat, max_sim = "", -1
+    n_test = len(test_vec)
+    for train_vec, cat in zip(train_vecs, train_cats):
+        inter = len(test_vec & train_vec)
+        union = n_test + len(train_vec) - inter
+        sim = inter / union if union else 0
+        if sim > max_sim: max_sim, best_cat = sim, cat
+    return best_cat
+
+def count_correct(test_vecs, test_cats, train_vecs, train_cats):
+    return sum(nearest_category(v, train_vecs, train_cats) == cat for v, cat in zip(test_vecs, test_cats))
+
+# ==================================================================
+# 🧮 행렬 버전: 판례 x 토큰 이진 희소 행렬로 모든 쌍의 자카드를 한 번에
+# 교집합 = A @ B.T (희소 행렬 곱), 합집합 = |A| + |B| - 교집합, 행마다 argmax
+# 학습 단계(prefix)가 여러 개여도 곱은 한 번만 하고 앞쪽 열만 잘라서 argmax
+# ==================================================================
+def encode_matrix(vecs, n_tokens):
+    lengths = np.fromiter((len(v) for v in vecs), dtype=np.int64, count=len(vecs))
+    indptr = np.zeros(len(vecs) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    indices = np.fromiter((t for v in vecs for t in sorted(v)), dtype=np.int32, count=int(indptr[-1]))
+    return sp.csr_matrix((np.ones(len(indices), dtype=np.float32), indices, indptr), shape=(len(vecs), n_tokens))
+
+def jaccard_blocks(test_m, train_m, block_rows=512):
+    # 테스트 행을 block_rows개씩 잘라서 (시작 행, 자카드 유사도 블록) 을 차례로 돌려줌
+    # vocab이 나중에 늘어났으면(학습에 없던 토큰) 교집합은 공통 열에서만, 집합 크기는 전체 행에서
+    k = min(test_m.shape[1], train_m.shape[1])
+    train_t = (train_m[:, :k] if train_m.shape[1] > k else train_m).T.tocsc() # 공유 메모리 행렬은 복사하지 않음
+    train_len = train_m.getnnz(axis=1)
+    test_len = test_m.getnnz(axis=1)
+
+    for start in range(0, test_m.shape[0], block_rows):
+        blk = test_m[start:start + block_rows, :k]
+        inter = (blk @ train_t).toarray().astype(np.float64)
+        union = test_len[start:start + block_rows, None] + train_len[None, :] - inter
+        yield start, np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+def nearest_indices(test_m, train_m, prefixes=None, block_rows=512):
+    # 반환: (len(prefixes), 테스트 수) 가장 가까운 학습 판례 번호 (학습 판례가 0개면 -1)
+    if prefixes is None: prefixes = [train_m.shape[0]]
+    best = np.full((len(prefixes), test_m.shape[0]), -1, dtype=np.int64)
+    for start, sim in jaccard_blocks(test_m, train_m, block_rows):
+        for p, count in enumerate(prefixes):
+            if count > 0:
+                best[p, start:start + len(sim)] = sim[:, :count].argmax(axis=1)
+    return best
+
+def count_matches(best, test_cats, train_cats):
+    train_cats = np.asarray(list(train_cats) + [""], dtype=object) # -1 -> ""
+    return int((train_cats[best] == np.asarray(test_cats, dtype=object)).sum())
+
+def correct_per_prefix(test_m, test_cats, train_m, train_cats, prefixes=None):
+    # 학습 단계별 정답 개수 리스트
+    return [count_matches(row, test_cats, train_cats) for row in nearest_indices(test_m, train_m, prefixes)]
+
+# ==================================================================
+# 📈 증분(incremental) 학습 곡선: 테스트 판례마다 지금까지의 (max_sim, 최근접 번호)를 들고 있다가
+# 새 단계에서 추가된 학습 판례만 접어 넣음 -> 곡선 전체 비용 = 마지막 단계 1회 비용
+# 기존 최고점보다 '더 클 때만' 바꾸므로 동점이면 먼저 나온 학습 판례가 남음 (전체 argmax와 동일)
+# ==================================================================
+class RunningNearest:
+    def __init__(self, test_m):
+        self.test_m = test_m
+        self.max_sim = np.full(test_m.shape[0], -1.0)
+        self.best = np.full(test_m.shape[0], -1, dtype=np.int64)
+        self.seen = 0
+
+    def fold(self, new_train_m, block_rows=512):
+        for start, sim in jaccard_blocks(self.test_m, new_train_m, block_rows):
+            if sim.shape[1] == 0: break
+            idx = sim.argmax(axis=1)
+            top = sim[np.arange(len(sim)), idx]
+            rows = slice(start, start + len(sim))
+            better = top > self.max_sim[rows]
+            self.max_sim[rows] = np.where(better, top, self.max_sim[rows])
+            self.best[rows] = np.where(better, self.seen + idx, self.best[rows])
+        self.seen += new_train_m.shape[0]
+
+# ==================================================================
+# 🧹 전처리 설정 스윕(sweep): 불용어 레벨마다 토큰화/행렬 곱을 다시 하지 않음
+# 문서는 불용어 없이 딱 한 번만 토큰 ID 집합으로 만들고 (모든 레벨의 상위 집합),
+# 레벨별 불용어는 '빼야 할 토큰 ID 목록'으로만 표현함
+# 교집합_레벨 = 공통 교집합(곱 1회) - 불용어 열끼리의 교집합 (불용어 열 몇 개짜리 작은 곱)
+# 집합 크기_레벨 = 전체 크기 - 문서에 들어있던 불용어 수
+# ==================================================================
+def drop_ids(vocab, stops):
+    # 불용어 중 vocab에 실제로 있는 것만 ID로 (토큰화 규칙상 한 글자는 어차피 없음)
+    return np.array(sorted(vocab[w] for w in set(stops) if w in vocab), dtype=np.int64)
+
+def pad_columns(m, n_tokens):
+    # vocab이 나중에 늘어난 행렬들의 열 수를 맞춤 (데이터는 그대로)
+    if m.shape[1] == n_tokens: return m
+    return sp.csr_matrix((m.data, m.indices, m.indptr), shape=(m.shape[0], n_tokens))
+
+def sweep_nearest(test_m, train_m, drops, block_rows=512):
+    # 반환: (설정 수, 테스트 수) 설정별 가장 가까운 학습 판례 번호 (학습 판례가 0개면 -1)
+    n_tokens = max(test_m.shape[1], train_m.shape[1])
+    test_m, train_m = pad_columns(test_m, n_tokens), pad_columns(train_m, n_tokens)
+    best = np.full((len(drops), test_m.shape[0]), -1, dtype=np.int64)
+    if train_m.shape[0] == 0: return best
+
+    train_t = train_m.T.tocsc()
+    train_len = train_m.getnnz(axis=1)
+    test_len = test_m.getnnz(axis=1)
+    # 설정별 학습 쪽 불용어 열과 줄어든 집합 크기는 한 번만
+    train_drop = [train_m[:, ids].T.tocsc() for ids in drops]
+    train_len_c = [train_len - d.getnnz(axis=0) for d in train_drop]
+
+    for start in range(0, test_m.shape[0], block_rows):
+        blk = test_m[start:start + block_rows]
+        inter = (blk @ train_t).toarray().astype(np.float64)
+        for c, ids in enumerate(drops):
+            blk_drop = blk[:, ids]
+            inter_c = inter - (blk_drop @ train_drop[c]).toarray()
+            union = (test_len[start:start + block_rows] - blk_drop.getnnz(axis=1))[:, None] + train_len_c[c][None, :] - inter_c
+            sim = np.divide(inter_c, union, out=np.zeros_like(inter_c), where=union > 0)
+            best[c, start:start + len(sim)] = sim.argmax(axis=1)
+    return best
@@ -0,0 +1,214 @@
+import hashlib
+import numpy as np
+import scipy.sparse as sp
+
+from legal_sparse import SparseScorer
+from legal_knn import jaccard_blocks
+
+# ==================================================================
+# 🎲 MinHash + LSH 근사 최근접 탐색
+# 토큰 ID 집합마다 num_perm개의 MinHash 서명을 만들고, 서명을 bands개 띠로 잘라 버킷에 넣음
+# 질의와 띠 하나라도 같은 버킷에 들어간 판례만 후보 -> 후보에 대해서만 정확한 자카드 계산
+# 해시는 토큰 ID가 아니라 토큰 문자열에서 만듦 -> vocab 순서(코어마다 자기 몫으로 만든 vocab 등)가 달라도 서명이 같음
+# 두 집합의 자카드가 s일 때 후보가 될 확률 = 1 - (1 - s^r)^b  (r = num_perm / bands)
+# -> 확률이 급격히 올라가는 지점(문턱) ≈ (1/b)^(1/r): 띠 수는 목표 문턱값에서 정함 (bands_for_threshold)
+# 목표 문턱값 (legal_data_total.csv 실측, bench_lsh.py):
+#   학습기: 테스트 판례와 최근접 학습 판례의 자카드 중앙값 0.71 (하위 5% 0.67), 다른 죄명 최근접은 중앙값 0.62
+#           -> 0.7 (128 perm = 16띠 x 8행, 문턱 0.71)
+#   검색  : 질의와 정확한 상위 3건의 자카드 중앙값 0.17 (하위 10% 0.11) -> 0.15 (128 perm = 64띠 x 2행, 문턱 0.12)
+# ==================================================================
+MERSENNE_PRIME = (1 << 31) - 1
+TRAIN_THRESHOLD = 0.7
+SEARCH_THRESHOLD = 0.15
+
+def token_key(word):
+    # 토큰 문자열 -> 실행/코어와 무관하게 고정된 31비트 정수 (파이썬 hash()는 PYTHONHASHSEED마다 달라짐)
+    return int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little') % MERSENNE_PRIME
+
+def bands_for_threshold(num_perm, threshold):
+    # num_perm의 약수 중 문턱 (1/b)^(1/r) 이 threshold에 가장 가까운 띠 수 b
+    divisors = [b for b in range(1, num_perm + 1) if num_perm % b == 0]
+    return min(divisors, key=lambda b: abs((1 / b) ** (b / num_perm) - threshold))
+
+class MinHashLSH:
+    def __init__(self, num_perm=64, bands=16, seed=42):
+        if num_perm % bands:
+            raise ValueError(f"num_perm({num_perm})은 bands({bands})로 나누어 떨어져야 합니다")
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, MERSENNE_PRIME, size=num_perm).astype(np.int64)
+        self.b = rng.randint(0, MERSENNE_PRIME, size=num_perm).astype(np.int64)
+        self.bands, self.rows = bands, num_perm // bands
+        self.threshold = (1 / bands) ** (1 / self.rows)
+        self.buckets = [{} for _ in range(bands)]
+        self.size = 0
+        self.token_hashes = np.zeros((num_perm, 0), dtype=np.uint32)
+        self.known = {} # 토큰 문자열 -> token_hashes 열 번호
+
+    def columns(self, tokens):
+        # vocab 순서대로 나열한 토큰 문자열 -> token_hashes 열 번호 (처음 보는 토큰만 해시를 계산해서 뒤에 추가)
+        # 이렇게 얻은 배열을 signatures / insert / candidate_pairs 에 넘김 (행렬 열 j = tokens[j])
+        new = [w for w in dict.fromkeys(tokens) if w not in self.known]
+        if new:
+            keys = np.array([token_key(w) for w in new], dtype=np.int64)
+            h = (self.a[:, None] * keys[None, :] + self.b[:, None]) % MERSENNE_PRIME
+            self.known.update((w, self.token_hashes.shape[1] + i) for i, w in enumerate(new))
+            self.token_hashes = np.hstack([self.token_hashes, h.astype(np.uint32)])
+        return np.array([self.known[w] for w in tokens], dtype=np.int64)
+
+    def signatures(self, m, cols, chunk_rows=1024):
+        # m: 판례 x 토큰 이진 CSR, cols: columns()로 얻은 열 번호 -> (판례 수, num_perm) 서명, 빈 집합은 MERSENNE_PRIME
+        # 판례마다 토큰 해시 열들의 최솟값, 모아 온 해시 배열은 chunk_rows행씩만 만듦 (메모리 = 청크의 토큰 수만큼)
+        sig = np.full((m.shape[0], len(self.a)), MERSENNE_PRIME, dtype=np.uint32)
+        for start in range(0, m.shape[0], chunk_rows):
+            ptr = m.indptr[start:start + chunk_rows + 1]
+            nonempty = np.flatnonzero(np.diff(ptr))
+            if not len(nonempty): continue
+            h = self.token_hashes.take(cols[m.indices[ptr[0]:ptr[-1]]], axis=1) # take: 연속 배열로 모아야 reduceat가 빠름
+            sig[start + nonempty] = np.minimum.reduceat(h, ptr[nonempty] - ptr[0], axis=1).T
+        return sig
+
+    def _band_keys(self, sig):
+        # 띠마다 행 r개를 바이트로 묶어서 버킷 키로 사용 (void 뷰 -> 행마다 tobytes 호출 없음)
+        key_type = np.dtype((np.void, sig.itemsize * self.rows))
+        for band in range(self.bands):
+            part = np.ascontiguousarray(sig[:, band * self.rows:(band + 1) * self.rows])
+            yield band, part.view(key_type).ravel().tolist()
+
+    def insert(self, m, cols):
+        # 학습 판례를 뒤에 이어 붙임 (번호는 지금까지 넣은 개수부터)
+        sig = self.signatures(m, cols)
+        for band, keys in self._band_keys(sig):
+            table = self.buckets[band]
+            for i, key in enumerate(keys, self.size):
+                table.setdefault(key, []).append(i)
+        self.size += m.shape[0]
+
+    def candidate_pairs(self, m, cols):
+        # (질의 행, 후보 번호) 쌍 배열 (띠가 여러 개 겹쳐도 한 번, 질의 행 -> 번호 오름차순)
+        rows, ids = [], []
+        for band, keys in self._band_keys(self.signatures(m, cols)):
+            table = self.buckets[band]
+            for i, key in enumerate(keys):
+                hit = table.get(key)
+                if hit:
+                    rows.append((i, len(hit)))
+                    ids.extend(hit)
+        if not rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        row, count = np.array(rows, dtype=np.int64).T
+        radix = max(self.size, 1)
+        code = np.sort(np.repeat(row, count) * radix + np.array(ids, dtype=np.int64))
+        code = code[np.r_[True, code[1:] != code[:-1]]]
+        return np.divmod(code, radix)
+
+    def candidates(self, m, cols):
+        # 질의 행마다 후보 학습 판례 번호 (오름차순 np.array)
+        rows, ids = self.candidate_pairs(m, cols)
+        return np.split(ids, np.searchsorted(rows, np.arange(1, m.shape[0])))
+
+def pair_jaccard(test_m, train_m, pair_i, pair_j, chunk=100_000):
+    # (테스트 행, 학습 행) 쌍마다 정확한 자카드: 교집합 = 두 행의 원소곱 합 (열 수가 다르면 공통 열에서만)
+    # 쌍의 행을 모은 행렬은 chunk쌍씩만 만듦
+    k = min(test_m.shape[1], train_m.shape[1])
+    test_k, train_k = test_m[:, :k], train_m[:, :k]
+    inter = np.zeros(len(pair_i))
+    for s in range(0, len(pair_i), chunk):
+        pi, pj = pair_i[s:s + chunk], pair_j[s:s + chunk]
+        inter[s:s + chunk] = np.asarray(test_k[pi].multiply(train_k[pj]).sum(axis=1)).ravel()
+    union = test_m.getnnz(axis=1)[pair_i] + train_m.getnnz(axis=1)[pair_j] - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+def best_pairs(pair_i, pair_j, sim):
+    # 테스트별로 (유사도 내림차순, 번호 오름차순) 첫 번째 쌍 -> (테스트 번호, 학습 번호, 유사도)
+    order = np.lexsort((pair_j, -sim, pair_i))
+    first = order[np.r_[True, pair_i[order][1:] != pair_i[order][:-1]]]
+    return pair_i[first], pair_j[first], sim[first]
+
+class ApproxNearest:
+    # legal_knn.RunningNearest와 같은 사용법 (fold로 학습 판례를 이어 붙이고 .best를 읽음)
+    # 테스트 판례 쪽을 한 번만 버킷에 넣어 두고, fold마다 새 학습 블록의 서명만 만들어서 같은 버킷의 테스트와 짝지음
+    # -> 비교는 (테스트, 새 블록 후보) 쌍뿐, 단계가 쌓여도 앞 블록을 다시 쌓거나 다시 훑지 않음
+    # 아직 LSH 문턱값 이상인 판례를 못 찾은 테스트 행은 새 블록 전체와 정확히 비교 (RunningNearest와 같은 대체 경로)
+    # -> 근사는 '문턱값 이상 이웃이 이미 있는 행'에만 적용 (초반 단계/외딴 판례는 정확 모드와 같음)
+    # 기존 최고점보다 '더 클 때만' 바꾸므로 동점이면 먼저 나온 학습 판례가 남음
+    # n_cand: 행별 누적 LSH 후보 수, n_pairs: 행별 누적 자카드 계산 수 (후보 + 대체 경로)
+    # tokens: 행렬 열 순서대로 나열한 토큰 문자열 (encode_sets의 vocab이면 list(vocab)), 학습 블록도 같은 열을 씀
+    # 학습기(legal_hpc_trainer*.py)에는 연결하지 않음: bench_lsh.py 실측 (500 x 1100, 16띠 x 8행)
+    #   정확도 차이 최대 -0.2%p 이지만 속도는 RunningNearest(희소 행렬 곱 1회)의 0.5~0.6배
+    #   생성 코퍼스 학습 판례 1100 / 4400 / 17600개에서 0.54 / 0.89 / 1.02배 -> 이 규모에서는 정확 모드가 이득
+    def __init__(self, test_m, tokens, num_perm=128, bands=None, seed=42):
+        self.test_m = test_m
+        self.lsh = MinHashLSH(num_perm, bands or bands_for_threshold(num_perm, TRAIN_THRESHOLD), seed)
+        self.cols = self.lsh.columns(tokens)
+        self.lsh.insert(test_m, self.cols)
+        self.threshold = self.lsh.threshold
+        self.max_sim = np.full(test_m.shape[0], -1.0)
+        self.best = np.full(test_m.shape[0], -1, dtype=np.int64)
+        self.n_cand = np.zeros(test_m.shape[0], dtype=np.int64)
+        self.n_pairs = np.zeros(test_m.shape[0], dtype=np.int64)
+        self.seen = 0
+
+    def _update(self, rows, ids, sim):
+        better = sim > self.max_sim[rows]
+        self.max_sim[rows[better]] = sim[better]
+        self.best[rows[better]] = self.seen + ids[better]
+
+    def fold(self, new_train_m):
+        # 새 학습 행 j마다 같은 버킷에 든 테스트 행들 -> (테스트, 새 학습) 후보 쌍
+        pair_j, pair_i = self.lsh.candidate_pairs(new_train_m, self.cols)
+        if len(pair_i):
+            self._update(*best_pairs(pair_i, pair_j, pair_jaccard(self.test_m, new_train_m, pair_i, pair_j)))
+            counts = np.bincount(pair_i, minlength=len(self.n_cand))
+            self.n_cand += counts
+            self.n_pairs += counts
+
+        empty = np.flatnonzero(self.max_sim < self.threshold)
+        if len(empty) and new_train_m.shape[0]:
+            self.n_pairs[empty] += new_train_m.shape[0]
+            for start, sim in jaccard_blocks(self.test_m[empty], new_train_m):
+                idx = sim.argmax(axis=1)
+                self._update(empty[start:start + len(sim)], idx, sim[np.arange(len(sim)), idx])
+        self.seen += new_train_m.shape[0]
+
+# ==================================================================
+# 🔎 유사 판례 검색용 근사 모드: LSH 후보 판례만 기존 가중치 점수로 채점
+# 질의는 판례보다 짧아서 정답 판례와의 자카드도 작음 -> 문턱 SEARCH_THRESHOLD (띠 하나 = 서명 2개)
+# 가중치 점수 상위(죄명이 서로 다른 3건)는 자카드 순서와 달라서 재현율이 학습기보다 낮음
+# 실측 (bench_lsh.py, 질의 300개, 128 perm / 64띠 x 2행): 후보 비율 70%, 상위 3건 재현율 86%, 속도는 sparse의 0.44배
+# 짧은 질의(기본 폭행 예시 등)는 후보가 아예 없거나 정답 판례가 후보에서 빠지기 쉬움
+# -> 이 코퍼스처럼 판례끼리 단어가 많이 겹치면 자카드만으로는 후보를 줄일 수 없음
+#    legal_search --engine 선택지에는 넣지 않고 bench_lsh.py 측정용으로만 둠
+# ==================================================================
+class LshScorer(SparseScorer):
+    def __init__(self, index, lo=0, hi=None, num_perm=128, bands=None, seed=42):
+        super().__init__(index, lo, hi)
+        self.lsh = MinHashLSH(num_perm, bands or bands_for_threshold(num_perm, SEARCH_THRESHOLD), seed)
+        self.cols = self.lsh.columns(self.vocab.tolist())
+        self.lsh.insert(self.matrix, self.cols)
+
+    def query_matrix(self, analyzed):
+        # 색인에 없는 질의 토큰도 집합 크기에는 들어가야 하므로 vocab 뒤쪽 임시 ID를 줌 -> (이진 CSR, 열 번호)
+        extra = {}
+        rows = []
+        for user_vec, _, _ in analyzed:
+            ids = set()
+            for w in user_vec:
+                tid = self.token_id.get(w)
+                if tid is None: tid = extra.setdefault(w, len(self.vocab) + len(extra))
+                ids.add(tid)
+            rows.append(sorted(ids))
+        indptr = np.cumsum([0] + [len(r) for r in rows])
+        indices = np.array([t for r in rows for t in r], dtype=np.int64)
+        m = sp.csr_matrix((np.ones(len(indices)), indices, indptr), shape=(len(rows), len(self.vocab) + len(extra)))
+        return m, np.concatenate([self.cols, self.lsh.columns(list(extra))])
+
+    def score_batch(self, analyzed):
+        Q, allowed, context = self.encode_queries(analyzed)
+        scored = []
+        everything = np.arange(self.matrix.shape[0])
+        for q, rows in enumerate(self.lsh.candidates(*self.query_matrix(analyzed))):
+            if not len(rows): rows = everything # 후보가 없는 질의(색인에 없는 단어가 대부분 등)는 전체 채점
+            weighted = (self.matrix[rows] @ Q[:, q]).toarray().ravel()
+            hit = weighted > 0
+            scored.append(self.finish_scores(q, rows[hit], weighted[hit], allowed, context))
+        return scored
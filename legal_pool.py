@@ -0,0 +1,108 @@
+import time
+from functools import reduce
+
+import legal_index
+from legal_topk import merge_batches, pick_diverse
+from legal_search import user_input, ScanEngine, index_engine, format_report, analyze_query, build_parser
+from hpc_backend import PoolBackend, block_range, worker_rank, worker_size, shared_arrays, worker_extras, worker_cache
+
+# ==================================================================
+# 🏊 프로세스 풀 검색 (--exec pool): mpirun/MPI 없이 한 서버의 코어를 전부 사용
+#   python legal_pool.py --workers 8 --engine sparse      (또는 legal_ai_service.py --exec pool)
+# legal_ai_service.py(MPI)와 같은 분할/취합:
+#   1) 부모(= Rank 0)가 색인을 한 번만 읽어 공유 메모리에 올림 (작업자 수와 상관없이 1벌, pickle 전송 없음)
+#   2) 작업자 k는 block_range(판례 수, k, N) 구역의 엔진을 만들어 두고 계속 재사용 (Rank k와 같은 구역)
+#   3) 질의 묶음을 모든 작업자에 scatter -> 상위 후보 요약을 gather -> 병합 + 다양성 필터
+#   4) 최종 당선작 본문만 담당 작업자에게서 받아옴
+# scan 엔진은 코퍼스 대신 색인에 들어있는 본문/죄명 열을 자기 구역만큼 전처리해서 사용
+# ==================================================================
+SHARED_KEYS = ['vocab', 'post_ptr', 'post_ids', 'case_len', 'categories', 'category_code', 'facts_off', 'facts_bin']
+
+# ---------- 작업자 프로세스 쪽 ----------
+def _engine():
+    cache = worker_cache()
+    if 'engine' not in cache:
+        args = worker_extras()['args']
+        index = dict(shared_arrays())
+        index['token_id'] = {w: i for i, w in enumerate(index['vocab'].tolist())}
+        lo, hi = block_range(len(index['case_len']), worker_rank(), worker_size())
+        if args.engine == 'scan':
+            categories = legal_index.case_categories(index, lo, hi).tolist()
+            rows = [{'Category': c, 'Facts': f} for c, f in zip(categories, legal_index.case_facts(index, lo, hi))]
+            cache['engine'] = ScanEngine(rows, lo)
+        else:
+            cache['engine'] = index_engine(args, index, lo, hi)
+    return cache['engine']
+
+def _warm():
+    engine = _engine()
+    return engine.lo, engine.hi
+
+def _topk(analyzed):
+    t0 = time.perf_counter()
+    summaries = _engine().topk_batch(analyzed)
+    return summaries, time.perf_counter() - t0
+
+def _details(wanted):
+    t0 = time.perf_counter()
+    engine = _engine()
+    details = {(q, case_id): engine.details(case_id, user_vec) for q, case_id, user_vec in wanted}
+    return details, time.perf_counter() - t0
+
+# ---------- 부모 프로세스 (Rank 0 역할) ----------
+class PoolService:
+    def __init__(self, args, workers=None):
+        t0 = time.perf_counter()
+        # 1. 색인 준비 (없거나 코퍼스가 바뀌었으면 생성)
+        if not legal_index.is_fresh(args.csv, args.index):
+            legal_index.build_index(args.csv, args.index)
+        index = legal_index.load_index(args.index)
+        self.backend = PoolBackend(workers, {k: index[k] for k in SHARED_KEYS}, {'args': args})
+        self.size = self.backend.size
+        self.blocks = self.backend.gather(_warm) # 작업자별 구역 엔진 생성
+        self.compute_time = [0.0] * self.size    # 작업자별 채점/본문 조회 시간 (통신 시간 = 전체 - 계산)
+        self.shared_bytes = self.backend.shared.nbytes
+        self.startup_time = time.perf_counter() - t0
+
+    def owner(self, case_id):
+        for k, (lo, hi) in enumerate(self.blocks):
+            if lo <= case_id < hi: return k
+
+    def consult_batch(self, analyzed):
+        results = self.backend.gather(_topk, [(analyzed,)] * self.size)
+        for k, (_, t) in enumerate(results): self.compute_time[k] += t
+        merged = reduce(merge_batches, [s for s, _ in results])
+        winners = [pick_diverse(s) for s in merged]
+
+        wanted = [[] for _ in range(self.size)]
+        for q, final in enumerate(winners):
+            for _, case_id, _ in final:
+                wanted[self.owner(case_id)].append((q, case_id, analyzed[q][0]))
+        details = {}
+        for k, (d, t) in enumerate(self.backend.gather(_details, [(w,) for w in wanted])):
+            details.update(d)
+            self.compute_time[k] += t
+        return [[dict(details[(q, case_id)], Score=score) for score, case_id, _ in final]
+                for q, final in enumerate(winners)]
+
+    def close(self):
+        self.backend.close()
+
+def run(args):
+    if args.serve:
+        raise SystemExit("상주 서버 모드(--serve)는 --exec mpi 전용입니다")
+    service = PoolService(args, args.workers)
+    try:
+        # 2. 병렬 검색 + 3. 결과 취합 (다양성 필터)
+        t0 = time.perf_counter()
+        analyzed = analyze_query(user_input)
+        results = service.consult_batch([analyzed])
+        search_time = time.perf_counter() - t0
+    finally:
+        service.close()
+    print(format_report(analyzed[0], results[0]))
+    print(f"⏱️ 기동 시간(로드+분배): {service.startup_time:.4f}초 | 검색: {search_time * 1000:.2f}ms"
+          f" | pool 작업자 {service.size}개 | 공유 메모리 {service.shared_bytes / 1024:.1f} KB", flush=True)
+
+if __name__ == "__main__":
+    run(build_parser().parse_args())
@@ -0,0 +1,123 @@
+import argparse
+
+from legal_text import (normalize_korean, expand_synonyms, has_context_penalty,
+                        blocked_categories, term_weight, calibrate_score)
+import legal_index
+from legal_topk import summarize
+from legal_sparse import SparseScorer
+from hpc_backend import EXECS
+
+# ==================================================================
+# 🔍 유사 판례 검색 공용 부분 (mpi4py 없이 import 됨)
+# 질의 분석 / 채점 엔진 / 리포트 -> legal_ai_service.py(MPI)와 legal_pool.py(프로세스 풀)가 같이 씀
+# ==================================================================
+
+# ==================================================================
+# 📝 폭행 사건
+# ==================================================================
+user_input = """
+서울 강남구의 한 술집에서 친구와 술을 마시다가 옆 테이블 손님과 시비가 붙었습니다.
+서로 말싸움을 하다가 제가 화를 참지 못하고 상대방의 멱살을 잡고
+주먹으로 얼굴을 여러 차례 때렸습니다.
+상대방은 코뼈가 부러지는 상해를 입었고, 바로 경찰이 출동해서 조사를 받았습니다.
+"""
+
+# ==================================================================
+# 🔎 [전체 탐색] 판례를 하나씩 전처리해서 채점 (색인 없이)
+# ==================================================================
+def normalize_shard(my_chunk):
+    # 자기 구역 판례를 한 번만 전처리해서 (판례, case_vec) 로 들고 있음
+    return [(case, expand_synonyms(normalize_korean(case['Facts']))) for case in my_chunk]
+
+def scan_chunk(my_shard, user_vec, blocked, context_penalty, offset=0):
+    # 후보는 (점수, 판례 번호, 죄명) 튜플만 -> 본문/키워드는 최종 당선작만 따로 가져옴
+    my_results = []
+    for i, (case, case_vec) in enumerate(my_shard):
+        # 제약 조건 위반 -> 점수 계산 안 하고 스킵
+        if case['Category'] in blocked:
+            continue
+
+        intersection = user_vec & case_vec
+
+        weighted_matches = 0
+        for word in intersection:
+            weighted_matches += term_weight(word)
+
+        calibrated_score = calibrate_score(weighted_matches, len(case_vec), case['Category'], context_penalty)
+        if calibrated_score > 0:
+            my_results.append((calibrated_score, offset + i, case['Category']))
+    return my_results
+
+class ScanEngine:
+    def __init__(self, my_chunk, offset):
+        self.shard = normalize_shard(my_chunk)
+        self.lo, self.hi = offset, offset + len(self.shard)
+
+    def topk_batch(self, analyzed, k=3):
+        return [summarize(scan_chunk(self.shard, *a, self.lo), k) for a in analyzed]
+
+    def details(self, case_id, user_vec):
+        case, case_vec = self.shard[case_id - self.lo]
+        return {'Category': case['Category'], 'Facts': case['Facts'],
+                'Match_Keywords': list(user_vec & case_vec)}
+
+class IndexEngine:
+    # 역색인 postings를 따라가며 자기 구역 [lo, hi) 판례만 채점
+    def __init__(self, index, lo, hi):
+        self.index, self.lo, self.hi = index, lo, hi
+
+    def topk_batch(self, analyzed, k=3):
+        return [summarize(legal_index.search_index(self.index, *a, self.lo, self.hi), k) for a in analyzed]
+
+    def details(self, case_id, user_vec):
+        return legal_index.case_details(self.index, case_id, user_vec)
+
+def index_engine(args, index, lo, hi):
+    # 색인 기반 엔진 (sparse / index) - 자기 구역 [lo, hi)
+    # legal_minhash.LshScorer(MinHash/LSH 근사 후보만 채점)는 sparse보다 느리고 재현율도 낮아서 선택지에 넣지 않음 (bench_lsh.py)
+    if args.engine == 'sparse':
+        # 자기 구역을 CSR 행렬로 만들어두고 질의 묶음을 한 번의 희소 행렬 곱으로 채점
+        return SparseScorer(index, lo, hi)
+    return IndexEngine(index, lo, hi)
+
+def format_report(user_vec, final_top3):
+    lines = ["\n" + "="*70,
+             f"🤖 [HPC AI 법률 상담 리포트] (Logic Verified)",
+             "="*70,
+             f"📌 핵심 키워드: {list(user_vec)}",
+             "-" * 70]
+
+    if not final_top3:
+        lines.append("유사한 판례를 찾지 못했습니다.")
+    else:
+        for i, res in enumerate(final_top3):
+            lines.append(f"🏆 추천 판례 {i+1}위")
+            lines.append(f"   📂 죄명 분류: [{res['Category']}]")
+            lines.append(f"   📊 매칭 신뢰도: {res['Score']*100:.2f}%")
+            lines.append(f"   🔑 매칭된 정황: {res['Match_Keywords']}")
+            lines.append(f"   📜 판례 내용: {res['Facts'][:100]}...")
+            lines.append("-" * 70)
+    return "\n".join(lines)
+
+def analyze_query(text):
+    user_vec_raw = normalize_korean(text)
+    user_vec = expand_synonyms(user_vec_raw)
+    # 문맥 패널티 확인 (친구, 술집 등)
+    return user_vec, blocked_categories(user_vec), has_context_penalty(user_vec_raw)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="HPC AI 유사 판례 검색")
+    parser.add_argument('--corpus', '--csv', dest='csv', default=legal_index.CSV_PATH, help="CSV 또는 열 기반 코퍼스 폴더 (legal_columnar)")
+    parser.add_argument('--index', default=legal_index.INDEX_PATH, help="역색인 파일 (없거나 CSV가 바뀌면 새로 생성)")
+    parser.add_argument('--engine', choices=['sparse', 'index', 'scan'], default='sparse',
+                        help="sparse: 희소 행렬 곱 채점 / index: 역색인 postings 순회 / scan: 색인 없이 전체 판례 전처리")
+    parser.add_argument('--exec', choices=EXECS, default='mpi',
+                        help="mpi: mpirun 프로세스 / pool: 한 서버 안 프로세스 풀 (MPI 없이, legal_pool.py)")
+    parser.add_argument('--workers', type=int, help="pool 작업자 수 (기본: CPU 코어 수)")
+    parser.add_argument('--serve', choices=['stdin', 'socket', 'dir'], help="상주 서버 모드 (질의 입력원)")
+    parser.add_argument('--batch', type=int, default=16, help="한 번에 Bcast할 최대 질의 수")
+    parser.add_argument('--cache-size', type=int, default=1024, help="상주 서버 결과 캐시 최대 건수 (0이면 캐시 안 함)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5050)
+    parser.add_argument('--drop-dir', default='queries')
+    return parser
@@ -0,0 +1,177 @@
+import os
+import sys
+import time
+import glob
+import select
+import socket
+import argparse
+
+# ==================================================================
+# 📮 상주 서버용 질의 입력원 (Rank 0 전용)
+# 모든 입력원은 next_batch(max_batch) -> [(handle, 질의문), ...] 또는 None(종료)
+# 그리고 reply(handle, 리포트 문자열)로 결과를 돌려줌
+# ==================================================================
+
+class StdinSource:
+    # 한 줄 = 질의 1건. 이미 들어와 있는 줄은 최대 max_batch개까지 한 번에 묶음
+    def __init__(self):
+        self._fd = sys.stdin.fileno()
+        self._buf = b''
+        self._eof = False
+
+    def _fill(self, block):
+        if not block and not select.select([self._fd], [], [], 0)[0]:
+            return False
+        chunk = os.read(self._fd, 65536)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf += chunk
+        return True
+
+    def next_batch(self, max_batch):
+        batch = []
+        while len(batch) < max_batch:
+            if b'\n' in self._buf:
+                line, self._buf = self._buf.split(b'\n', 1)
+            elif self._eof or not self._fill(block=not batch):
+                if not self._eof or not self._buf: break
+                line, self._buf = self._buf, b''
+            else:
+                continue
+            text = line.decode('utf-8', errors='replace').strip()
+            if text: batch.append((None, text))
+        return batch or None
+
+    def reply(self, handle, report):
+        print(report, flush=True)
+
+    def close(self):
+        pass
+
+
+class SocketSource:
+    # 로컬 TCP 소켓: 클라이언트가 질의문을 보내고 송신을 닫으면(shutdown) 리포트를 돌려받음
+    # 본문이 정확히 SHUTDOWN 이면 서버 종료
+    def __init__(self, host, port):
+        self._srv = socket.create_server((host, port))
+        self._stop = False
+        print(f"📡 소켓 대기 중: {host}:{port}", flush=True)
+
+    def next_batch(self, max_batch):
+        if self._stop: return None
+        self._srv.setblocking(True)
+        conns = [self._srv.accept()[0]]
+        self._srv.setblocking(False)
+        while len(conns) < max_batch:
+            try:
+                conns.append(self._srv.accept()[0])
+            except BlockingIOError:
+                break
+
+        batch = []
+        for conn in conns:
+            conn.setblocking(True)
+            conn.settimeout(10)
+            try:
+                text = recv_all(conn).decode('utf-8', errors='replace').strip()
+            except OSError:
+                conn.close()
+                continue
+            if text == 'SHUTDOWN':
+                self._stop = True
+                conn.close()
+            elif text:
+                batch.append((conn, text))
+            else:
+                conn.close()
+        return batch or (None if self._stop else [])
+
+    def reply(self, conn, report):
+        try:
+            conn.sendall(report.encode('utf-8'))
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+    def close(self):
+        self._srv.close()
+
+
+class DirSource:
+    # 파일 드롭 폴더: *.query 파일 1개 = 질의 1건 -> 같은 이름의 *.report 로 결과 저장
+    # (쓰는 쪽은 임시 이름으로 쓴 뒤 *.query 로 rename 해야 반쯤 쓴 파일을 읽지 않음)
+    # 폴더에 STOP 파일을 넣으면 서버 종료
+    def __init__(self, path, poll=0.2):
+        os.makedirs(path, exist_ok=True)
+        self._path = path
+        self._poll = poll
+        print(f"📂 드롭 폴더 감시 중: {path}", flush=True)
+
+    def _queued(self):
+        # (수정 시각, 경로) 순 *.query 목록 - glob 뒤에 지워지거나 이름이 바뀐 파일은 빼고
+        files = []
+        for path in glob.glob(os.path.join(self._path, '*.query')):
+            try:
+                files.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+        return [path for _, path in sorted(files)]
+
+    def next_batch(self, max_batch):
+        while True:
+            batch = []
+            for path in self._queued()[:max_batch]:
+                # 목록을 만든 뒤 다른 쪽이 가져가거나 지운 파일은 건너뜀 (서버 전체가 죽지 않게)
+                try:
+                    with open(path, encoding='utf-8') as f:
+                        text = f.read().strip()
+                    os.remove(path)
+                except OSError:
+                    continue
+                batch.append((path[:-len('.query')] + '.report', text))
+            if batch:
+                return batch
+            if os.path.exists(os.path.join(self._path, 'STOP')):
+                return None
+            time.sleep(self._poll)
+
+    def reply(self, report_path, report):
+        tmp = report_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(report)
+        os.replace(tmp, report_path)
+
+    def close(self):
+        pass
+
+
+def open_source(args):
+    if args.serve == 'stdin':
+        return StdinSource()
+    if args.serve == 'socket':
+        return SocketSource(args.host, args.port)
+    return DirSource(args.drop_dir)
+
+def recv_all(conn):
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk: break
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+# 간단한 클라이언트: python legal_server.py "질의문"  (또는 표준입력으로 질의문 전달)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="legal_ai_service 소켓 서버에 질의 전송")
+    parser.add_argument('query', nargs='?')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5050)
+    args = parser.parse_args()
+
+    text = args.query if args.query is not None else sys.stdin.read()
+    with socket.create_connection((args.host, args.port)) as conn:
+        conn.sendall(text.encode('utf-8'))
+        conn.shutdown(socket.SHUT_WR)
+        print(recv_all(conn).decode('utf-8'))
@@ -0,0 +1,114 @@
+import numpy as np
+import scipy.sparse as sp
+from mpi4py import MPI
+
+from legal_corpus import encode_rows
+
+# ==================================================================
+# 🧠 노드 공유 메모리 코퍼스 (Node-local Shared Memory)
+# 같은 서버(노드)에 있는 코어들은 인코딩된 학습 판례를 각자 들고 있을 필요가 없음
+# 1) COMM_TYPE_SHARED로 노드별 통신기를 만들고
+# 2) 노드 리더(노드 안 0번 코어)만 코퍼스를 읽어 토큰 ID 희소 행렬(CSR)로 인코딩한 뒤
+#    MPI 공유 메모리 창(Win.Allocate_shared) 하나에 복사
+# 3) 나머지 코어는 같은 메모리를 numpy 뷰로 바로 읽음 (복사/bcast 없음)
+# -> 노드당 메모리는 코어 수와 상관없이 코퍼스 1벌, 노드 안 데이터 통신량 0
+# ==================================================================
+
+ALIGN = 64
+
+class SharedArrays:
+    # 노드 리더가 넘긴 numpy 배열들(dict)을 공유 메모리 창 하나에 이어 붙여 올림
+    # 리더가 아닌 코어는 arrays=None을 넘기고, 배열 모양(이름/dtype/shape)만 작게 bcast로 받음
+    def __init__(self, arrays, node):
+        leader = node.Get_rank() == 0
+        specs = node.bcast([(k, a.dtype.str, a.shape) for k, a in arrays.items()] if leader else None, root=0)
+
+        offsets, total = [], 0
+        for _, dtype, shape in specs:
+            total = -(-total // ALIGN) * ALIGN
+            offsets.append(total)
+            total += int(np.prod(shape)) * np.dtype(dtype).itemsize
+        self.nbytes = total
+
+        self.win = MPI.Win.Allocate_shared(max(total, 1) if leader else 0, 1, comm=node)
+        buf, _ = self.win.Shared_query(0)
+        base = np.frombuffer(buf, dtype=np.uint8)
+
+        self.arrays = {}
+        for (name, dtype, shape), off in zip(specs, offsets):
+            nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            self.arrays[name] = base[off:off + nbytes].view(dtype).reshape(shape)
+        if leader:
+            for name, a in arrays.items():
+                self.arrays[name][...] = a
+        node.Barrier() # 리더가 다 쓴 다음에 읽기 시작
+        for a in self.arrays.values():
+            a.flags.writeable = False
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def free(self):
+        self.win.Free()
+
+class SharedVocab:
+    # 토큰 문자열 -> ID 조회 (dict처럼 `in` / [] 사용), 정렬된 토큰 배열에서 이진 탐색
+    def __init__(self, tokens, order):
+        self.tokens, self.order = tokens, order
+        self.sorted = tokens[order]
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def _find(self, word):
+        pos = np.searchsorted(self.sorted, word)
+        if pos < len(self.sorted) and self.sorted[pos] == word:
+            return int(self.order[pos])
+        return None
+
+    def __contains__(self, word):
+        return self._find(word) is not None
+
+    def __getitem__(self, word):
+        tid = self._find(word)
+        if tid is None: raise KeyError(word)
+        return tid
+
+class SharedEncodedCorpus:
+    # 판례 [a, b) 를 tokenizer(legal_text.TOKENIZERS 이름)로 인코딩한 이진 CSR + 카테고리 코드를 노드 공유 메모리에 올림
+    # vocab은 행 순서대로 ID를 매기므로 학습 판례를 앞쪽 행에 두면 기존 encode_sets와 같은 ID
+    # (열 기반 코퍼스에 미리 토큰화한 열이 있으면 리더도 토큰화 없이 바로 올림)
+    def __init__(self, corpus, tokenizer, a, b, comm=MPI.COMM_WORLD):
+        self.node = comm.Split_type(MPI.COMM_TYPE_SHARED)
+        self.a, self.b = a, b
+
+        arrays = None
+        if self.node.Get_rank() == 0:
+            m, vocab = encode_rows(corpus, a, b, tokenizer)
+            categories, codes = np.unique(np.array(corpus.categories(a, b), dtype=str), return_inverse=True)
+            tokens = np.array(list(vocab), dtype=str) if vocab else np.array([], dtype='<U1')
+            arrays = dict(indptr=m.indptr, indices=m.indices, data=m.data,
+                          codes=codes.astype(np.int32), categories=categories.astype(str),
+                          tokens=tokens, token_order=np.argsort(tokens, kind='stable'))
+        self.shared = SharedArrays(arrays, self.node)
+
+        self.indptr, self.indices, self.data = self.shared['indptr'], self.shared['indices'], self.shared['data']
+        self.codes, self.categories = self.shared['codes'], self.shared['categories']
+        self.vocab = SharedVocab(self.shared['tokens'], self.shared['token_order'])
+
+    @property
+    def nbytes(self):
+        return self.shared.nbytes
+
+    def rows(self, a, b):
+        # 판례 [a, b) 의 CSR 행렬: indices/data는 공유 메모리 뷰 그대로, indptr(행 수+1)만 새로 만듦
+        lo, hi = a - self.a, b - self.a
+        start, end = self.indptr[lo], self.indptr[hi]
+        # ※ scipy 생성자는 큰 버퍼의 일부를 가리키는 배열을 복사해버리므로(prune) 빈 행렬에 직접 꽂음
+        m = sp.csr_matrix((hi - lo, len(self.vocab)), dtype=self.data.dtype)
+        m.indptr = self.indptr[lo:hi + 1] - start
+        m.indices, m.data = self.indices[start:end], self.data[start:end]
+        return m
+
+    def category_codes(self, a, b):
+        return self.codes[a - self.a:b - self.a]
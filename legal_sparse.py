@@ -0,0 +1,104 @@
+import numpy as np
+import scipy.sparse as sp
+
+from legal_text import term_weight
+from legal_topk import summarize
+from legal_index import case_facts, case_categories
+
+# ==================================================================
+# ⚡ 희소 행렬 채점 엔진 (Sparse Matrix Scoring)
+# 판례 x 토큰 이진 CSR 행렬 X, 질의는 가중치(핵심 용어 5.0 / 나머지 1.0)가 들어간 토큰 x 질의 행렬 Q
+# 가중 매칭 점수 = X @ Q 한 번의 곱 -> 분모/보정/패널티/제약 조건은 전부 벡터 마스크로 처리
+# ==================================================================
+PENALTY_CATEGORY = '공무집행방해'
+
+class SparseScorer:
+    def __init__(self, index, lo=0, hi=None):
+        n_cases, n_tokens = len(index['case_len']), len(index['vocab'])
+        if hi is None: hi = n_cases
+
+        # 역색인(토큰 -> 판례)에서 자기 구역 [lo, hi) 판례가 나오는 자리만 골라 구역 행만으로 CSR을 만듦
+        # (전체 코퍼스 행렬을 만들었다가 잘라내지 않음 -> 임시 메모리는 postings 길이 x 1바이트 마스크뿐)
+        post_ptr, post_ids = index['post_ptr'], index['post_ids']
+        pos = np.flatnonzero((post_ids >= lo) & (post_ids < hi))
+        tokens = np.searchsorted(post_ptr, pos, side='right') - 1 # 자리 -> 토큰 (post_ptr 구간)
+        self.matrix = sp.csr_matrix((np.ones(len(pos)), (post_ids[pos] - lo, tokens)), shape=(hi - lo, n_tokens))
+        self.lo, self.hi = lo, hi
+
+        self.vocab = index['vocab']
+        self.token_id = index['token_id']
+        self.weights = np.array([term_weight(w) for w in self.vocab.tolist()])
+
+        self.categories, self.cat_code = np.unique(case_categories(index, lo, hi), return_inverse=True)
+        self.denom = np.maximum(index['case_len'][lo:hi], 1).astype(np.float64)
+        self.penalty_rows = self.categories[self.cat_code] == PENALTY_CATEGORY
+        self.index = index # 본문은 최종 당선작만 색인의 UTF-8 바이트에서 디코딩
+
+    def encode_queries(self, analyzed):
+        # analyzed: [(user_vec, blocked, context_penalty), ...] -> (Q, 허용 카테고리 마스크, 문맥 패널티 벡터)
+        rows, cols = [], []
+        for q, (user_vec, _, _) in enumerate(analyzed):
+            for w in user_vec:
+                tid = self.token_id.get(w)
+                if tid is not None:
+                    rows.append(tid)
+                    cols.append(q)
+        rows = np.array(rows, dtype=np.int64)
+        Q = sp.csc_matrix((self.weights[rows], (rows, cols)), shape=(len(self.vocab), len(analyzed)))
+        allowed = np.array([[c not in blocked for c in self.categories.tolist()] for _, blocked, _ in analyzed],
+                           dtype=bool).reshape(len(analyzed), len(self.categories))
+        context = np.array([penalty for _, _, penalty in analyzed], dtype=bool)
+        return Q, allowed, context
+
+    def score_batch(self, analyzed):
+        # 질의별로 (구역 내 판례 행 번호, 최종 점수) -> 점수가 0보다 큰 판례만
+        Q, allowed, context = self.encode_queries(analyzed)
+        S = (self.matrix @ Q).tocsc()
+        S.sort_indices()
+        return [self.finish_scores(q, S.indices[S.indptr[q]:S.indptr[q + 1]], S.data[S.indptr[q]:S.indptr[q + 1]],
+                                   allowed, context) for q in range(len(analyzed))]
+
+    def finish_scores(self, q, rows, weighted, allowed, context):
+        raw_score = weighted / self.denom[rows]
+        score = raw_score * 6.0
+
+        # 공무집행방해 패널티 / 필수 요소 검증기
+        if context[q]:
+            score[self.penalty_rows[rows]] *= 0.3
+        score[~allowed[q, self.cat_code[rows]]] = 0
+
+        capped = score > 0.99
+        score[capped] = 0.98 + np.random.random(int(capped.sum())) * 0.015
+
+        keep = score > 0
+        return rows[keep], score[keep]
+
+    def top_candidates(self, rows, score, k=3):
+        # 다양성 필터에 필요한 후보만 벡터 연산으로 먼저 추림:
+        # 전체 상위 k개(동점 포함) + 카테고리별 1등
+        if len(rows) > k:
+            kth = score[np.argpartition(score, -k)[-k]]
+            keep = score >= kth
+        else:
+            keep = np.ones(len(rows), dtype=bool)
+
+        cats = self.cat_code[rows]
+        for c in np.unique(cats):
+            idx = np.flatnonzero(cats == c)
+            keep[idx[np.argmax(score[idx])]] = True
+        return rows[keep], score[keep]
+
+    def topk_batch(self, analyzed, k=3):
+        summaries = []
+        for rows, score in self.score_batch(analyzed):
+            rows, score = self.top_candidates(rows, score, k)
+            summaries.append(summarize(zip(score.tolist(), (rows + self.lo).tolist(),
+                                           self.categories[self.cat_code[rows]].tolist()), k))
+        return summaries
+
+    def details(self, case_id, user_vec):
+        row = case_id - self.lo
+        tokens = self.matrix.indices[self.matrix.indptr[row]:self.matrix.indptr[row + 1]]
+        return {'Category': str(self.categories[self.cat_code[row]]),
+                'Facts': case_facts(self.index, case_id, case_id + 1)[0],
+                'Match_Keywords': [w for w in self.vocab[tokens].tolist() if w in user_vec]}
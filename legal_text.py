@@ -0,0 +1,170 @@
+import re
+import sys
+import random
+from functools import lru_cache
+
+# ==================================================================
+# 🔧 [엔진 1] 전처리 & 노이즈 제거
+# ==================================================================
+STOPWORDS = ['은', '는', '이', '가', '을', '를', '의', '에', '에서', '로', '으로',
+             '합니다', '습니다', '하고', '하여', '된', '인', '도', '만', '과', '와', '에게',
+             '하더니', '했는데', '통해', '대해', '위해', '관해', '따르면', '받았', '했으']
+
+CHEAT_WORDS = [
+    '사기', '절도', '마약', '횡령', '폭행', '음주운전', '명예훼손', '교통사고',
+    '공무집행방해', '강제추행', '사건', '혐의', '피고인', '판결', '징역', '무죄',
+    '선고', '기소', '재판부', '상당', '피해', '발생', '위반',
+    '서울', '부산', '대구', '인천', '광주', '대전', '울산', '세종', '시',
+    '강남구', '해운대구', '수성구', '미추홀구', '북구', '남구', '서구', '일대',
+    '경찰', '조사', '출동', '진술'
+]
+
+# ==================================================================
+# ⚙️ 전처리 파이프라인 (한 번 컴파일해서 세 스크립트가 같이 씀)
+# 1) 제거 단어 목록 -> 해시 집합 (리스트 in 검사 대신 O(1))
+# 2) 접미사(조사) 목록 -> 역방향 트라이: 단어 끝 글자부터 따라 내려가며
+#    목록에서 가장 앞에 있는 접미사 하나만 뗌 (기존 '목록 순서대로 endswith 검사'와 같은 결과)
+# 3) 토큰 문자열은 sys.intern으로 한 벌만 유지 (판례 사이에 같은 토큰 객체 공유)
+# 4) 문서 단위 결과를 크기 제한 LRU 캐시에 저장 (같은 판례를 여러 번 토큰화하지 않음)
+# 결과는 캐시에서 공유되므로 frozenset (수정 불가)
+# ==================================================================
+_PUNCT = re.compile(r'[^\w\s]')
+
+class TextPipeline:
+    def __init__(self, drop_words=(), suffixes=(), min_len=2, cache_size=8192):
+        self.drop = frozenset(drop_words)
+        self.suffixes = list(suffixes)
+        self.min_len = min_len
+        self.trie = {}
+        for order, p in enumerate(self.suffixes):
+            node = self.trie
+            for ch in reversed(p): node = node.setdefault(ch, {})
+            node.setdefault(None, order) # None 키 = 여기서 끝나는 접미사의 목록 순서
+        self.tokens = lru_cache(maxsize=cache_size)(self.compute)
+
+    def strip_suffix(self, w):
+        # 단어 길이보다 짧은 접미사만 (첫 글자는 항상 남김)
+        node, best = self.trie, None
+        for i in range(len(w) - 1, 0, -1):
+            node = node.get(w[i])
+            if node is None: break
+            order = node.get(None)
+            if order is not None and (best is None or order < best): best = order
+        return w if best is None else w[:-len(self.suffixes[best])]
+
+    def compute(self, text):
+        # 캐시를 거치지 않는 원본 계산
+        drop, min_len = self.drop, self.min_len
+        if not self.trie:
+            return frozenset([sys.intern(w) for w in _PUNCT.sub('', text).split() if w not in drop and len(w) >= min_len])
+        out = []
+        for w in _PUNCT.sub('', text).split():
+            if w in drop: continue
+            w = self.strip_suffix(w)
+            if len(w) >= min_len: out.append(sys.intern(w))
+        return frozenset(out)
+
+    def __call__(self, text):
+        return self.tokens(text)
+
+    def cache_info(self):
+        return self.tokens.cache_info()
+
+KOREAN_PIPELINE = TextPipeline(CHEAT_WORDS + STOPWORDS, suffixes=STOPWORDS)
+
+def normalize_korean(text):
+    return KOREAN_PIPELINE(text)
+
+# ==================================================================
+# 🔧 [엔진 2] 유의어 확장 (범용)
+# ==================================================================
+SYNONYM_DICT = {
+    '잠적': '편취', '연락': '편취', '먹튀': '편취', '안보내': '편취',
+    '송금': '자금', '입금': '자금', '돈': '자금', '이체': '자금',
+    '중고': '물품', '시계': '물품', '택배': '물품', '구매': '물품',
+    '핑계': '기망', '속여': '기망', '거짓말': '기망',
+    '때렸': '폭행', '맞았': '폭행', '주먹': '폭행', '발로': '폭행', '시비': '폭행',
+    '멱살': '폭행', '싸움': '폭행', '다쳤': '상해', '부러': '상해', '코뼈': '상해',
+    '술': '음주', '마셨': '음주', '맥주': '음주', '소주': '음주', '운전': '음주',
+    '훔쳐': '절취', '가져': '절취', '슬쩍': '절취', '손대': '절취'
+}
+
+def expand_synonyms(word_set):
+    expanded_set = set(word_set)
+    for word in word_set:
+        if word in SYNONYM_DICT:
+            expanded_set.add(SYNONYM_DICT[word])
+    return expanded_set
+
+# ==================================================================
+# 🔧 [엔진 3] 필수 요소 검증기 (Prerequisite Validator) & 가중치 채점
+# ==================================================================
+# 특정 카테고리는 '필수 단어'가 없으면 아예 점수를 0으로 만듦
+# 이걸 넣어야 "주먹질했는데 교통사고가 나오는" 참사를 막음
+CATEGORY_CONSTRAINTS = {
+    '교통사고': ['차', '운전', '도로', '주행', '교통', '차량', '접촉'],
+    '음주운전': ['운전', '차', '주행', '대리', '핸들'],
+    '마약': ['투약', '필로폰', '주사', '대마', '매수'],
+    '보이스피싱': ['현금', '수거', '송금', '금융'],
+    # 폭행/사기는 일반적이므로 제약 없음
+}
+
+CRITICAL_TERMS = ['편취', '기망', '자금', '물품', '절취', '강취', '폭행', '상해', '투약', '음주']
+
+# 문맥 패널티 단어 (친구, 술집 등)
+CONTEXT_WORDS = ['친구', '지인', '손님', '가게', '술집', '동기']
+
+def has_context_penalty(user_vec_raw):
+    return any(w in user_vec_raw for w in CONTEXT_WORDS)
+
+def blocked_categories(user_vec):
+    # 사용자 입력(확장된 유의어 포함)에 필수 단어가 하나도 없는 카테고리 -> 탈락!
+    return {cat for cat, required_words in CATEGORY_CONSTRAINTS.items()
+            if not any(req in user_vec for req in required_words)}
+
+def term_weight(word):
+    return 5.0 if word in CRITICAL_TERMS else 1.0
+
+def calibrate_score(weighted_matches, case_len, category, context_penalty):
+    denom = case_len if case_len > 0 else 1
+    raw_score = weighted_matches / denom
+    calibrated_score = raw_score * 6.0
+
+    # 공무집행방해 패널티 적용
+    if context_penalty and category == '공무집행방해':
+        calibrated_score *= 0.3
+
+    if calibrated_score > 0.99:
+        calibrated_score = 0.98 + (random.random() * 0.015)
+    return calibrated_score
+
+# ==================================================================
+# 🔧 [학습기 전처리] legal_hpc_trainer / legal_hpc_trainer_m 용
+# ==================================================================
+# 피드백 루프: 레벨별로 지정한 불용어만 제거 (불용어 조합마다 파이프라인 하나씩)
+_clean_pipelines = {}
+
+def get_clean_set(text, stops):
+    key = tuple(stops)
+    pipeline = _clean_pipelines.get(key)
+    if pipeline is None:
+        pipeline = _clean_pipelines[key] = TextPipeline(stops)
+    return pipeline(text)
+
+# 하드 모드: 정답을 그대로 알려주는 치트 단어 제거
+HARD_MODE_CHEAT_WORDS = ['사기', '절도', '마약', '횡령', '폭행', '음주운전', '명예훼손', '교통사고',
+                         '공무집행방해', '강제추행', '사건', '혐의', '피고인', '판결', '징역', '무죄',
+                         '선고', '기소', '재판부', '상당', '피해', '발생']
+
+HARD_MODE_PIPELINE = TextPipeline(HARD_MODE_CHEAT_WORDS)
+
+def get_hard_mode_vector(text):
+    # 특수문자 제거 후 치트 단어가 아닌 것들만 남김
+    return HARD_MODE_PIPELINE(text)
+
+# 미리 토큰화(legal_columnar.add_tokens)할 때 쓰는 이름 -> 토큰화 함수
+TOKENIZERS = {
+    'korean': lambda text: expand_synonyms(normalize_korean(text)), # 유사 판례 검색 (색인)
+    'hard': get_hard_mode_vector,                                   # legal_hpc_trainer_m
+    'clean': lambda text: get_clean_set(text, ()),                  # legal_hpc_trainer (레벨 스윕 전 공통 토큰)
+}
@@ -0,0 +1,75 @@
+import heapq
+
+# ==================================================================
+# 🏅 다양성 필터를 아는 상위 k개 요약 (Diversity-aware Top-k)
+# 후보는 (점수, 판례 번호, 죄명) 튜플만 들고 다님 -> 판례 본문은 최종 당선작만 따로 가져옴
+# 요약 = 전체 상위 k개 + 죄명별 1등 중 상위 k개 (최대 2k개)
+# 요약끼리 합쳐서 다시 요약해도 결과가 같으므로 트리 리덕션에 그대로 쓸 수 있음
+# 정렬 순서는 점수 내림차순, 동점이면 판례 번호 오름차순 (기존 gather + 안정 정렬과 동일)
+# ==================================================================
+
+def _order_key(item):
+    return (-item[0], item[1])
+
+class DiverseTopK:
+    def __init__(self, k=3):
+        self.k = k
+        self.heap = []      # (점수, -판례 번호, 죄명) 최소 힙 -> 맨 위가 가장 약한 후보
+        self.leaders = {}   # 죄명 -> 그 죄명의 1등
+
+    def push(self, score, case_id, category):
+        item = (score, -case_id, category)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, item)
+        elif item > self.heap[0]:
+            heapq.heapreplace(self.heap, item)
+        best = self.leaders.get(category)
+        if best is None or item > best:
+            self.leaders[category] = item
+
+    def extend(self, items):
+        for score, case_id, category in items:
+            self.push(score, case_id, category)
+        return self
+
+    def items(self):
+        top_leaders = heapq.nlargest(self.k, self.leaders.values())
+        keep = {(s, -neg_id, c) for s, neg_id, c in self.heap + top_leaders}
+        return sorted(keep, key=_order_key)
+
+def summarize(items, k=3):
+    return DiverseTopK(k).extend(items).items()
+
+def merge_batches(a, b, k=3):
+    # 질의 묶음 단위 요약 리스트끼리 질의별로 합침
+    return [summarize(x + y, k) for x, y in zip(a, b)]
+
+def tree_reduce(comm, obj, merge, root=0):
+    # 이항 트리(binomial tree) 리덕션: log2(size) 단계, 단계마다 요약 1개만 주고받음
+    rank, size = comm.Get_rank(), comm.Get_size()
+    rel = (rank - root) % size
+    step = 1
+    while step < size:
+        if rel % (2 * step) == 0:
+            if rel + step < size:
+                obj = merge(obj, comm.recv(source=(rank + step) % size, tag=77))
+        else:
+            comm.send(obj, dest=(rank - step) % size, tag=77)
+            return None
+        step *= 2
+    return obj
+
+def pick_diverse(items, k=3):
+    # pick_top3와 같은 규칙: 처음 보는 죄명부터 k개, 모자라면 남은 상위 후보로 채움
+    ordered = sorted(items, key=_order_key)
+    final, seen = [], set()
+    for cand in ordered:
+        if len(final) >= k:
+            break
+        if cand[2] not in seen:
+            final.append(cand)
+            seen.add(cand[2])
+    if len(final) < k:
+        remaining = [c for c in ordered if c not in final]
+        final.extend(remaining[:k - len(final)])
+    return final
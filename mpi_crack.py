@@ -0,0 +1,129 @@
+from bruteforce_engine import mask_keyspace, search_all
+from bruteforce_checkpoint import Checkpoint, Remaining
+from bruteforce_job import (custom_charsets, prepare, auto_chunk, split_ranges, print_summary,
+                            build_parser, run)
+from hpc_backend import block_range
+
+# ==================================================================
+# 🔐 MPI SHA-256 무차별 대입 (마스크 / 문자 집합 공용 엔진)
+# mpi_bruteforce.py (6자리 숫자) / mpi_bruteforce_r.py (8자리 숫자)는 이 엔진에 마스크만 정해서 넘김
+# 옵션/목표 설정/결과 출력은 bruteforce_job.py (--exec pool이면 MPI 대신 pool_crack.py가 탐색)
+#   python mpi_crack.py --mask '?d?d?l?l?u?s' --targets hashes.txt
+#   python mpi_crack.py --mask '?1?1?1?1?1?1?1?1' -1 abc123 --length 4-8
+#   python mpi_crack.py --mask '?a?a?a?a?a?a' --checkpoint ckpt   (죽으면 같은 명령 + --resume)
+# ==================================================================
+
+def solve(args):
+    # 1. MPI 초기화 (mpi4py는 여기서 import -> --exec pool은 MPI 없이 실행)
+    from mpi4py import MPI
+    from bruteforce_mpi import GlobalStop, ChunkCounter, bcast_targets
+    comm = MPI.COMM_WORLD
+    rank = comm.Get_rank()
+    size = comm.Get_size()
+
+    space = mask_keyspace(args.mask, custom_charsets(args), args.length)
+    ckpt = Checkpoint(args.checkpoint, args.sync_every) if args.checkpoint else None
+
+    # 2. 문제 설정 (Rank 0에서만 목표 설정: 정답/목표 파일/체크포인트 재개/조회 테이블 -> bruteforce_job.prepare)
+    digests, todo, prev, n_all = None, None, [], 0
+    if rank == 0:
+        digests, todo, prev, n_all = prepare(args, space, ckpt, f"[Rank {rank}]")
+
+    todo = comm.bcast(todo, root=0)
+    if isinstance(todo, str):
+        if rank == 0: print(f"[Rank {rank}] ❌ 시작 실패: {todo}", flush=True)
+        return
+    remaining = Remaining(todo) # 남은 구간을 이어 붙인 가상 번호 공간 (처음 시작이면 전체 공간 그대로)
+
+    # ==========================================
+    # [배운 내용: Bcast] 1 -> N 통신
+    # Rank 0의 목표 해시(들)를 모든 프로세스에 복사 (정렬된 바이트 배열 하나로 Bcast -> 각자 집합으로)
+    # ==========================================
+    targets = bcast_targets(digests, comm)
+    n_targets = len(targets)
+
+    # 3. 시간 측정 시작 (MPI 표준 시간 함수 Wtime 사용)
+    # 모든 프로세스가 준비될 때까지 기다렸다가(Barrier) 시작하는 것이 더 정확함
+    comm.Barrier()
+    start_time = MPI.Wtime()
+
+    # ==========================================
+    # [배운 내용: 블록 분배 (Block Distribution)]
+    # 전체 공간을 N명이 공평하게 나누는 공식 (--schedule static)
+    # ==========================================
+    total_space = remaining.total
+
+    # 몫(count)과 나머지(remainder)로 자신의 Rank에 맞는 시작(start)과 끝(end) 인덱스 계산
+    start_idx, end_idx = block_range(total_space, rank, size)
+
+    # ==========================================
+    # [배운 내용: 루프 (Loop)]
+    # 할당받은 구역만 무차별 대입. 전역 번호 -> 후보는 혼합 진법 변환이라 어디서든 바로 시작
+    # 후보 생성/해시/비교는 고속 엔진(bruteforce_engine)이 담당
+    # (뒷자리 bytes 재사용 + 앞자리 해시 상태 copy() + digest 바이트 비교)
+    # ==========================================
+
+    # [전역 조기 종료] check_every개 후보마다 다른 코어가 찾았는지 비동기(Iallreduce)로 확인
+    # 모든 코어가 찾은 개수의 합이 목표 수가 되면 다 같이 멈춤 (0이면 끔 -> 각자 구역 끝까지)
+    stop = GlobalStop(comm, n_targets) if args.check_every > 0 and n_targets else None
+
+    # [동적 분배] 정해진 블록 대신 chunk개짜리 청크를 공유 카운터(RMA Fetch_and_op)에서 하나씩 받아감
+    # 빨리 끝낸 코어가 다음 청크를 가져가므로 바쁜 코어 하나 때문에 전체가 기다리지 않음
+    chunk = auto_chunk(args, space, total_space, size) # 0이면 자동
+    if not n_targets:
+        counter, ranges = None, [] # 테이블/이전 실행에서 전부 찾음 -> 탐색 없음 (모든 Rank가 같은 목표 수를 앎)
+    elif args.schedule == 'dynamic':
+        counter = ChunkCounter(total_space, chunk, comm)
+        ranges = iter(counter.next, None)
+    else:
+        counter = None
+        ranges = [(start_idx, end_idx)] # 정적 블록 (위에서 계산한 내 구역 하나)
+        if ckpt: # 체크포인트는 청크 단위로 남겨야 죽었을 때 잃는 양이 작음
+            ranges = split_ranges(start_idx, end_idx, chunk)
+
+    found = [] # (암호, 해시, 발견 시각) - 찾는 즉시 출력
+    if ckpt: ckpt.open(rank)
+
+    def report(i, digest):
+        found.append((space.candidate(i), digest, MPI.Wtime() - start_time))
+        if ckpt: ckpt.hit(i, digest)
+        print(f"!!! [Rank {rank}] 🔓 암호 발견: {found[-1][0]} (해시 {digest.hex()[:10]}...) !!!", flush=True)
+
+    my_chunks = 0
+    for va, vb in ranges:
+        my_chunks += 1
+        # 가상 번호 [va, vb) -> 실제 전역 번호 구간들 (재개 시 끝낸 구간을 건너뜀)
+        for a, b in remaining.real(va, vb):
+            search_all(space, a, b, targets, (lambda: stop.poll(len(found))) if stop else None,
+                       args.check_every or None, report)
+            if not targets or (stop and stop.stopped):
+                break
+            if ckpt: ckpt.done(a, b) # 끝까지 돈 구간만 기록 (중간에 멈춘 구간은 재개 때 다시)
+        if not targets or (stop and stop.stopped):
+            break
+    if stop:
+        stop.finish(len(found)) # 찾았다고 알리거나, 구역을 다 돌았으면 결론이 날 때까지 대기
+    if counter:
+        counter.free()
+    if ckpt:
+        ckpt.close()
+
+    # ==========================================
+    # [배운 내용: Gather] N -> 1 통신
+    # 각자가 찾은 결과(찾은 암호 목록, 청크 수)를 Rank 0으로 수집
+    # ==========================================
+    all_results = comm.gather((found, my_chunks), root=0)
+
+    # 4. 시간 측정 종료 (모든 프로세스가 Gather에 도달해야 끝남)
+    end_time = MPI.Wtime()
+
+    # 5. 최종 결과 확인 (Rank 0만 수행)
+    if rank == 0:
+        new_found = sorted((f for fs, _ in all_results for f in fs), key=lambda f: f[2])
+        all_found = prev + new_found
+        duration = end_time - start_time
+
+        print_summary(args, all_found, new_found, n_all, size, [n for _, n in all_results], duration)
+
+if __name__ == "__main__":
+    run(build_parser().parse_args())
@@ -0,0 +1,152 @@
+import os
+import json
+import time
+import argparse
+import numpy as np
+
+from bruteforce_engine import target_digest, load_targets, mask_keyspace
+from bruteforce_table import FORMAT, MANIFEST, KEY_BYTES, ALGORITHMS, hash_range, PinTable
+from bruteforce_job import custom_charsets, length_range
+from hpc_backend import block_range
+
+# ==================================================================
+# 📚 해시 조회 테이블 만들기 / 찾기
+#   mpirun -np 12 python mpi_pin_table.py build --out pin8              (8자리 숫자, 한 번만)
+#   python mpi_pin_table.py lookup --table pin8 --hash <sha256>         (마이크로초)
+#   python mpi_pin_table.py lookup --table pin8 --targets hashes.txt
+#   mpirun -np 12 python mpi_bruteforce_r.py --table pin8               (테이블로 먼저 찾고 없을 때만 무차별 대입)
+# mpi4py는 build 경로에서만 import (lookup은 MPI 없는 서버에서도 실행됨)
+# ==================================================================
+
+# ==================================================================
+# 🏗️ 병렬 생성 (MPI)
+# 1) 블록 분배: 각 코어가 자기 구역 후보를 해시 -> (키, 번호)
+# 2) [Alltoallv] 키 범위로 재분배: 해시 값은 고르게 퍼져 있으므로 키 공간을 코어 수만큼 등분,
+#    k번째 구간의 키는 Rank k가 받음 (코어마다 보낼 개수가 다르므로 Alltoall이 아닌 Alltoallv)
+# 3) 각 코어가 받은 구간만 정렬 -> Rank 순서대로 이으면 전체가 정렬됨
+# 4) [Exscan] 앞 코어들 개수 합 = 내 쓰기 위치 -> [MPI-IO] 모든 코어가 한 파일의 자기 위치에 동시에 씀
+# ==================================================================
+def _exchange(data, order, send_counts, recv_counts, mpi_type, comm):
+    send_displs = np.concatenate([[0], np.cumsum(send_counts)[:-1]]).astype(int)
+    recv_displs = np.concatenate([[0], np.cumsum(recv_counts)[:-1]]).astype(int)
+    out = np.empty(int(sum(recv_counts)), dtype=data.dtype)
+    comm.Alltoallv([data[order], (send_counts, send_displs), mpi_type],
+                   [out, (recv_counts, recv_displs), mpi_type])
+    return out
+
+def _write_column(path, data, offset, comm):
+    from mpi4py import MPI
+    fh = MPI.File.Open(comm, path, MPI.MODE_WRONLY | MPI.MODE_CREATE)
+    fh.Set_size(0) # 이전 테이블 잘라냄 (집단 호출)
+    fh.Write_at_all(offset * data.itemsize, data)
+    fh.Close()
+
+def build_table(out_dir, mask, custom=None, lengths=None, algo='sha256', comm=None):
+    from mpi4py import MPI
+    if comm is None: comm = MPI.COMM_WORLD
+    rank, size = comm.Get_rank(), comm.Get_size()
+    space = mask_keyspace(mask, custom, lengths)
+    total = space.total
+    if rank == 0:
+        os.makedirs(out_dir, exist_ok=True)
+        if os.path.exists(os.path.join(out_dir, MANIFEST)): # 다 쓰기 전에는 manifest 없음 = 미완성 테이블
+            os.remove(os.path.join(out_dir, MANIFEST))
+    comm.Barrier()
+
+    # 1) 블록 분배 (몫 + 나머지)
+    start, end = block_range(total, rank, size)
+    keys, index = hash_range(space, start, end, algo)
+
+    # 2) 키 범위로 재분배
+    bounds = np.array([(2**64 * r) // size for r in range(1, size)], dtype=np.uint64)
+    owner = np.searchsorted(bounds, keys, side='right')
+    order = np.argsort(owner, kind='stable') # 받을 코어 순서로 줄 세움
+    send_counts = np.bincount(owner, minlength=size).astype(int)
+    recv_counts = np.array(comm.alltoall(send_counts.tolist()), dtype=int)
+    keys = _exchange(keys, order, send_counts, recv_counts, MPI.UINT64_T, comm)
+    index = _exchange(index, order, send_counts, recv_counts,
+                      MPI.UINT32_T if index.dtype == np.uint32 else MPI.UINT64_T, comm)
+
+    # 3) 내 구간 정렬
+    order = np.argsort(keys, kind='stable')
+    keys, index = keys[order], index[order]
+
+    # 4) 쓰기 위치 계산 후 MPI-IO로 한 파일에 동시 쓰기
+    offset = comm.exscan(len(keys)) or 0 # Rank 0은 None
+    _write_column(os.path.join(out_dir, 'keys.u64'), keys, offset, comm)
+    _write_column(os.path.join(out_dir, f"index.{'u32' if index.dtype == np.uint32 else 'u64'}"), index, offset, comm)
+
+    if rank == 0:
+        manifest = {'format': FORMAT, 'mask': mask, 'charsets': custom or {},
+                    'length': list(lengths) if lengths else None, 'algorithm': algo, 'total': total,
+                    'key_bytes': KEY_BYTES, 'index': np.dtype(index.dtype).name}
+        tmp = os.path.join(out_dir, MANIFEST + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, os.path.join(out_dir, MANIFEST))
+    comm.Barrier()
+    return total
+
+def build(args):
+    from mpi4py import MPI
+    comm = MPI.COMM_WORLD
+    custom = custom_charsets(args)
+    comm.Barrier()
+    start_time = MPI.Wtime()
+    total = build_table(args.out, args.mask, custom, args.length, args.algo, comm)
+    duration = MPI.Wtime() - start_time
+    if comm.Get_rank() == 0:
+        print("\n" + "="*50, flush=True)
+        print(f" 📚 테이블 생성 완료: {args.out} ({args.mask}, {args.algo})", flush=True)
+        print(f" 🔢 후보 수: {total:,}개", flush=True)
+        print(f" 💻 참여 프로세스 수: {comm.Get_size()}개", flush=True)
+        print(f" ⏱️ 총 소요 시간: {duration:.4f}초 ({total / duration:,.0f} 해시/초)", flush=True)
+        print("="*50 + "\n", flush=True)
+
+def lookup(args):
+    t0 = time.perf_counter()
+    table = PinTable(args.table)
+    t1 = time.perf_counter()
+    digest_size = ALGORITHMS[table.algo]().digest_size # 테이블 알고리즘의 digest 길이 (sha256 32, md5 16 ...)
+    if args.targets:
+        digests = load_targets(args.targets, digest_size, table.algo)
+    elif args.hash:
+        digests = [target_digest(args.hash)]
+        if len(digests[0]) != digest_size:
+            raise SystemExit(f"{table.algo} 해시(16진수 {digest_size * 2}자)가 아닙니다: {args.hash[:20]}")
+    else:
+        digests = [ALGORITHMS[table.algo](args.secret.encode()).digest()] # 시연용: 정답 -> 해시 -> 테이블로 역추적
+    t2 = time.perf_counter()
+    hits = table.lookup_many(digests)
+    t3 = time.perf_counter()
+
+    print("\n" + "="*50)
+    for d in digests[:20]:
+        print(f"   {d.hex()[:16]}... -> {hits.get(d, '(없음)')}")
+    if len(digests) > 20: print(f"   ... 외 {len(digests) - 20}개")
+    print(f" ✅ 찾은 해시: {len(hits)}/{len(digests)}개")
+    print(f" 📂 테이블 열기: {(t1 - t0) * 1e3:.2f}ms (memmap, 후보 {len(table.keys):,}개)")
+    per_hash = f" (해시당 {(t3 - t2) * 1e6 / len(digests):.1f}µs)" if digests else "" # 빈 목표 파일이면 생략
+    print(f" ⏱️ 조회 시간: {(t3 - t2) * 1e6:.1f}µs{per_hash}")
+    print("="*50 + "\n")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="해시 -> 후보 조회 테이블 (MPI 병렬 생성 + memmap 이진 탐색)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    b = sub.add_parser('build', help="테이블 생성 (mpirun으로 병렬)")
+    b.add_argument('--out', required=True, help="테이블 디렉터리")
+    b.add_argument('--mask', default='?d' * 8, help="탐색 공간 마스크 (기본: 8자리 숫자)")
+    for k in range(1, 5):
+        b.add_argument(f'-{k}', f'--charset{k}', help=f"마스크의 ?{k} 자리에 쓸 문자들")
+    b.add_argument('--length', type=length_range, help="길이 범위 (예: 4-8)")
+    b.add_argument('--algo', choices=list(ALGORITHMS), default='sha256', help="해시 알고리즘")
+
+    q = sub.add_parser('lookup', help="목표 해시 조회")
+    q.add_argument('--table', required=True, help="테이블 디렉터리")
+    q.add_argument('--hash', help="목표 해시 (16진수)")
+    q.add_argument('--targets', help="목표 해시 파일 (한 줄에 하나)")
+    q.add_argument('--secret', default='72943105', help="시연용 정답 (--hash/--targets가 없을 때)")
+
+    args = parser.parse_args()
+    build(args) if args.command == 'build' else lookup(args)
@@ -0,0 +1,138 @@
+import os
+import time
+import numpy as np
+from multiprocessing import Event, Value
+from concurrent.futures import wait, FIRST_COMPLETED
+
+from bruteforce_engine import mask_keyspace, search_all
+from bruteforce_checkpoint import Checkpoint, Remaining
+from bruteforce_job import (custom_charsets, prepare, auto_chunk, split_ranges, print_summary,
+                            build_parser, run)
+from hpc_backend import PoolBackend, block_range, worker_rank, shared_arrays, worker_extras, worker_cache
+
+# ==================================================================
+# 🏊 프로세스 풀 무차별 대입 (--exec pool): mpirun/MPI 없이 한 서버의 코어를 전부 사용
+#   python mpi_bruteforce_r.py --exec pool --workers 8
+#   python mpi_crack.py --mask '?a?a?a?a?a' --exec pool --checkpoint ckpt  (MPI로 시작한 체크포인트도 이어서 가능)
+# mpi_crack.py와 같은 분할/취합:
+#   - 목표 digest 묶음은 공유 메모리 한 벌 (Bcast 대신) -> 작업자마다 한 번만 집합으로 만들어 재사용
+#   - dynamic: 부모가 청크 번호를 하나씩 나눠줌 (RMA 공유 카운터 대신), 끝낸 작업자가 다음 청크를 받음
+#   - static : 작업자 k = block_range(남은 공간, k, N) 구역 (Rank k와 같은 구역)
+#   - 조기 종료: 찾은 개수를 공유 Value에 더하고 목표 수가 되면 Event를 켬 (Iallreduce 대신)
+#   - 체크포인트는 작업자마다 rank-k.log (MPI 실행과 같은 포맷)
+# ==================================================================
+
+# ---------- 작업자 프로세스 쪽 ----------
+def _state():
+    cache = worker_cache()
+    if 'space' not in cache:
+        ex = worker_extras()
+        cache['space'] = mask_keyspace(ex['mask'], ex['custom'], ex['length'])
+        cache['targets'] = {row.tobytes() for row in shared_arrays()['targets']} # 공유 배열 한 줄 = digest 하나
+        cache['ckpt'] = None
+        if ex['checkpoint']:
+            cache['ckpt'] = Checkpoint(ex['checkpoint'], ex['sync_every'])
+            cache['ckpt'].open(worker_rank())
+    return cache
+
+def _scan(pieces, check_every, start_time):
+    # 실제 전역 번호 구간들 [(a, b)] 탐색 -> 찾은 것 [(번호, digest, 발견 시각)]
+    state, ex = _state(), worker_extras()
+    space, targets, ckpt = state['space'], state['targets'], state['ckpt']
+    stop, found, need = ex['stop'], ex['found'], ex['need']
+    hits = []
+
+    def report(i, digest):
+        hits.append((i, digest, time.perf_counter() - start_time))
+        if ckpt: ckpt.hit(i, digest)
+        print(f"!!! [Worker {worker_rank()}] 🔓 암호 발견: {space.candidate(i)} (해시 {digest.hex()[:10]}...) !!!", flush=True)
+        with found.get_lock():
+            found.value += 1
+            if need and found.value >= need: stop.set() # 전체 목표를 다 찾았으면 모두 멈춤
+
+    for a, b in pieces:
+        search_all(space, a, b, targets, stop.is_set if need else None, check_every or None, report)
+        if not targets or stop.is_set():
+            break
+        if ckpt: ckpt.done(a, b) # 끝까지 돈 구간만 기록
+    return hits
+
+def _close():
+    ckpt = worker_cache().get('ckpt')
+    if ckpt: ckpt.close()
+
+# ---------- 부모 프로세스 (Rank 0 역할) ----------
+def solve(args):
+    space = mask_keyspace(args.mask, custom_charsets(args), args.length)
+    ckpt = Checkpoint(args.checkpoint, args.sync_every) if args.checkpoint else None
+
+    # 1. 목표 설정 (MPI의 Rank 0과 같은 코드)
+    digests, todo, prev, n_all = prepare(args, space, ckpt, "[Pool]")
+    if isinstance(todo, str):
+        print(f"[Pool] ❌ 시작 실패: {todo}", flush=True)
+        return
+    remaining = Remaining(todo)
+
+    # 2. 작업자 기동: 목표 digest 묶음을 공유 메모리에 올리고 조기 종료용 Event/Value를 같이 넘김
+    t0 = time.perf_counter()
+    stop, found = Event(), Value('q', 0)
+    extras = {'mask': args.mask, 'custom': custom_charsets(args), 'length': args.length,
+              'checkpoint': args.checkpoint, 'sync_every': args.sync_every,
+              'stop': stop, 'found': found, 'need': len(digests) if args.check_every > 0 else None}
+    size = args.workers or os.cpu_count()
+    new_found, chunk_counts = [], [0] * size
+    if digests:
+        targets = np.frombuffer(b''.join(sorted(digests)), dtype=np.uint8).reshape(len(digests), -1)
+        backend = PoolBackend(size, {'targets': targets}, extras)
+        startup_time = time.perf_counter() - t0
+        print(f"[Pool] 🚀 작업자 {size}개 기동: {startup_time:.4f}초 (목표 {len(digests)}개, 공유 메모리"
+              f" {backend.shared.nbytes:,}바이트)", flush=True)
+
+        # 3. 작업 분배: 작업자마다 한 번에 청크 하나씩 (끝나면 다음 청크)
+        total_space = remaining.total
+        chunk = auto_chunk(args, space, total_space, size)
+        if args.schedule == 'dynamic':
+            shared_queue = iter(split_ranges(0, total_space, chunk))
+            queues = [shared_queue] * size # 같은 반복자 -> 먼저 끝난 작업자가 다음 청크를 가져감
+        else:
+            queues = []
+            for k in range(size):
+                start_idx, end_idx = block_range(total_space, k, size)
+                ranges = split_ranges(start_idx, end_idx, chunk) if ckpt else [(start_idx, end_idx)]
+                queues.append(iter(ranges))
+
+        start_time = time.perf_counter()
+        running = {}
+
+        def dispatch(k):
+            if stop.is_set(): return
+            va_vb = next(queues[k], None)
+            if va_vb is None: return
+            chunk_counts[k] += 1
+            # 가상 번호 [va, vb) -> 실제 전역 번호 구간들 (재개 시 끝낸 구간을 건너뜀)
+            pieces = list(remaining.real(*va_vb))
+            running[backend.submit(k, _scan, pieces, args.check_every, start_time)] = k
+
+        try:
+            for k in range(size): dispatch(k)
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    k = running.pop(future)
+                    new_found += [(space.candidate(i), d, t) for i, d, t in future.result()]
+                    dispatch(k)
+            end_time = time.perf_counter()
+            backend.gather(_close)
+        finally:
+            backend.close()
+    else:
+        start_time = end_time = time.perf_counter() # 테이블/이전 실행에서 전부 찾음 -> 탐색 없음
+
+    # 4. 최종 결과 (MPI와 같은 출력)
+    new_found.sort(key=lambda f: f[2])
+    print_summary(args, prev + new_found, new_found, n_all, size, chunk_counts, end_time - start_time, "pool 작업자")
+
+if __name__ == "__main__":
+    args = build_parser("프로세스 풀 SHA-256 마스크 무차별 대입").parse_args()
+    args.exec = 'pool'
+    run(args)
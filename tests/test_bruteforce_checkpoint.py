@@ -0,0 +1,60 @@
+import hashlib
+
+import pytest
+
+from bruteforce_checkpoint import merge_ranges, gaps, Remaining, read_log, Checkpoint
+
+def test_merge_ranges_joins_overlapping_and_touching():
+    assert merge_ranges([(5, 8), (0, 3), (3, 4), (7, 10), (12, 13)]) == [(0, 4), (5, 10), (12, 13)]
+    assert merge_ranges([]) == []
+    assert merge_ranges([(0, 10), (2, 3)]) == [(0, 10)]
+
+def test_gaps_are_complement_of_done():
+    assert gaps([(0, 4), (5, 10)], 12) == [(4, 5), (10, 12)]
+    assert gaps([], 7) == [(0, 7)]
+    assert gaps([(0, 7)], 7) == []
+    assert gaps([(2, 3)], 5) == [(0, 2), (3, 5)]
+
+def test_remaining_maps_virtual_to_real_ranges():
+    rem = Remaining([(4, 5), (10, 12), (20, 25)])
+    assert rem.total == 8
+    assert list(rem.real(0, rem.total)) == [(4, 5), (10, 12), (20, 25)]
+    assert list(rem.real(1, 2)) == [(10, 11)]
+    assert list(rem.real(2, 5)) == [(11, 12), (20, 22)]
+    assert list(rem.real(8, 8)) == []
+
+@pytest.mark.parametrize('chunk', [1, 3, 5])
+def test_remaining_chunks_cover_every_gap_once(chunk):
+    done = merge_ranges([(3, 9), (15, 16), (30, 40)])
+    todo = gaps(done, 50)
+    rem = Remaining(todo)
+    real = [i for a in range(0, rem.total, chunk)
+            for x, y in rem.real(a, min(a + chunk, rem.total)) for i in range(x, y)]
+    assert real == [i for a, b in todo for i in range(a, b)]
+
+def test_checkpoint_resume_merges_rank_logs(tmp_path):
+    digest = hashlib.sha256(b'0042').digest()
+    meta = {'mask': '?d?d?d?d', 'charsets': {}, 'length': None, 'total': 10_000}
+    ckpt = Checkpoint(str(tmp_path))
+    ckpt.start({**meta, 'targets': [digest.hex()]})
+    for rank, ranges in enumerate([[(0, 100), (300, 400)], [(100, 200)]]):
+        w = Checkpoint(str(tmp_path))
+        w.open(rank)
+        for a, b in ranges: w.done(a, b)
+        if rank == 0: w.hit(42, digest)
+        w.close()
+    with open(tmp_path / 'rank-1.log', 'a', encoding='utf-8') as f:
+        f.write('done 200') # 죽을 때 잘린 마지막 줄은 무시
+
+    saved, done, hits = Checkpoint(str(tmp_path)).resume(meta)
+    assert saved['targets'] == [digest.hex()]
+    assert done == [(0, 200), (300, 400)]
+    assert hits == {42: digest}
+    assert sorted(p.name for p in tmp_path.glob('*.log')) == ['base.log']
+    assert read_log(tmp_path / 'base.log') == (done, hits)
+
+def test_checkpoint_resume_rejects_other_space(tmp_path):
+    ckpt = Checkpoint(str(tmp_path))
+    ckpt.start({'mask': '?d?d', 'targets': []})
+    with pytest.raises(ValueError):
+        ckpt.resume({'mask': '?d?d?d'})
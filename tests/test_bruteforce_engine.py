@@ -0,0 +1,92 @@
+import hashlib
+import itertools
+
+import pytest
+
+from bruteforce_engine import parse_mask, MaskSpace, DigitSpace, KeySpace, mask_keyspace, search_all, load_targets
+
+def test_digit_space_is_zero_padded_counter():
+    space = DigitSpace(4, suffix_limit=100)
+    for i in [0, 7, 99, 100, 4321, 9999]:
+        assert space.candidate(i) == f"{i:04d}"
+
+def test_blocks_cover_range_without_crossing_prefix():
+    space = DigitSpace(4, suffix_limit=100)
+    covered = []
+    for p, lo, hi in space.blocks(250, 530, step=40):
+        assert 0 <= lo < hi <= space.block and hi - lo <= 40
+        covered.extend(p * space.block + j for j in range(lo, hi))
+    assert covered == list(range(250, 530))
+
+def test_search_all_finds_every_target_once():
+    space = DigitSpace(3, suffix_limit=10)
+    secrets = ['000', '042', '500', '999']
+    targets = {hashlib.sha256(s.encode()).digest() for s in secrets}
+    found = []
+    hits = search_all(space, 0, space.total, set(targets), check_every=37,
+                      on_hit=lambda i, d: found.append((space.candidate(i), d)))
+    assert sorted(space.candidate(i) for i in hits) == secrets
+    assert {d for _, d in found} == targets
+
+def test_search_all_stops_when_asked():
+    space = DigitSpace(4, suffix_limit=100)
+    target = {hashlib.sha256(b'9999').digest()}
+    calls = []
+    def stop():
+        calls.append(1)
+        return True
+    assert search_all(space, 0, space.total, target, stop, check_every=100) == []
+    assert len(calls) == 1
+
+def test_load_targets_dedups_and_checks_length(tmp_path):
+    h = hashlib.sha256(b'1234').hexdigest()
+    path = tmp_path / 'targets.txt'
+    path.write_text(f"# 목표\n{h}\n\n{h}  # 중복\n", encoding='utf-8')
+    assert load_targets(path) == [bytes.fromhex(h)]
+    path.write_text(hashlib.md5(b'1234').hexdigest() + "\n", encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_targets(path)
+    assert load_targets(path, 16, 'md5') == [hashlib.md5(b'1234').digest()]
+
+# 혼합 진법 전역 번호 <-> 후보: 전부 열거한 순서(마지막 자리가 가장 빨리 바뀜)와 같아야 함
+
+def enumerate_mask(positions):
+    return [''.join(p) for p in itertools.product(*positions)]
+
+@pytest.mark.parametrize('suffix_limit', [1, 3, 10_000]) # 앞자리만 / 섞임 / 뒷자리만
+def test_mask_space_matches_product_order(suffix_limit):
+    positions = parse_mask('?1x?d?1', {'1': 'ab'})
+    space = MaskSpace(positions, suffix_limit)
+    expected = enumerate_mask(positions)
+    assert space.total == len(expected) == 2 * 1 * 10 * 2
+    assert [space.candidate(i) for i in range(space.total)] == expected
+
+def test_parse_mask_literals_and_dedup():
+    assert parse_mask('a??b') == [['a'], ['?'], ['b']]
+    assert parse_mask('?1', {'1': 'aab'}) == [['a', 'b']]
+    with pytest.raises(ValueError):
+        parse_mask('?z')
+
+def test_key_space_concatenates_lengths_shortest_first():
+    space = mask_keyspace('?d?h?d', lengths=(1, 3))
+    assert isinstance(space, KeySpace)
+    expected = (enumerate_mask(parse_mask('?d')) + enumerate_mask(parse_mask('?d?h'))
+                + enumerate_mask(parse_mask('?d?h?d')))
+    assert space.total == len(expected) == 10 + 160 + 1600
+    assert [space.candidate(i) for i in range(space.total)] == expected
+
+def test_key_space_pieces_split_at_length_boundaries():
+    space = mask_keyspace('?d?d?d', lengths=(1, 3))
+    pieces = [(sub.width, a, b, off) for sub, a, b, off in space.pieces(5, 120)]
+    assert pieces == [(1, 5, 10, 0), (2, 0, 100, 10), (3, 0, 10, 110)]
+
+def test_mask_keyspace_rejects_bad_lengths():
+    with pytest.raises(ValueError):
+        mask_keyspace('?d?d', lengths=(1, 3))
+
+def test_search_all_over_mixed_lengths():
+    space = mask_keyspace('?l?d?d', lengths=(2, 3))
+    secrets = ['a0', 'z9', 'q05', 'b00']
+    targets = {hashlib.sha256(s.encode()).digest() for s in secrets}
+    hits = search_all(space, 0, space.total, set(targets), check_every=37)
+    assert sorted(space.candidate(i) for i in hits) == sorted(secrets)
@@ -0,0 +1,55 @@
+import hashlib
+
+import numpy as np
+import pytest
+
+MPI = pytest.importorskip('mpi4py.MPI')
+
+from bruteforce_engine import mask_keyspace
+from bruteforce_table import PinTable, ALGORITHMS, digest_keys
+from mpi_pin_table import build_table
+
+# 테이블 생성은 MPI 집단 호출이지만 COMM_SELF(프로세스 1개)로도 같은 경로를 탐
+
+@pytest.fixture(scope='module')
+def table(tmp_path_factory):
+    path = tmp_path_factory.mktemp('pin3')
+    total = build_table(str(path), '?d?d?d', comm=MPI.COMM_SELF)
+    assert total == 1000
+    return PinTable(str(path))
+
+def test_table_keys_are_sorted(table):
+    keys = np.asarray(table.keys)
+    assert len(keys) == 1000 and np.all(keys[1:] >= keys[:-1])
+    assert sorted(np.asarray(table.index).tolist()) == list(range(1000))
+
+def test_lookup_finds_every_candidate(table):
+    pins = [f"{i:03d}" for i in range(1000)]
+    digests = [hashlib.sha256(p.encode()).digest() for p in pins]
+    assert table.lookup_many(digests) == dict(zip(digests, pins))
+    assert table.lookup(hashlib.sha256(b'042').digest()) == '042'
+
+def test_lookup_skips_unknown_digests(table):
+    missing = hashlib.sha256(b'1000').digest()
+    assert table.lookup(missing) is None
+    assert table.lookup_many([]) == {}
+
+def test_matches_checks_space_and_algorithm(table):
+    assert table.matches('?d?d?d')
+    assert not table.matches('?d?d?d?d')
+    assert not table.matches('?d?d?d', algo='md5')
+
+@pytest.mark.parametrize('algo', ['md5', 'sha1', 'sha512'])
+def test_other_algorithms_and_length_ranges(tmp_path, algo):
+    build_table(str(tmp_path), '?1?d', {'1': 'ab'}, (1, 2), algo, MPI.COMM_SELF)
+    t = PinTable(str(tmp_path))
+    space = mask_keyspace('?1?d', {'1': 'ab'}, (1, 2))
+    pins = [space.candidate(i) for i in range(space.total)]
+    digests = [ALGORITHMS[algo](p.encode()).digest() for p in pins]
+    assert t.algo == algo and t.matches('?1?d', {'1': 'ab'}, (1, 2), algo)
+    assert t.lookup_many(digests) == dict(zip(digests, pins))
+
+def test_digest_keys_keep_byte_order():
+    digests = sorted(hashlib.sha256(str(i).encode()).digest() for i in range(50))
+    keys = digest_keys(digests)
+    assert np.all(keys[1:] >= keys[:-1])
@@ -0,0 +1,65 @@
+import random
+
+import numpy as np
+import pytest
+
+from generate_all_data import generate_full_case, categories
+from legal_knn import encode_sets, encode_matrix, RunningNearest
+from legal_minhash import MinHashLSH, ApproxNearest, bands_for_threshold
+from legal_text import get_hard_mode_vector
+
+# MinHash 해시는 토큰 문자열에서 만들므로 vocab 순서(= 코어마다 자기 몫으로 만든 vocab)와 무관해야 함
+
+def encode(texts, vocab):
+    return encode_sets(texts, get_hard_mode_vector, vocab)
+
+def test_bands_for_threshold_picks_closest_divisor():
+    assert bands_for_threshold(128, 0.7) == 16 # 16띠 x 8행 -> 문턱 0.71
+    assert bands_for_threshold(128, 0.15) == 64
+
+def test_signatures_ignore_vocab_order():
+    rng = random.Random(0)
+    words = [f"단어{i}" for i in range(300)]
+    sets = [rng.sample(words, rng.randint(0, 40)) for _ in range(50)]
+    sigs = []
+    for order in [sorted(words), rng.sample(words, len(words))]:
+        vocab = {w: i for i, w in enumerate(order)}
+        m = encode_matrix([frozenset(vocab[w] for w in s) for s in sets], len(vocab))
+        lsh = MinHashLSH(64, 16)
+        sigs.append(lsh.signatures(m, lsh.columns(order)))
+    assert np.array_equal(sigs[0], sigs[1])
+
+@pytest.fixture(scope='module')
+def cases():
+    rng = random.Random(5)
+    cats = [categories[i % 10] for i in range(360)]
+    return [generate_full_case(cat, f"CASE-{i}", rng) for i, cat in enumerate(cats)]
+
+def test_approx_nearest_same_for_any_rank_split(cases):
+    # 학습기처럼 코어마다 자기 테스트 몫을 먼저 인코딩해서 vocab을 만들고 학습 판례를 단계별로 접어 넣음
+    train, test = cases[:300], cases[300:]
+    def run(chunk):
+        test_vecs, vocab = encode(chunk, None)
+        blocks = []
+        for a, b in [(0, 20), (20, 120), (120, 300)]:
+            vecs, vocab = encode(train[a:b], vocab)
+            blocks.append(vecs)
+        nearest = ApproxNearest(encode_matrix(test_vecs, len(vocab)), list(vocab))
+        for vecs in blocks: nearest.fold(encode_matrix(vecs, len(vocab)))
+        return nearest.best, nearest.max_sim
+    for n_ranks in [2, 3, 4]:
+        parts = [run(chunk) for chunk in np.array_split(np.array(test, dtype=object), n_ranks)]
+        whole = run(test)
+        assert np.array_equal(np.concatenate([b for b, _ in parts]), whole[0])
+        assert np.allclose(np.concatenate([s for _, s in parts]), whole[1])
+
+def test_approx_nearest_close_to_exact(cases):
+    train, test = cases[:300], cases[300:]
+    train_vecs, vocab = encode(train, None)
+    test_vecs, vocab = encode(test, vocab)
+    train_m, test_m = encode_matrix(train_vecs, len(vocab)), encode_matrix(test_vecs, len(vocab))
+    exact, approx = RunningNearest(test_m), ApproxNearest(test_m, list(vocab))
+    exact.fold(train_m)
+    approx.fold(train_m)
+    assert np.all(approx.max_sim <= exact.max_sim + 1e-9) # 후보 중 최고이므로 정확한 최근접을 넘을 수 없음
+    assert np.mean(np.isclose(approx.max_sim, exact.max_sim)) >= 0.9
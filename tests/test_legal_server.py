@@ -0,0 +1,22 @@
+import builtins
+import os
+
+from legal_server import DirSource
+
+def test_dir_source_skips_files_removed_after_glob(tmp_path, monkeypatch):
+    src = DirSource(str(tmp_path), poll=0.01)
+    for name in ['a', 'b', 'c']:
+        (tmp_path / f"{name}.query").write_text(name, encoding='utf-8')
+    real_open = builtins.open
+    def racing_open(path, *args, **kwargs):
+        # 다른 쪽이 b.query를 먼저 가져간 상황
+        if str(path).endswith('b.query'): os.remove(path)
+        return real_open(path, *args, **kwargs)
+    monkeypatch.setattr(builtins, 'open', racing_open)
+    batch = src.next_batch(8)
+    monkeypatch.undo()
+    assert sorted(text for _, text in batch) == ['a', 'c']
+    assert all(report.endswith('.report') for report, _ in batch)
+    assert not list(tmp_path.glob('*.query'))
+    (tmp_path / 'STOP').touch()
+    assert src.next_batch(8) is None
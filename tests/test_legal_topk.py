@@ -0,0 +1,97 @@
+import queue
+import random
+import threading
+
+import pytest
+
+from legal_topk import DiverseTopK, summarize, merge_batches, tree_reduce, pick_diverse
+
+CATEGORIES = ['사기', '절도', '마약', '횡령', '폭행']
+
+def random_items(rng, n, offset=0):
+    # 점수 동점이 자주 나오게 소수 둘째 자리까지만
+    return [(round(rng.random(), 2), offset + i, rng.choice(CATEGORIES)) for i in range(n)]
+
+def test_summary_keeps_what_pick_diverse_needs():
+    rng = random.Random(0)
+    for _ in range(200):
+        items = random_items(rng, rng.randint(0, 40))
+        assert pick_diverse(summarize(items)) == pick_diverse(items)
+
+def test_summary_size_and_order():
+    rng = random.Random(1)
+    items = random_items(rng, 100)
+    out = DiverseTopK(3).extend(items).items()
+    assert len(out) <= 6
+    assert out == sorted(out, key=lambda t: (-t[0], t[1]))
+    assert out[:3] == sorted(items, key=lambda t: (-t[0], t[1]))[:3]
+
+def test_ties_prefer_smaller_case_id():
+    items = [(0.5, 7, '사기'), (0.5, 3, '사기'), (0.5, 5, '절도')]
+    assert pick_diverse(summarize(items)) == [(0.5, 3, '사기'), (0.5, 5, '절도'), (0.5, 7, '사기')]
+
+def test_merging_summaries_equals_summary_of_all():
+    rng = random.Random(2)
+    parts = [random_items(rng, rng.randint(0, 30), 100 * k) for k in range(6)]
+    whole = summarize([x for p in parts for x in p])
+    merged = summarize([])
+    for p in parts:
+        merged = summarize(merged + summarize(p))
+    assert pick_diverse(merged) == pick_diverse(whole)
+    batches = [[summarize(p)] for p in parts]
+    acc = batches[0]
+    for b in batches[1:]:
+        acc = merge_batches(acc, b)
+    assert pick_diverse(acc[0]) == pick_diverse(whole)
+
+# ------------------------------------------------------------------
+# tree_reduce: 스레드마다 랭크 하나인 작은 통신자로 send/recv 경로를 그대로 돌려봄
+# ------------------------------------------------------------------
+class ThreadComm:
+    def __init__(self, rank, size, boxes):
+        self.rank, self.size, self.boxes = rank, size, boxes
+
+    def Get_rank(self):
+        return self.rank
+
+    def Get_size(self):
+        return self.size
+
+    def send(self, obj, dest, tag=0):
+        self.boxes[(self.rank, dest, tag)].put(obj)
+
+    def recv(self, source, tag=0):
+        return self.boxes[(source, self.rank, tag)].get(timeout=5)
+
+def run_tree_reduce(size, root, objs, merge):
+    boxes = {(s, d, t): queue.Queue() for s in range(size) for d in range(size) for t in [77]}
+    results = [None] * size
+    def work(rank):
+        results[rank] = tree_reduce(ThreadComm(rank, size, boxes), objs[rank], merge, root)
+    threads = [threading.Thread(target=work, args=(r,)) for r in range(size)]
+    for t in threads: t.start()
+    for t in threads: t.join(timeout=10)
+    assert all(b.empty() for b in boxes.values()) # 보낸 것은 전부 받음
+    return results
+
+@pytest.mark.parametrize('size', [1, 2, 3, 5, 8])
+@pytest.mark.parametrize('root', [0, 1])
+def test_tree_reduce_collects_every_rank(size, root):
+    root %= size
+    results = run_tree_reduce(size, root, [[r] for r in range(size)], lambda a, b: a + b)
+    assert sorted(results[root]) == list(range(size))
+    assert all(r is None for k, r in enumerate(results) if k != root)
+
+def test_tree_reduce_of_summaries_matches_gather():
+    rng = random.Random(3)
+    size = 6
+    shards = [[random_items(rng, 25, 1000 * r + 100 * q) for q in range(4)] for r in range(size)]
+    local = [[summarize(items) for items in shard] for shard in shards]
+    results = run_tree_reduce(size, 0, local, merge_batches)
+    for q in range(4):
+        everything = [x for shard in shards for x in shard[q]]
+        assert pick_diverse(results[0][q]) == pick_diverse(everything)
+
+def test_tree_reduce_with_mpi_self():
+    MPI = pytest.importorskip('mpi4py.MPI')
+    assert tree_reduce(MPI.COMM_SELF, [1, 2], lambda a, b: a + b) == [1, 2]
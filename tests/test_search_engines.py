@@ -0,0 +1,110 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import legal_index
+from generate_all_data import generate_full_case, categories
+from legal_search import ScanEngine, IndexEngine, analyze_query, user_input
+from legal_sparse import SparseScorer
+from legal_minhash import LshScorer
+from legal_topk import merge_batches, pick_diverse
+
+# 같은 질의에 대해 엔진(scan / index / sparse)이 같은 상위 판례를 돌려주는지
+# 0.99를 넘는 점수의 랜덤 지터(legal_text: random, legal_sparse: np.random)는 꺼서 비교
+
+N_CASES = 120
+
+@pytest.fixture(scope='module')
+def corpus(tmp_path_factory):
+    rng = random.Random(7)
+    rows = [{'Category': categories[i % 10], 'Facts': generate_full_case(categories[i % 10], f"CASE-{i}", rng)}
+            for i in range(N_CASES)]
+    path = tmp_path_factory.mktemp('corpus')
+    csv_path, index_path = str(path / 'cases.csv'), str(path / 'index.npz')
+    pd.DataFrame(rows).to_csv(csv_path, index=False, encoding='utf-8-sig')
+    legal_index.build_index(csv_path, index_path)
+    assert legal_index.is_fresh(csv_path, index_path)
+    return rows, legal_index.load_index(index_path)
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(random, 'random', lambda: 0.0)
+    monkeypatch.setattr(np.random, 'random', lambda n: np.zeros(n))
+
+@pytest.fixture(scope='module')
+def queries(corpus):
+    rows, _ = corpus
+    rng = random.Random(11)
+    texts = [user_input, "보이스피싱 현금 수거책 피해자 합의", "음주 상태로 운전하다 가드레일 충격"]
+    for _ in range(12):
+        words = rng.choice(rows)['Facts'].split()
+        texts.append(' '.join(rng.sample(words, rng.randint(5, 20))))
+    return [analyze_query(t) for t in texts]
+
+def winners(summaries):
+    # 최종 당선작 (판례 번호, 죄명) + 점수 (엔진마다 부동소수 합산 순서가 달라서 근사 비교)
+    return [[(case_id, cat, score) for score, case_id, cat in pick_diverse(s)] for s in summaries]
+
+def assert_same(a, b):
+    assert len(a) == len(b)
+    for x, y in zip(a, b):
+        assert [(i, c) for i, c, _ in x] == [(i, c) for i, c, _ in y]
+        assert [s for _, _, s in x] == pytest.approx([s for _, _, s in y])
+
+def test_engines_agree(corpus, queries):
+    rows, index = corpus
+    expected = winners(ScanEngine(rows, 0).topk_batch(queries))
+    assert any(expected) # 질의가 실제로 판례를 찾음
+    assert_same(winners(IndexEngine(index, 0, N_CASES).topk_batch(queries)), expected)
+    assert_same(winners(SparseScorer(index).topk_batch(queries)), expected)
+
+@pytest.mark.parametrize('engine', ['scan', 'index', 'sparse'])
+def test_sharded_merge_equals_whole(corpus, queries, engine):
+    rows, index = corpus
+    def make(lo, hi):
+        if engine == 'scan': return ScanEngine(rows[lo:hi], lo)
+        if engine == 'index': return IndexEngine(index, lo, hi)
+        return SparseScorer(index, lo, hi)
+    bounds = [0, 17, 60, 61, N_CASES]
+    merged = None
+    for lo, hi in zip(bounds, bounds[1:]):
+        part = make(lo, hi).topk_batch(queries)
+        merged = part if merged is None else merge_batches(merged, part)
+    assert_same(winners(merged), winners(make(0, N_CASES).topk_batch(queries)))
+
+# ------------------------------------------------------------------
+# LshScorer (근사, --engine 선택지에는 없음): 기본 설정 그대로 측정
+# ------------------------------------------------------------------
+def test_lsh_default_settings_recall(corpus, queries):
+    _, index = corpus
+    exact = SparseScorer(index)
+    scores = [dict(zip(rows.tolist(), score.tolist())) for rows, score in exact.score_batch(queries)]
+    found = total = 0
+    for q, (summary, best) in enumerate(zip(LshScorer(index).topk_batch(queries), winners(exact.topk_batch(queries)))):
+        for score, case_id, _ in summary:
+            assert score == pytest.approx(scores[q][case_id]) # 후보만 줄일 뿐 점수는 전체 채점과 같음
+        got = {i for _, i, _ in pick_diverse(summary)}
+        found += sum(i in got for i, _, _ in best)
+        total += len(best)
+    assert found / total >= 0.75 # 이 코퍼스 기준 80% (legal_data_total.csv는 bench_lsh.py 86%)
+
+def test_lsh_candidates_do_not_depend_on_shards(corpus, queries):
+    # 해시가 토큰 문자열에서 나오므로 구역마다 따로 만든 LSH의 후보 = 전체 후보를 구역으로 자른 것
+    _, index = corpus
+    whole = LshScorer(index)
+    expected = whole.lsh.candidates(*whole.query_matrix(queries))
+    bounds = [0, 17, 60, 61, N_CASES]
+    parts = []
+    for lo, hi in zip(bounds, bounds[1:]):
+        shard = LshScorer(index, lo, hi)
+        parts.append([c + lo for c in shard.lsh.candidates(*shard.query_matrix(queries))])
+    for q, cand in enumerate(expected):
+        assert np.array_equal(np.concatenate([p[q] for p in parts]), cand)
+
+def test_lsh_falls_back_when_no_candidates(corpus):
+    _, index = corpus
+    # 색인에 없는 단어뿐인 질의 -> 후보가 없어도 전체 채점 결과와 같음
+    analyzed = [analyze_query("전혀 상관없는 외계어 단어들 뿐")]
+    assert_same(winners(LshScorer(index).topk_batch(analyzed)), winners(SparseScorer(index).topk_batch(analyzed)))
@@ -1,8 +1,31 @@
+import sys
+import json
+import argparse
 import matplotlib.pyplot as plt
 import numpy as np
 
-real_accuracies = [42.0, 74.0, 95.0, 100.0, 99.0]
-steps = ['Step 1\n(20ea)', 'Step 2\n(70ea)', 'Step 3\n(300ea)', 'Step 4\n(700ea)', 'Step 5\n(1100ea)']
+# 단계별 정확도는 bench_scaling.py 결과 파일(bench_results.json)의 trainer 측정에서 읽음
+parser = argparse.ArgumentParser(description="단계별 학습 곡선 그래프")
+parser.add_argument('--results', default='bench_results.json')
+parser.add_argument('--rows', type=int, help="그릴 코퍼스 판례 수 (기본: 결과에 있는 가장 작은 규모)")
+args = parser.parse_args()
+
+try:
+    with open(args.results, encoding='utf-8') as f:
+        runs = [r for r in json.load(f)['runs'] if r['path'] == 'trainer' and r.get('exec', 'mpi') == 'mpi']
+except FileNotFoundError:
+    print(f"❌ {args.results}가 없습니다. bench_scaling.py를 먼저 실행하세요!")
+    sys.exit(1)
+if not runs:
+    print(f"❌ {args.results}에 trainer 측정 결과가 없습니다.")
+    sys.exit(1)
+
+# 정확도는 프로세스 수와 무관하므로 해당 규모의 첫 번째 측정을 씀
+rows = args.rows or min(r['rows'] for r in runs)
+run = min((r for r in runs if r['rows'] == rows), key=lambda r: r['ranks'])
+
+real_accuracies = run['accuracy']
+steps = [f"Step {i+1}\n({n}ea)" for i, n in enumerate(run['phases'])]
 
 # 로스율 자동 계산 (100 - 정확도)
 real_losses = [(100 - acc) / 100 for acc in real_accuracies]
@@ -38,14 +61,15 @@ ax2.tick_params(axis='y', labelcolor='#2962FF')
 ax2.set_ylim(0, 115)
 
 
-plt.title('HPC AI Model Performance: Data Scaling Law', fontsize=16, fontweight='bold', pad=20)
+plt.title(f'HPC AI Model Performance: Data Scaling Law ({rows:,} cases)', fontsize=16, fontweight='bold', pad=20)
 plt.grid(True, axis='y', linestyle='--', alpha=0.5)
 
 # 핵심 분석 멘트 
 props = dict(boxstyle='round', facecolor='white', alpha=0.9, edgecolor='gray')
+last = len(steps) - 1
 ax1.text(0, 0.45, "Insufficient Data\n(Underfitting)", fontsize=10, bbox=props, ha='center')
-ax1.text(2, 0.30, "Rapid Learning\n(Scaling Law)", fontsize=10, bbox=props, ha='center')
-ax1.text(4, 0.20, "Optimal Model\n(Generalized)", fontsize=10, bbox=props, ha='center')
+ax1.text(last / 2, 0.30, "Rapid Learning\n(Scaling Law)", fontsize=10, bbox=props, ha='center')
+ax1.text(last, 0.20, "Optimal Model\n(Generalized)", fontsize=10, bbox=props, ha='center')
 
 # 범례 표시
 lines, labels = ax1.get_legend_handles_labels()
@@ -55,4 +79,4 @@ ax1.legend(lines + lines2, labels + labels2, loc='upper center', bbox_to_anchor=
 # 저장
 plt.tight_layout()
 plt.savefig('final_result_graph.png', dpi=300)
-print("✅ 최종 5단계 그래프(final_result_graph.png) 생성 완료! PPT에 넣으세요.")
+print(f"✅ 최종 {len(steps)}단계 그래프(final_result_graph.png) 생성 완료! PPT에 넣으세요.")